@@ -0,0 +1,40 @@
+"""create audio_uploads table for resumable uploads
+
+Revision ID: 0007_create_audio_uploads
+Revises: 0006_add_audio_chunks
+Create Date: 2025-01-07 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_create_audio_uploads"
+down_revision = "0006_add_audio_chunks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audio_uploads",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("upload_id", sa.String(length=64), nullable=False),
+        sa.Column("original_filename", sa.String(length=255), nullable=False),
+        sa.Column("content_type", sa.String(length=100), nullable=False),
+        sa.Column("total_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("session_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["session_id"], ["sessions.id"]),
+    )
+    op.create_index(
+        "ix_audio_uploads_upload_id", "audio_uploads", ["upload_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audio_uploads_upload_id", table_name="audio_uploads")
+    op.drop_table("audio_uploads")
@@ -0,0 +1,32 @@
+"""add content_sha256 and size_bytes to audio_files
+
+Revision ID: 0008_add_audio_content_hash
+Revises: 0007_create_audio_uploads
+Create Date: 2025-01-08 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_add_audio_content_hash"
+down_revision = "0007_create_audio_uploads"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "audio_files", sa.Column("content_sha256", sa.String(length=64), nullable=True)
+    )
+    op.add_column("audio_files", sa.Column("size_bytes", sa.BigInteger(), nullable=True))
+    op.create_index(
+        "ix_audio_files_content_sha256", "audio_files", ["content_sha256"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audio_files_content_sha256", table_name="audio_files")
+    op.drop_column("audio_files", "size_bytes")
+    op.drop_column("audio_files", "content_sha256")
@@ -0,0 +1,83 @@
+"""add storage_path to audio_files and move uploads into sharded directories
+
+Revision ID: 0009_add_audio_storage_path
+Revises: 0008_add_audio_content_hash
+Create Date: 2025-01-09 00:00:00
+
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+from server.config import get_upload_dir
+
+revision = "0009_add_audio_storage_path"
+down_revision = "0008_add_audio_content_hash"
+branch_labels = None
+depends_on = None
+
+audio_files = sa.table(
+    "audio_files",
+    sa.column("id", sa.Integer()),
+    sa.column("file_key", sa.String()),
+    sa.column("storage_path", sa.String()),
+)
+
+
+def _flat_files(upload_dir: Path) -> dict[str, Path]:
+    if not upload_dir.is_dir():
+        return {}
+    files: dict[str, Path] = {}
+    with os.scandir(upload_dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                files.setdefault(Path(entry.name).stem, Path(entry.path))
+    return files
+
+
+def upgrade() -> None:
+    op.add_column(
+        "audio_files", sa.Column("storage_path", sa.String(length=512), nullable=True)
+    )
+
+    bind = op.get_bind()
+    upload_dir = get_upload_dir()
+    flat_files = _flat_files(upload_dir)
+    rows = bind.execute(
+        sa.select(audio_files.c.id, audio_files.c.file_key).where(
+            audio_files.c.storage_path.is_(None)
+        )
+    ).all()
+    for audio_id, file_key in rows:
+        source = flat_files.get(file_key)
+        if source is None:
+            continue
+        storage_path = f"{file_key[:2]}/{file_key[2:4]}/{source.name}"
+        destination = upload_dir / storage_path
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        source.replace(destination)
+        bind.execute(
+            audio_files.update()
+            .where(audio_files.c.id == audio_id)
+            .values(storage_path=storage_path)
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    upload_dir = get_upload_dir()
+    rows = bind.execute(
+        sa.select(audio_files.c.storage_path).where(
+            audio_files.c.storage_path.isnot(None)
+        )
+    ).all()
+    for (storage_path,) in rows:
+        source = upload_dir / storage_path
+        if source.exists():
+            source.replace(upload_dir / source.name)
+
+    op.drop_column("audio_files", "storage_path")
@@ -0,0 +1,30 @@
+"""add probed audio metadata to audio_files
+
+Revision ID: 0010_add_audio_metadata
+Revises: 0009_add_audio_storage_path
+Create Date: 2025-01-10 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_add_audio_metadata"
+down_revision = "0009_add_audio_storage_path"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("audio_files", sa.Column("duration_seconds", sa.Float(), nullable=True))
+    op.add_column("audio_files", sa.Column("codec", sa.String(length=32), nullable=True))
+    op.add_column("audio_files", sa.Column("sample_rate", sa.Integer(), nullable=True))
+    op.add_column("audio_files", sa.Column("channels", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("audio_files", "channels")
+    op.drop_column("audio_files", "sample_rate")
+    op.drop_column("audio_files", "codec")
+    op.drop_column("audio_files", "duration_seconds")
@@ -0,0 +1,66 @@
+"""add per-chunk processing state to audio_chunks
+
+Revision ID: 0011_add_audio_chunk_state
+Revises: 0010_add_audio_metadata
+Create Date: 2025-01-11 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_add_audio_chunk_state"
+down_revision = "0010_add_audio_metadata"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "audio_chunks",
+        sa.Column(
+            "status", sa.String(length=16), nullable=False, server_default="pending"
+        ),
+    )
+    op.add_column(
+        "audio_chunks",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("audio_chunks", sa.Column("error", sa.Text(), nullable=True))
+    op.add_column(
+        "audio_chunks",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.execute(
+        "UPDATE audio_chunks SET status = 'done' WHERE id IN "
+        "(SELECT audio_chunk_id FROM chunk_transcripts)"
+    )
+    duplicates = (
+        "SELECT id FROM audio_chunks WHERE id NOT IN "
+        "(SELECT MAX(id) FROM audio_chunks GROUP BY audio_file_id, chunk_index)"
+    )
+    op.execute(
+        f"DELETE FROM chunk_transcripts WHERE audio_chunk_id IN ({duplicates})"
+    )
+    op.execute(f"DELETE FROM audio_chunks WHERE id IN ({duplicates})")
+    op.create_unique_constraint(
+        "uq_audio_chunks_audio_file_chunk",
+        "audio_chunks",
+        ["audio_file_id", "chunk_index"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_audio_chunks_audio_file_chunk", "audio_chunks", type_="unique"
+    )
+    op.drop_column("audio_chunks", "updated_at")
+    op.drop_column("audio_chunks", "error")
+    op.drop_column("audio_chunks", "attempts")
+    op.drop_column("audio_chunks", "status")
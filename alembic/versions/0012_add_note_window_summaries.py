@@ -0,0 +1,51 @@
+"""add note_window_summaries table
+
+Revision ID: 0012_add_note_window_summaries
+Revises: 0011_add_audio_chunk_state
+Create Date: 2025-01-12 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_add_note_window_summaries"
+down_revision = "0011_add_audio_chunk_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "note_window_summaries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("audio_file_id", sa.Integer(), nullable=False),
+        sa.Column("window_index", sa.Integer(), nullable=False),
+        sa.Column("start_seconds", sa.Float(), nullable=False),
+        sa.Column("end_seconds", sa.Float(), nullable=False),
+        sa.Column("source_sha256", sa.String(length=64), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=False),
+        sa.Column("model", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.String(length=32), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["audio_file_id"], ["audio_files.id"]),
+        sa.UniqueConstraint(
+            "audio_file_id",
+            "window_index",
+            name="uq_note_window_summaries_audio_file_window",
+        ),
+    )
+    op.create_index(
+        "ix_note_window_summaries_audio_file_id",
+        "note_window_summaries",
+        ["audio_file_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_note_window_summaries_audio_file_id", table_name="note_window_summaries"
+    )
+    op.drop_table("note_window_summaries")
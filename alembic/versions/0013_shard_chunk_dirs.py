@@ -0,0 +1,72 @@
+"""move chunk directories into the sharded layout used since 0009
+
+Revision ID: 0013_shard_chunk_dirs
+Revises: 0012_add_note_window_summaries
+Create Date: 2025-01-13 00:00:00
+
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+from server.config import get_upload_dir
+
+revision = "0013_shard_chunk_dirs"
+down_revision = "0012_add_note_window_summaries"
+branch_labels = None
+depends_on = None
+
+audio_files = sa.table(
+    "audio_files",
+    sa.column("id", sa.Integer()),
+    sa.column("file_key", sa.String()),
+)
+audio_chunks = sa.table(
+    "audio_chunks",
+    sa.column("id", sa.Integer()),
+    sa.column("audio_file_id", sa.Integer()),
+    sa.column("file_path", sa.String()),
+)
+
+
+def _move_chunk_dirs(*, to_sharded: bool) -> None:
+    chunks_dir = get_upload_dir() / "chunks"
+    if not chunks_dir.is_dir():
+        return
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(audio_files.c.id, audio_files.c.file_key)).all()
+    for audio_id, file_key in rows:
+        if not file_key or len(file_key) < 4:
+            continue
+        flat = chunks_dir / file_key
+        sharded = chunks_dir / file_key[:2] / file_key[2:4] / file_key
+        source, destination = (flat, sharded) if to_sharded else (sharded, flat)
+        if not source.is_dir() or destination.exists():
+            continue
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        source.replace(destination)
+        chunk_rows = bind.execute(
+            sa.select(audio_chunks.c.id, audio_chunks.c.file_path).where(
+                audio_chunks.c.audio_file_id == audio_id
+            )
+        ).all()
+        for chunk_id, file_path in chunk_rows:
+            if Path(file_path).parent != source:
+                continue
+            bind.execute(
+                audio_chunks.update()
+                .where(audio_chunks.c.id == chunk_id)
+                .values(file_path=str(destination / Path(file_path).name))
+            )
+
+
+def upgrade() -> None:
+    _move_chunk_dirs(to_sharded=True)
+
+
+def downgrade() -> None:
+    _move_chunk_dirs(to_sharded=False)
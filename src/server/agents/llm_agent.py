@@ -3,7 +3,7 @@ from __future__ import annotations
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
-from server.config import get_openai_max_retries, get_openai_timeout_seconds
+from server.core.clients import get_chat_model
 from server.settings import settings
 
 try:
@@ -26,13 +26,4 @@ class LlmAgent(BaseModel):
         if not settings.OPENAI_API_KEY or settings.OPENAI_API_KEY == "YOUR_OPENAI_API_KEY":
             raise ValueError("Missing OpenAI API key")
 
-        max_retries = get_openai_max_retries()
-        timeout = get_openai_timeout_seconds()
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            api_key=settings.OPENAI_API_KEY,
-            base_url=settings.OPENAI_PROXY_URL,
-            max_retries=max_retries,
-            timeout=timeout,
-        )
-        return cls(llm=llm)
+        return cls(llm=get_chat_model())
@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 
 from pydantic import BaseModel
 
 from server.agents.llm_agent import LlmAgent
+from server.agents.notes_prompt import count_tokens, render_transcript
+from server.config import (
+    get_notes_map_concurrency,
+    get_openai_max_retries,
+    get_notes_map_reduce_token_threshold,
+    get_notes_prompt_token_budget,
+    get_notes_window_seconds,
+)
+from server.core.notes_cache import cached_notes
+from server.core.rate_limit import estimate_tokens, get_rate_limiter
+from server.core.resilience import CircuitBreaker, call_with_retries, is_retryable
 
 try:
     from pydantic import ConfigDict
 except ImportError:  # pragma: no cover - fallback for pydantic<2
     ConfigDict = None
 
+RESPONSE_TOKEN_ESTIMATE = 1024
+# Bump whenever a notes prompt changes so cached notes are regenerated.
+PROMPT_VERSION = "3"
+# Separates the streamed markdown note from the JSON fields that follow it.
+METADATA_MARKER = "<<<NOTE_METADATA>>>"
+
 
 class NotesAgent(BaseModel):
     llm_agent: LlmAgent
@@ -40,48 +60,306 @@ class NotesAgent(BaseModel):
         except json.JSONDecodeError:
             return None
 
-    def generate_notes(self, *, transcript_text: str, diarized_segments: list[dict[str, object]] | None) -> dict[str, object]:
-        transcript_text = transcript_text.strip()
-        segment_hint = ""
-        if diarized_segments:
-            segment_hint = json.dumps(diarized_segments[:12], ensure_ascii=True)
+    def _invoke(self, system_prompt: str, user_prompt: str) -> str:
+        tokens = estimate_tokens(system_prompt + user_prompt) + RESPONSE_TOKEN_ESTIMATE
 
-        system_prompt = (
-            "You are a clinical documentation assistant. Produce a structured counseling "
-            "session note in JSON. Keep it concise, accurate, and professional."
-        )
-        user_prompt = (
-            "Generate a counseling session note from the transcript below.\n\n"
-            "Return JSON with keys: note_markdown, summary, key_points, action_items, risk_flags.\n"
-            "Use markdown headings in note_markdown. key_points, action_items, risk_flags must be arrays of strings.\n\n"
-            f"Transcript:\n{transcript_text}\n\n"
-            f"Speaker segments (optional, sample):\n{segment_hint}\n"
-        )
-        response = self.llm_agent.llm.invoke(
-            [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
+        def invoke():
+            get_rate_limiter("openai_chat").acquire(requests=1, tokens=tokens)
+            return self.llm_agent.llm.invoke(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ]
+            )
+
+        response = call_with_retries(
+            "openai_chat", invoke, max_attempts=get_openai_max_retries() + 1
         )
-        content = (response.content or "").strip()
+        return (response.content or "").strip()
+
+    def model_name(self) -> str:
+        model_name = getattr(self.llm_agent.llm, "model_name", None)
+        if not model_name:
+            model_name = getattr(self.llm_agent.llm, "model", "unknown")
+        return model_name
+
+    def build_notes(self, content: str, fallback_markdown: str) -> dict[str, object]:
         payload = self._extract_json(content) or {}
 
-        note_markdown = payload.get("note_markdown") or content or transcript_text
+        note_markdown = payload.get("note_markdown") or content or fallback_markdown
         summary = payload.get("summary")
         key_points = payload.get("key_points")
         action_items = payload.get("action_items")
         risk_flags = payload.get("risk_flags")
 
-        model_name = getattr(self.llm_agent.llm, "model_name", None)
-        if not model_name:
-            model_name = getattr(self.llm_agent.llm, "model", "unknown")
-
         return {
             "note_markdown": str(note_markdown),
             "summary": str(summary) if isinstance(summary, str) else None,
             "key_points": key_points if isinstance(key_points, list) else None,
             "action_items": action_items if isinstance(action_items, list) else None,
             "risk_flags": risk_flags if isinstance(risk_flags, list) else None,
-            "model": model_name,
+            "model": self.model_name(),
             "version": self.version,
         }
+
+    def _segment_windows(
+        self, diarized_segments: list[dict[str, object]], window_seconds: float
+    ) -> list[str]:
+        windows: dict[int, list[str]] = {}
+        for segment in diarized_segments:
+            if not isinstance(segment, dict):
+                continue
+            text = str(segment.get("text") or "").strip()
+            if not text:
+                continue
+            timestamp = segment.get("timestamp")
+            start = timestamp.get("start") if isinstance(timestamp, dict) else None
+            if not isinstance(start, (int, float)):
+                return []
+            windows.setdefault(int(start // window_seconds), []).append(
+                self.segment_line(segment)
+            )
+        return ["\n".join(windows[index]) for index in sorted(windows)]
+
+    def segment_line(
+        self, segment: dict[str, object], offset_seconds: float = 0.0
+    ) -> str:
+        timestamp = segment.get("timestamp")
+        start = timestamp.get("start") if isinstance(timestamp, dict) else None
+        speaker = segment.get("speaker") or "Speaker"
+        text = str(segment.get("text") or "").strip()
+        if not isinstance(start, (int, float)):
+            return f"{speaker}: {text}"
+        minutes, seconds = divmod(int(start + offset_seconds), 60)
+        return f"[{minutes:02d}:{seconds:02d}] {speaker}: {text}"
+
+    def _text_windows(self, transcript_text: str, window_tokens: int) -> list[str]:
+        window_chars = max(window_tokens, 1) * 4
+        windows: list[str] = []
+        current: list[str] = []
+        size = 0
+        for word in transcript_text.split():
+            if size + len(word) > window_chars and current:
+                windows.append(" ".join(current))
+                current, size = [], 0
+            current.append(word)
+            size += len(word) + 1
+        if current:
+            windows.append(" ".join(current))
+        return windows
+
+    def summarize_window(self, window_text: str, label: str) -> str:
+        """Summarize one window of the transcript into partial-summary JSON text."""
+        system_prompt = (
+            "You are a clinical documentation assistant. Summarize one part of a "
+            "counseling session transcript in JSON. Keep it concise and factual."
+        )
+        user_prompt = (
+            f"This is {label} of the session transcript.\n\n"
+            "Return JSON with keys: summary, key_points, action_items, risk_flags.\n"
+            "key_points, action_items, risk_flags must be arrays of strings; "
+            "use empty arrays when nothing applies.\n\n"
+            f"Transcript part:\n{window_text}\n"
+        )
+        content = self._invoke(system_prompt, user_prompt)
+        payload = self._extract_json(content)
+        return json.dumps(payload, ensure_ascii=True) if payload else content
+
+    def _generate_notes_map_reduce(
+        self,
+        *,
+        transcript_text: str,
+        diarized_segments: list[dict[str, object]] | None,
+        threshold_tokens: int,
+    ) -> dict[str, object]:
+        windows = self._segment_windows(
+            diarized_segments or [], get_notes_window_seconds()
+        )
+        if len(windows) < 2:
+            windows = self._text_windows(transcript_text, threshold_tokens // 2)
+
+        partials = self.summarize_windows(
+            [
+                (window_text, f"part {index + 1} of {len(windows)}")
+                for index, window_text in enumerate(windows)
+            ]
+        )
+        return self.reduce_notes(partials)
+
+    def summarize_windows(self, windows: list[tuple[str, str]]) -> list[str]:
+        """Summarize ``(window_text, label)`` pairs concurrently, preserving order."""
+        with ThreadPoolExecutor(max_workers=get_notes_map_concurrency()) as executor:
+            return list(
+                executor.map(lambda window: self.summarize_window(*window), windows)
+            )
+
+    def reduce_notes(self, partials: list[str]) -> dict[str, object]:
+        """Merge ordered partial summaries into the final note payload."""
+        system_prompt = (
+            "You are a clinical documentation assistant. Produce a structured counseling "
+            "session note in JSON from partial summaries of the session, in order. "
+            "Keep it concise, accurate, and professional."
+        )
+        partial_text = "\n\n".join(
+            f"Part {index + 1}:\n{partial}" for index, partial in enumerate(partials)
+        )
+        user_prompt = (
+            "Combine the partial summaries below into one counseling session note.\n\n"
+            "Return JSON with keys: note_markdown, summary, key_points, action_items, risk_flags.\n"
+            "Use markdown headings in note_markdown. key_points, action_items, risk_flags must be arrays of strings. "
+            "Merge duplicates across parts.\n\n"
+            f"Partial summaries:\n{partial_text}\n"
+        )
+        content = self._invoke(system_prompt, user_prompt)
+        return self.build_notes(content, partial_text)
+
+    def notes_strategy(self, transcript_text: str) -> str:
+        """``map_reduce`` above the token threshold, otherwise ``single``."""
+        threshold_tokens = get_notes_map_reduce_token_threshold()
+        tokens = count_tokens(transcript_text.strip())
+        return "map_reduce" if threshold_tokens and tokens > threshold_tokens else "single"
+
+    def cache_key(
+        self,
+        transcript_text: str,
+        diarized_segments: list[dict[str, object]] | None,
+        strategy: str | None = None,
+    ) -> str:
+        source = json.dumps(
+            {"text": transcript_text.strip(), "segments": diarized_segments or []},
+            ensure_ascii=True,
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        strategy = strategy or self.notes_strategy(transcript_text)
+        model = self.model_name()
+        return f"{PROMPT_VERSION}:{strategy}:{model}:{self.version}:{digest}"
+
+    def generate_notes(self, *, transcript_text: str, diarized_segments: list[dict[str, object]] | None) -> dict[str, object]:
+        return cached_notes(
+            self.cache_key(transcript_text, diarized_segments),
+            lambda: self.generate_notes_uncached(
+                transcript_text=transcript_text,
+                diarized_segments=diarized_segments,
+            ),
+        )
+
+    def generate_notes_uncached(self, *, transcript_text: str, diarized_segments: list[dict[str, object]] | None) -> dict[str, object]:
+        transcript_text = transcript_text.strip()
+        if self.notes_strategy(transcript_text) == "map_reduce":
+            return self._generate_notes_map_reduce(
+                transcript_text=transcript_text,
+                diarized_segments=diarized_segments,
+                threshold_tokens=get_notes_map_reduce_token_threshold(),
+            )
+
+        system_prompt, user_prompt = self._notes_prompts(
+            transcript_text, diarized_segments
+        )
+        content = self._invoke(system_prompt, user_prompt)
+        return self.build_notes(content, transcript_text)
+
+    def _notes_prompts(
+        self,
+        transcript_text: str,
+        diarized_segments: list[dict[str, object]] | None,
+        *,
+        markdown_first: bool = False,
+    ) -> tuple[str, str]:
+        system_prompt = (
+            "You are a clinical documentation assistant. Produce a structured counseling "
+            "session note in JSON. Keep it concise, accurate, and professional."
+        )
+        output_format = (
+            "Return JSON with keys: note_markdown, summary, key_points, action_items, risk_flags.\n"
+            "Use markdown headings in note_markdown. key_points, action_items, risk_flags must be arrays of strings.\n\n"
+        )
+        if markdown_first:
+            system_prompt = (
+                "You are a clinical documentation assistant. Produce a structured counseling "
+                "session note. Keep it concise, accurate, and professional."
+            )
+            output_format = (
+                "First write the note in markdown with headings. Then write a line containing "
+                f"only {METADATA_MARKER} followed by JSON with keys: summary, key_points, "
+                "action_items, risk_flags. key_points, action_items, risk_flags must be arrays of strings.\n\n"
+            )
+        instructions = (
+            "Generate a counseling session note from the transcript below. "
+            "Each line is one speaker turn as [mm:ss] Speaker: text.\n\n"
+            + output_format
+            + "Transcript:\n"
+        )
+        budget = get_notes_prompt_token_budget() - count_tokens(
+            system_prompt + instructions
+        )
+        user_prompt = instructions + render_transcript(
+            transcript_text, diarized_segments, budget=budget
+        )
+        return system_prompt, user_prompt
+
+    def build_streamed_notes(
+        self, content: str, fallback_markdown: str
+    ) -> dict[str, object]:
+        """Parse a markdown-first completion from `stream_notes`."""
+        markdown, marker, metadata = content.partition(METADATA_MARKER)
+        if not marker:
+            return self.build_notes(content, fallback_markdown)
+        payload = self.build_notes(metadata, fallback_markdown)
+        payload["note_markdown"] = markdown.strip() or payload["note_markdown"]
+        return payload
+
+    def stream_notes(self, *, transcript_text: str, diarized_segments: list[dict[str, object]] | None) -> Iterator[str]:
+        """Yield completion text as it arrives: the markdown note, then its metadata.
+
+        `split_streamed_markdown` picks out the markdown for display and
+        `build_streamed_notes` parses the joined result.
+        """
+        system_prompt, user_prompt = self._notes_prompts(
+            transcript_text.strip(), diarized_segments, markdown_first=True
+        )
+        breaker = CircuitBreaker("openai_chat")
+        breaker.check()
+        get_rate_limiter("openai_chat").acquire(
+            requests=1,
+            tokens=estimate_tokens(system_prompt + user_prompt) + RESPONSE_TOKEN_ESTIMATE,
+        )
+        try:
+            for chunk in self.llm_agent.llm.stream(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ]
+            ):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as exc:
+            # A half-streamed completion cannot be retried transparently.
+            if is_retryable(exc):
+                breaker.record_failure()
+            raise
+        breaker.record_success()
+
+
+def split_streamed_markdown(deltas: Iterator[str]) -> Iterator[str]:
+    """Pass through streamed text up to `METADATA_MARKER`, even when it is split."""
+    held = ""
+    in_metadata = False
+    for delta in deltas:
+        # Keep consuming after the marker so the caller still sees every delta.
+        if in_metadata:
+            continue
+        held += delta
+        marker_at = held.find(METADATA_MARKER)
+        if marker_at >= 0:
+            in_metadata = True
+            if held[:marker_at]:
+                yield held[:marker_at]
+            continue
+        # Hold back a tail that could be the start of the marker.
+        safe = len(held) - len(METADATA_MARKER) + 1
+        if safe > 0:
+            yield held[:safe]
+            held = held[safe:]
+    if held and not in_metadata:
+        yield held
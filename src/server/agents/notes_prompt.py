@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import tiktoken
+
+from server.core.rate_limit import estimate_tokens
+
+ENCODING_MODEL = "gpt-4o-mini"
+ELLIPSIS = " ... "
+GAP_LINE = "..."
+# A truncated turn keeps at least one token on each side of the ellipsis.
+MIN_TURN_TOKENS = 2
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> tiktoken.Encoding | None:
+    try:
+        return tiktoken.encoding_for_model(ENCODING_MODEL)
+    except (KeyError, ValueError, OSError):
+        # Unknown model or the BPE file could not be fetched (offline worker).
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except (ValueError, OSError):
+            return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Keep the start and end of ``text`` within ``max_tokens``."""
+    encoding = _encoding()
+    if encoding is None:
+        max_chars = max_tokens * 4
+        if len(text) <= max_chars:
+            return text
+        head = max_chars // 2
+        return text[:head] + ELLIPSIS + text[len(text) - (max_chars - head) :]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    head = max(max_tokens // 2, 1)
+    tail = max(max_tokens - head, 1)
+    return (
+        encoding.decode(tokens[:head]).rstrip()
+        + ELLIPSIS
+        + encoding.decode(tokens[-tail:]).lstrip()
+    )
+
+
+def _format_time(seconds: object) -> str:
+    if not isinstance(seconds, (int, float)):
+        return ""
+    minutes, secs = divmod(int(seconds), 60)
+    return f"[{minutes:02d}:{secs:02d}] "
+
+
+def speaker_turns(segments: list[dict[str, object]]) -> list[tuple[str, str, str]]:
+    """Merge consecutive same-speaker segments into ``(time, speaker, text)`` turns."""
+    turns: list[tuple[str, str, str]] = []
+    for segment in segments:
+        if not isinstance(segment, dict):
+            continue
+        text = str(segment.get("text") or "").strip()
+        if not text:
+            continue
+        speaker = str(segment.get("speaker") or "Speaker")
+        if turns and turns[-1][1] == speaker:
+            started, _, previous = turns[-1]
+            turns[-1] = (started, speaker, f"{previous} {text}")
+            continue
+        timestamp = segment.get("timestamp")
+        start = timestamp.get("start") if isinstance(timestamp, dict) else None
+        turns.append((_format_time(start), speaker, text))
+    return turns
+
+
+def _turn_cost(size: int, cap: int, marker: int) -> int:
+    """Tokens a turn of ``size`` takes once capped at ``cap`` (plus the ellipsis)."""
+    return size if size <= cap + marker else cap + marker
+
+
+def _kept_turns(costs: list[int], budget: int) -> list[int | None]:
+    """Indices of the turns to keep, dropping middle turns behind one gap (``None``)."""
+    if sum(costs) <= budget:
+        return list(range(len(costs)))
+    head: list[int] = []
+    tail: list[int] = []
+    used = count_tokens(GAP_LINE) + 1
+    left, right = 0, len(costs) - 1
+    while left <= right:
+        index = left if len(head) <= len(tail) else right
+        if used + costs[index] > budget:
+            break
+        used += costs[index]
+        if index == left:
+            head.append(index)
+            left += 1
+        else:
+            tail.insert(0, index)
+            right -= 1
+    return [*head, None, *tail]
+
+
+def _fit_lines(turns: list[tuple[str, str, str]], budget: int) -> list[str]:
+    prefixes = [f"{started}{speaker}: " for started, speaker, _ in turns]
+    overheads = [count_tokens(prefix) + 1 for prefix in prefixes]
+    sizes = [count_tokens(text) for _, _, text in turns]
+    marker = count_tokens(ELLIPSIS)
+    kept = _kept_turns(
+        [
+            overhead + _turn_cost(size, MIN_TURN_TOKENS, marker)
+            for overhead, size in zip(overheads, sizes)
+        ],
+        budget,
+    )
+    indices = [index for index in kept if index is not None]
+    available = budget - sum(overheads[index] for index in indices)
+    if len(indices) < len(kept):
+        available -= count_tokens(GAP_LINE) + 1
+    kept_sizes = [sizes[index] for index in indices]
+    cap = max(kept_sizes, default=0)
+    if sum(kept_sizes) > available:
+        low, high = MIN_TURN_TOKENS, cap
+        while low < high:
+            middle = (low + high + 1) // 2
+            if sum(_turn_cost(size, middle, marker) for size in kept_sizes) <= available:
+                low = middle
+            else:
+                high = middle - 1
+        cap = low
+    lines = []
+    for index in kept:
+        if index is None:
+            lines.append(GAP_LINE)
+            continue
+        text = turns[index][2]
+        if sizes[index] > cap + marker:
+            text = _truncate(text, cap)
+        lines.append(prefixes[index] + text)
+    return lines
+
+
+def _fit_turns(turns: list[tuple[str, str, str]], budget: int) -> list[str]:
+    """Fit turns within ``budget`` tokens.
+
+    The longest turns are trimmed first; when even the shortest trimmed turns
+    do not fit, middle turns are replaced by a single ``...`` line. Token
+    merges across trimmed text can overshoot slightly, so the fit is re-run
+    against a tighter target until the joined lines are within ``budget``.
+    """
+    target = budget
+    while target > 0:
+        lines = _fit_lines(turns, target)
+        overshoot = count_tokens("\n".join(lines)) - budget
+        if overshoot <= 0:
+            return lines
+        target -= overshoot
+    return []
+
+
+def render_transcript(
+    transcript_text: str,
+    diarized_segments: list[dict[str, object]] | None,
+    *,
+    budget: int,
+) -> str:
+    """Render the transcript as compact speaker turns fitted to ``budget`` tokens."""
+    turns = speaker_turns(diarized_segments or [])
+    if not turns:
+        return _truncate(transcript_text.strip(), budget)
+    return "\n".join(_fit_turns(turns, budget))
@@ -2,28 +2,35 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import shutil
 import tempfile
 from pathlib import Path
 
+import httpx
 from pydantic import BaseModel
 from sarvamai import AsyncSarvamAI
 
 from server.config import (
-    get_sarvam_api_key,
     get_sarvam_num_speakers,
     get_sarvam_prompt,
     get_sarvam_translation_model,
 )
+from server.core.clients import get_sarvam_client, get_sarvam_http_client
+from server.core.rate_limit import get_rate_limiter
+from server.core.resilience import call_with_retries_async
 
 try:
     from pydantic import ConfigDict
 except ImportError:  # pragma: no cover - fallback for pydantic<2
     ConfigDict = None
 
+logger = logging.getLogger(__name__)
+
 
 class SarvamSttAgent(BaseModel):
     client: AsyncSarvamAI
+    http_client: httpx.AsyncClient | None = None
     model: str
     num_speakers: int | None
     prompt: str | None
@@ -35,31 +42,58 @@ class SarvamSttAgent(BaseModel):
             arbitrary_types_allowed = True
 
     @classmethod
-    def from_env(cls) -> "SarvamSttAgent":
-        api_key = get_sarvam_api_key()
-        model = get_sarvam_translation_model()
-        if not api_key:
-            raise ValueError("Missing SarvamAI API key")
+    def shared(cls) -> "SarvamSttAgent":
+        """Agent on this process's pooled client; use it from `run_async` only."""
         return cls(
-            client=AsyncSarvamAI(api_subscription_key=api_key),
-            model=model,
+            client=get_sarvam_client(),
+            http_client=get_sarvam_http_client(),
+            model=get_sarvam_translation_model(),
             num_speakers=get_sarvam_num_speakers(),
             prompt=get_sarvam_prompt(),
         )
 
-    def transcribe_with_diarization(self, file_path: Path) -> dict[str, object]:
+    def transcribe_with_diarization(
+        self, file_path: Path, audio_seconds: float | None = None
+    ) -> dict[str, object]:
         if not file_path.exists():
             raise FileNotFoundError(f"Audio file not found: {file_path}")
-        return asyncio.run(self._transcribe_async(file_path))
+        return asyncio.run(self._transcribe_async(file_path, audio_seconds))
+
+    async def _transcribe_async(
+        self, file_path: Path, audio_seconds: float | None = None
+    ) -> dict[str, object]:
+        outcomes = await self.transcribe_batch_async([file_path], audio_seconds)
+        outcome = outcomes.get(file_path.name)
+        if outcome is None and len(outcomes) == 1:
+            outcome = next(iter(outcomes.values()))
+        if not isinstance(outcome, dict):
+            raise RuntimeError(outcome or "Sarvam STT job failed")
+        return outcome
+
+    async def transcribe_batch_async(
+        self, file_paths: list[Path], audio_seconds: float | None = None
+    ) -> dict[str, dict[str, object] | str]:
+        for file_path in file_paths:
+            if not file_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {file_path}")
+        return await call_with_retries_async(
+            "sarvam", lambda: self._transcribe_batch_async(file_paths, audio_seconds)
+        )
 
-    async def _transcribe_async(self, file_path: Path) -> dict[str, object]:
+    async def _transcribe_batch_async(
+        self, file_paths: list[Path], audio_seconds: float | None = None
+    ) -> dict[str, dict[str, object] | str]:
+        """Run one job for all files; map each file name to its parsed output or error."""
+        await get_rate_limiter("sarvam").acquire_async(
+            requests=1, audio_seconds=audio_seconds or 0
+        )
         job = await self.client.speech_to_text_translate_job.create_job(
             model=self.model,
             with_diarization=True,
             num_speakers=self.num_speakers,
             prompt=self.prompt,
         )
-        await job.upload_files(file_paths=[str(file_path)])
+        await job.upload_files(file_paths=[str(file_path) for file_path in file_paths])
         await job.start()
         await job.wait_until_complete()
 
@@ -74,48 +108,97 @@ class SarvamSttAgent(BaseModel):
             if isinstance(results, dict)
             else []
         )
+        outcomes: dict[str, dict[str, object] | str] = {
+            str(entry.get("file_name")): (
+                entry.get("error_message") or "Sarvam STT job failed"
+            )
+            for entry in failed
+        }
         if not successful:
-            failure_message = "Sarvam STT job failed"
-            if failed:
-                failure_message = (
-                    failed[0].get("error_message") or failure_message
-                )
-            raise RuntimeError(failure_message)
+            return outcomes
 
-        output_dir = Path(
-            tempfile.mkdtemp(prefix="sarvam_outputs_", dir=file_path.parent)
+        file_names = [
+            entry.get("file_name") or file_paths[0].name for entry in successful
+        ]
+        try:
+            payloads = await self._fetch_outputs(job, file_names)
+        except Exception as exc:
+            logger.warning("Sarvam output links failed, downloading instead: %s", exc)
+            payloads = await self._download_outputs(job, file_names)
+        for file_name in file_names:
+            outcomes[file_name] = self._parse_payload(payloads[file_name])
+        return outcomes
+
+    async def _fetch_outputs(
+        self, job: object, file_names: list[str]
+    ) -> dict[str, object]:
+        """Read each result JSON straight from its download link, without touching disk."""
+        output_names = {f"{file_name}.json": file_name for file_name in file_names}
+        links = await self.client.speech_to_text_translate_job.get_download_links(
+            job_id=job.job_id, files=list(output_names)
         )
+        download_urls = links.download_urls or {}
+        missing = [name for name in output_names if name not in download_urls]
+        if missing:
+            raise RuntimeError(f"No download link for {', '.join(missing)}")
+
+        http_client = self.http_client or httpx.AsyncClient()
+        try:
+            payloads: dict[str, object] = {}
+            for output_name, file_name in output_names.items():
+                response = await http_client.get(download_urls[output_name].file_url)
+                response.raise_for_status()
+                try:
+                    payloads[file_name] = response.json()
+                except ValueError:
+                    payloads[file_name] = response.text
+            return payloads
+        finally:
+            if http_client is not self.http_client:
+                await http_client.aclose()
+
+    async def _download_outputs(
+        self, job: object, file_names: list[str]
+    ) -> dict[str, object]:
+        # System temp rather than the upload volume, which may be network mounted.
+        output_dir = Path(tempfile.mkdtemp(prefix="sarvam_outputs_"))
         try:
             await job.download_outputs(output_dir=str(output_dir))
-            output_file = self._find_output_file(
-                output_dir, successful[0].get("file_name", file_path.name)
-            )
-            return self._parse_output(output_file)
+            return {
+                file_name: self._read_output(
+                    self._find_output_file(
+                        output_dir, file_name, only_output=len(file_names) == 1
+                    )
+                )
+                for file_name in file_names
+            }
         finally:
             shutil.rmtree(output_dir, ignore_errors=True)
 
-    def _find_output_file(self, output_dir: Path, file_name: str) -> Path:
+    def _find_output_file(
+        self, output_dir: Path, file_name: str, only_output: bool = True
+    ) -> Path:
+        exact = output_dir / f"{file_name}.json"
+        if exact.exists():
+            return exact
         stem = Path(file_name).stem
-        candidates = sorted(output_dir.glob(f"{stem}*"))
-        if not candidates:
+        candidates = sorted(output_dir.glob(f"{stem}.*"))
+        if not candidates and only_output:
             candidates = sorted(output_dir.iterdir())
         if not candidates:
             raise RuntimeError("Sarvam output files not found")
         return candidates[0]
 
-    def _parse_output(self, output_file: Path) -> dict[str, object]:
-        suffix = output_file.suffix.lower()
-        if suffix == ".json":
-            data = json.loads(output_file.read_text(encoding="utf-8"))
-            text = self._extract_text(data)
-            segments = self._extract_segments(data)
-        else:
-            text = output_file.read_text(encoding="utf-8", errors="ignore")
-            segments = []
-
-        if not text and segments:
-            text = " ".join(segment.get("text", "") for segment in segments).strip()
+    def _read_output(self, output_file: Path) -> object:
+        if output_file.suffix.lower() == ".json":
+            return json.loads(output_file.read_text(encoding="utf-8"))
+        return output_file.read_text(encoding="utf-8", errors="ignore")
 
+    def _parse_payload(self, data: object) -> dict[str, object]:
+        if isinstance(data, str):
+            return {"text": data, "segments": []}
+        segments, segment_text = self._extract_segments(data)
+        text = self._extract_text(data) or segment_text
         return {"text": text or "", "segments": segments}
 
     def _extract_text(self, data: object) -> str:
@@ -129,13 +212,15 @@ class SarvamSttAgent(BaseModel):
                 return self._extract_text(nested)
         return ""
 
-    def _extract_segments(self, data: object) -> list[dict[str, object]]:
+    def _extract_segments(
+        self, data: object
+    ) -> tuple[list[dict[str, object]], str]:
         if isinstance(data, dict):
             diarized = data.get("diarized_transcript")
             if isinstance(diarized, dict):
                 entries = diarized.get("entries")
                 if isinstance(entries, list):
-                    return self._normalize_diarized_entries(entries)
+                    return self._normalize_segments(entries)
             for key in ("segments", "utterances", "diarized_segments", "speaker_segments"):
                 value = data.get(key)
                 if isinstance(value, list):
@@ -146,28 +231,38 @@ class SarvamSttAgent(BaseModel):
                     value = diarization.get(key)
                     if isinstance(value, list):
                         return self._normalize_segments(value)
-        return []
+        return [], ""
 
     def _normalize_segments(
         self, raw_segments: list[object]
-    ) -> list[dict[str, object]]:
+    ) -> tuple[list[dict[str, object]], str]:
+        """Normalize Sarvam diarized entries or generic segments, collecting their text."""
         segments: list[dict[str, object]] = []
+        texts: list[str] = []
         for raw in raw_segments:
             if not isinstance(raw, dict):
                 continue
             text = (
-                raw.get("text")
+                raw.get("transcript")
+                or raw.get("text")
                 or raw.get("utterance")
-                or raw.get("transcript")
                 or ""
             )
-            start = self._extract_time(raw, "start")
-            end = self._extract_time(raw, "end")
-            speaker = (
-                raw.get("speaker")
-                or raw.get("speaker_label")
-                or raw.get("speaker_id")
-                or raw.get("speaker_name")
+            if "start_time_seconds" in raw or "end_time_seconds" in raw:
+                start = raw.get("start_time_seconds")
+                end = raw.get("end_time_seconds")
+                start = float(start) if isinstance(start, (int, float)) else None
+                end = float(end) if isinstance(end, (int, float)) else None
+            else:
+                start = self._extract_time(raw, "start")
+                end = self._extract_time(raw, "end")
+            speaker = next(
+                (
+                    raw[key]
+                    for key in ("speaker", "speaker_label", "speaker_id", "speaker_name")
+                    if raw.get(key) is not None
+                ),
+                None,
             )
             segments.append(
                 {
@@ -176,29 +271,9 @@ class SarvamSttAgent(BaseModel):
                     "text": text,
                 }
             )
-        return segments
-
-    def _normalize_diarized_entries(
-        self, entries: list[object]
-    ) -> list[dict[str, object]]:
-        segments: list[dict[str, object]] = []
-        for entry in entries:
-            if not isinstance(entry, dict):
-                continue
-            text = entry.get("transcript") or entry.get("text") or ""
-            start = entry.get("start_time_seconds")
-            end = entry.get("end_time_seconds")
-            start_value = float(start) if isinstance(start, (int, float)) else None
-            end_value = float(end) if isinstance(end, (int, float)) else None
-            speaker = entry.get("speaker_id")
-            segments.append(
-                {
-                    "speaker": self._normalize_speaker(speaker),
-                    "timestamp": {"start": start_value, "end": end_value},
-                    "text": text,
-                }
-            )
-        return segments
+            if text:
+                texts.append(str(text))
+        return segments, " ".join(texts).strip()
 
     def _extract_time(self, raw: dict[str, object], prefix: str) -> float | None:
         for key in (
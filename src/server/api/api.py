@@ -2,25 +2,42 @@ from __future__ import annotations
 
 import asyncio
 
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, File, Header, Request, UploadFile
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
 
 from server.config import get_api_base_url
+from server.core.events import stream_session_events
+from server.core.metrics import render_metrics
 from server.services.services import (
     enqueue_chunked_processing,
     get_session_detail,
     get_session_notes,
     get_transcript_segments,
     list_sessions,
+    open_session_notes_stream,
     list_transcripts,
     save_audio,
     save_session_audio,
 )
+from server.services.uploads import (
+    create_resumable_upload,
+    finalize_resumable_upload,
+    get_resumable_upload,
+    write_resumable_upload_range,
+)
 
 router = APIRouter()
 
 
+class ResumableUploadRequest(BaseModel):
+    filename: str
+    content_type: str
+    total_bytes: int
+
+
 @router.post("/upload")
-async def upload_audio(file: UploadFile = File(...)) -> dict[str, str]:
+async def upload_audio(file: UploadFile = File(...)) -> dict[str, str | int]:
     return await save_audio(file)
 
 
@@ -29,9 +46,38 @@ async def upload_session_audio(file: UploadFile = File(...)) -> dict[str, object
     return await save_session_audio(file)
 
 
+@router.post("/sessions/uploads")
+async def create_session_upload(payload: ResumableUploadRequest) -> dict[str, object]:
+    return await asyncio.to_thread(
+        create_resumable_upload,
+        filename=payload.filename,
+        content_type=payload.content_type,
+        total_bytes=payload.total_bytes,
+    )
+
+
+@router.get("/sessions/uploads/{upload_id}")
+async def get_session_upload(upload_id: str) -> dict[str, object]:
+    return await asyncio.to_thread(get_resumable_upload, upload_id)
+
+
+@router.patch("/sessions/uploads/{upload_id}")
+async def upload_session_range(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+) -> dict[str, object]:
+    return await write_resumable_upload_range(upload_id, upload_offset, request.stream())
+
+
+@router.post("/sessions/uploads/{upload_id}/complete")
+async def complete_session_upload(upload_id: str) -> dict[str, object]:
+    return await asyncio.to_thread(finalize_resumable_upload, upload_id)
+
+
 @router.post("/sessions/{session_id}/process-large")
-async def process_large_audio(session_id: int) -> dict[str, object]:
-    return await asyncio.to_thread(enqueue_chunked_processing, session_id)
+async def process_large_audio(session_id: int, force: bool = False) -> dict[str, object]:
+    return await asyncio.to_thread(enqueue_chunked_processing, session_id, force)
 
 
 @router.get("/transcripts")
@@ -58,11 +104,36 @@ async def get_session(session_id: int) -> dict[str, object]:
     return await asyncio.to_thread(get_session_detail, session_id)
 
 
+@router.get("/sessions/{session_id}/events")
+async def get_session_events(session_id: int) -> StreamingResponse:
+    detail = await asyncio.to_thread(get_session_detail, session_id)
+    return StreamingResponse(
+        stream_session_events(session_id, str(detail["status"])),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/sessions/{session_id}/notes")
 async def get_notes(session_id: int) -> dict[str, object]:
     return await asyncio.to_thread(get_session_notes, session_id)
 
 
+@router.post("/sessions/{session_id}/notes/stream")
+async def stream_notes(session_id: int) -> StreamingResponse:
+    frames = await asyncio.to_thread(open_session_notes_stream, session_id)
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/config")
 def get_config() -> dict[str, str]:
     return {"API_BASE_URL": get_api_base_url()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> str:
+    return await asyncio.to_thread(render_metrics)
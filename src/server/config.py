@@ -86,6 +86,106 @@ def get_sarvam_prompt() -> str | None:
     return prompt or "Counseling session"
 
 
+def get_sarvam_timeout_seconds() -> float:
+    return _get_float("SARVAM_TIMEOUT_SECONDS", 60.0)
+
+
+def get_sarvam_max_connections() -> int:
+    return max(_get_int("SARVAM_MAX_CONNECTIONS", 20), 1)
+
+
+def get_openai_max_connections() -> int:
+    return max(_get_int("OPENAI_MAX_CONNECTIONS", 20), 1)
+
+
+def get_http_keepalive_expiry_seconds() -> float:
+    return max(_get_float("HTTP_KEEPALIVE_EXPIRY_SECONDS", 30.0), 0.0)
+
+
+def get_sarvam_batch_size() -> int:
+    return max(_get_int("SARVAM_BATCH_SIZE", 4), 1)
+
+
+def get_sarvam_batch_fill_seconds() -> float:
+    return max(_get_float("SARVAM_BATCH_FILL_SECONDS", 2.0), 0.0)
+
+
+def get_db_executor_workers() -> int:
+    return max(_get_int("DB_EXECUTOR_WORKERS", 4), 1)
+
+
+def get_sarvam_requests_per_minute() -> int:
+    return max(_get_int("SARVAM_REQUESTS_PER_MINUTE", 60), 0)
+
+
+def get_sarvam_audio_seconds_per_minute() -> int:
+    return max(_get_int("SARVAM_AUDIO_SECONDS_PER_MINUTE", 3600), 0)
+
+
+def get_openai_chat_requests_per_minute() -> int:
+    return max(_get_int("OPENAI_CHAT_REQUESTS_PER_MINUTE", 500), 0)
+
+
+def get_openai_chat_tokens_per_minute() -> int:
+    return max(_get_int("OPENAI_CHAT_TOKENS_PER_MINUTE", 200000), 0)
+
+
+def get_openai_embedding_requests_per_minute() -> int:
+    return max(_get_int("OPENAI_EMBEDDING_REQUESTS_PER_MINUTE", 3000), 0)
+
+
+def get_openai_embedding_tokens_per_minute() -> int:
+    return max(_get_int("OPENAI_EMBEDDING_TOKENS_PER_MINUTE", 1000000), 0)
+
+
+def get_notes_map_reduce_token_threshold() -> int:
+    return max(_get_int("NOTES_MAP_REDUCE_TOKEN_THRESHOLD", 12000), 0)
+
+
+def get_notes_window_seconds() -> float:
+    return max(_get_float("NOTES_WINDOW_SECONDS", 600.0), 60.0)
+
+
+def get_notes_map_concurrency() -> int:
+    return max(_get_int("NOTES_MAP_CONCURRENCY", 4), 1)
+
+
+def get_notes_prompt_token_budget() -> int:
+    return max(_get_int("NOTES_PROMPT_TOKEN_BUDGET", 16000), 1000)
+
+
+def get_notes_cache_ttl_seconds() -> int:
+    return max(_get_int("NOTES_CACHE_TTL_SECONDS", 7 * 24 * 3600), 0)
+
+
+def get_notes_cache_max_entries() -> int:
+    return max(_get_int("NOTES_CACHE_MAX_ENTRIES", 1000), 0)
+
+
+def get_provider_max_attempts() -> int:
+    return max(_get_int("PROVIDER_MAX_ATTEMPTS", 3), 1)
+
+
+def get_provider_backoff_base_seconds() -> float:
+    return max(_get_float("PROVIDER_BACKOFF_BASE_SECONDS", 1.0), 0.0)
+
+
+def get_provider_backoff_max_seconds() -> float:
+    return max(_get_float("PROVIDER_BACKOFF_MAX_SECONDS", 30.0), 0.0)
+
+
+def get_circuit_failure_threshold() -> int:
+    return max(_get_int("CIRCUIT_FAILURE_THRESHOLD", 5), 1)
+
+
+def get_circuit_failure_window_seconds() -> int:
+    return max(_get_int("CIRCUIT_FAILURE_WINDOW_SECONDS", 60), 1)
+
+
+def get_circuit_open_seconds() -> int:
+    return max(_get_int("CIRCUIT_OPEN_SECONDS", 30), 1)
+
+
 def get_qdrant_url() -> str:
     return os.getenv("QDRANT_URL", "http://localhost:6333")
 
@@ -107,5 +207,105 @@ def get_celery_result_backend() -> str:
     return os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
 
 
+def get_redis_url() -> str:
+    return os.getenv("REDIS_URL", "").strip() or get_celery_broker_url()
+
+
+def get_session_events_max_seconds() -> int:
+    return max(_get_int("SESSION_EVENTS_MAX_SECONDS", 3600), 60)
+
+
+def get_merge_wait_max_seconds() -> int:
+    return max(_get_int("MERGE_WAIT_MAX_SECONDS", 3600), 60)
+
+
+def get_session_processing_mode() -> str:
+    mode = os.getenv("SESSION_PROCESSING_MODE", "local").strip().lower()
+    return mode if mode in {"local", "distributed"} else "local"
+
+
+def get_chunk_session_concurrency() -> int:
+    return max(_get_int("CHUNK_SESSION_CONCURRENCY", 4), 1)
+
+
+def get_stt_concurrency_min() -> int:
+    return max(_get_int("STT_CONCURRENCY_MIN", 1), 1)
+
+
+def get_stt_concurrency_max() -> int:
+    return max(_get_int("STT_CONCURRENCY_MAX", 16), get_stt_concurrency_min())
+
+
+def get_stt_target_latency_seconds() -> float:
+    return _get_float("STT_TARGET_LATENCY_SECONDS", 60.0)
+
+
+def get_chunk_global_concurrency() -> int:
+    return max(_get_int("CHUNK_GLOBAL_CONCURRENCY", 16), 0)
+
+
+def get_chunk_slot_lease_seconds() -> int:
+    return max(_get_int("CHUNK_SLOT_LEASE_SECONDS", 900), 60)
+
+
+def get_session_lease_seconds() -> int:
+    return max(_get_int("SESSION_LEASE_SECONDS", 900), 60)
+
+
 def get_audio_chunk_seconds() -> int:
-    return _get_int("AUDIO_CHUNK_SECONDS", 600)
+    # Must exceed the chunk planner's 0.5s hard-cut margin or cutting never advances.
+    seconds = _get_int("AUDIO_CHUNK_SECONDS", 600)
+    if seconds < 1:
+        raise ValueError(f"AUDIO_CHUNK_SECONDS must be at least 1, got {seconds}")
+    return seconds
+
+
+get_audio_chunk_seconds()  # Fail at startup rather than in the first chunking task.
+
+
+def get_audio_chunk_min_seconds() -> float:
+    return _get_float("AUDIO_CHUNK_MIN_SECONDS", 10.0)
+
+
+def get_stt_chunk_codec() -> str:
+    codec = os.getenv("STT_CHUNK_CODEC", "copy").strip().lower()
+    return codec if codec in {"copy", "flac", "opus"} else "copy"
+
+
+def get_stt_chunk_bitrate() -> str:
+    return os.getenv("STT_CHUNK_BITRATE", "24k").strip() or "24k"
+
+
+def get_chunk_max_attempts() -> int:
+    return max(_get_int("CHUNK_MAX_ATTEMPTS", 3), 1)
+
+
+def get_audio_silence_noise_db() -> float:
+    return _get_float("AUDIO_SILENCE_NOISE_DB", -35.0)
+
+
+def get_audio_silence_min_seconds() -> float:
+    return _get_float("AUDIO_SILENCE_MIN_SECONDS", 0.3)
+
+
+def get_upload_dir() -> Path:
+    upload_dir = os.getenv("UPLOAD_DIR", "").strip()
+    if upload_dir:
+        return Path(upload_dir)
+    return _ROOT_DIR / "src" / "server" / "uploads"
+
+
+def get_upload_max_bytes() -> int:
+    return _get_int("UPLOAD_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+
+
+def get_upload_block_size() -> int:
+    return max(_get_int("UPLOAD_BLOCK_SIZE", 1024 * 1024), 64 * 1024)
+
+
+def get_upload_abandon_seconds() -> int:
+    return max(_get_int("UPLOAD_ABANDON_SECONDS", 24 * 3600), 600)
+
+
+def get_upload_sweep_interval_seconds() -> int:
+    return max(_get_int("UPLOAD_SWEEP_INTERVAL_SECONDS", 3600), 60)
@@ -1,14 +1,46 @@
 from __future__ import annotations
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
-from server.config import get_celery_broker_url, get_celery_result_backend
+from server.config import (
+    get_celery_broker_url,
+    get_celery_result_backend,
+    get_upload_sweep_interval_seconds,
+)
+from server.core.clients import close_clients, init_clients
 
 celery_app = Celery(
     "counseling_notes",
     broker=get_celery_broker_url(),
     backend=get_celery_result_backend(),
-    include=["server.tasks.session_processing"],
+    include=["server.tasks.session_processing", "server.tasks.maintenance"],
 )
 
 celery_app.conf.task_track_started = True
+celery_app.conf.task_routes = {
+    "server.tasks.session_processing.process_session_chunks": {"queue": "stt"},
+    "server.tasks.session_processing.plan_session_chunks": {"queue": "stt"},
+    "server.tasks.session_processing.transcribe_session_chunks": {"queue": "stt"},
+    "server.tasks.session_processing.merge_session_chunks": {"queue": "merge"},
+    "server.tasks.session_processing.write_session_notes": {"queue": "notes"},
+    "server.tasks.session_processing.summarize_session_windows": {"queue": "notes"},
+    "server.tasks.session_processing.index_session_notes": {"queue": "indexing"},
+    "server.tasks.maintenance.sweep_abandoned_uploads": {"queue": "merge"},
+}
+celery_app.conf.beat_schedule = {
+    "sweep-abandoned-uploads": {
+        "task": "server.tasks.maintenance.sweep_abandoned_uploads",
+        "schedule": get_upload_sweep_interval_seconds(),
+    },
+}
+
+
+@worker_process_init.connect
+def init_worker_clients(**_kwargs) -> None:
+    init_clients(include_sarvam=True)
+
+
+@worker_process_shutdown.connect
+def close_worker_clients(**_kwargs) -> None:
+    close_clients()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, TypeVar
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from qdrant_client import QdrantClient
+from sarvamai import AsyncSarvamAI
+
+from server.config import (
+    get_http_keepalive_expiry_seconds,
+    get_openai_api_key,
+    get_openai_embedding_model,
+    get_openai_max_connections,
+    get_openai_proxy_url,
+    get_openai_timeout_seconds,
+    get_qdrant_api_key,
+    get_qdrant_url,
+    get_sarvam_api_key,
+    get_sarvam_max_connections,
+    get_sarvam_timeout_seconds,
+)
+from server.core.event_loop import run_async
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CHAT_MODEL = "gpt-4o-mini"
+
+_lock = threading.RLock()
+_clients: dict[str, object] = {}
+
+
+def _get(name: str, build: Callable[[], T]) -> T:
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = build()
+    return client
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=get_http_keepalive_expiry_seconds(),
+    )
+
+
+def _openai_api_key() -> str:
+    api_key = get_openai_api_key()
+    if not api_key or api_key == "YOUR_OPENAI_API_KEY":
+        raise ValueError("Missing OpenAI API key")
+    return api_key
+
+
+def get_openai_http_client() -> httpx.Client:
+    """Keep-alive pool shared by the chat and embedding clients."""
+    return _get(
+        "openai_http",
+        lambda: httpx.Client(
+            timeout=get_openai_timeout_seconds(),
+            limits=_limits(get_openai_max_connections()),
+        ),
+    )
+
+
+def get_chat_model() -> ChatOpenAI:
+    return _get(
+        "openai_chat",
+        lambda: ChatOpenAI(
+            model=CHAT_MODEL,
+            api_key=_openai_api_key(),
+            base_url=get_openai_proxy_url(),
+            # Retries go through server.core.resilience, not the SDK.
+            max_retries=0,
+            timeout=get_openai_timeout_seconds(),
+            http_client=get_openai_http_client(),
+        ),
+    )
+
+
+def get_embeddings() -> OpenAIEmbeddings:
+    return _get(
+        "openai_embeddings",
+        lambda: OpenAIEmbeddings(
+            model=get_openai_embedding_model(),
+            api_key=_openai_api_key(),
+            base_url=get_openai_proxy_url(),
+            max_retries=0,
+            timeout=get_openai_timeout_seconds(),
+            http_client=get_openai_http_client(),
+        ),
+    )
+
+
+def get_qdrant_client() -> QdrantClient:
+    return _get(
+        "qdrant",
+        lambda: QdrantClient(
+            url=get_qdrant_url(),
+            api_key=get_qdrant_api_key(),
+            check_compatibility=False,
+        ),
+    )
+
+
+def get_sarvam_http_client() -> httpx.AsyncClient:
+    return _get(
+        "sarvam_http",
+        lambda: httpx.AsyncClient(
+            timeout=get_sarvam_timeout_seconds(),
+            limits=_limits(get_sarvam_max_connections()),
+        ),
+    )
+
+
+def _build_sarvam_client() -> AsyncSarvamAI:
+    api_key = get_sarvam_api_key()
+    if not api_key:
+        raise ValueError("Missing SarvamAI API key")
+    return AsyncSarvamAI(
+        api_subscription_key=api_key,
+        httpx_client=get_sarvam_http_client(),
+        timeout=get_sarvam_timeout_seconds(),
+    )
+
+
+def get_sarvam_client() -> AsyncSarvamAI:
+    """Async client for `run_async`'s loop; its pool is bound to that loop."""
+    return _get("sarvam", _build_sarvam_client)
+
+
+def init_clients(*, include_sarvam: bool = False) -> None:
+    """Build the process's clients up front so the first request skips setup."""
+    with _lock:
+        # Drop (without closing) anything inherited from a forking parent.
+        _clients.clear()
+    builders: list[tuple[str, Callable[[], object]]] = [
+        ("openai", get_chat_model),
+        ("openai", get_embeddings),
+        ("qdrant", get_qdrant_client),
+    ]
+    if include_sarvam:
+        builders.append(("sarvam", get_sarvam_client))
+    for provider, build in builders:
+        try:
+            build()
+        except Exception as exc:
+            logger.warning("Could not initialize %s client: %s", provider, exc)
+
+
+def close_clients() -> None:
+    """Close pooled connections; later lookups build fresh clients."""
+    with _lock:
+        clients = dict(_clients)
+        _clients.clear()
+    for name, client in clients.items():
+        try:
+            if name == "sarvam_http":
+                run_async(client.aclose())
+            elif isinstance(client, (httpx.Client, QdrantClient)):
+                client.close()
+        except Exception as exc:
+            logger.warning("Could not close %s client: %s", name, exc)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator
+from uuid import uuid4
+
+from httpx import TimeoutException
+from openai import APITimeoutError, RateLimitError
+from redis import Redis
+
+from server.core.metrics import increment_counter, set_gauges
+
+_ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local now = tonumber(ARGV[2])
+local lease = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - lease)
+if redis.call('ZCARD', key) < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('EXPIRE', key, math.ceil(lease))
+    return 1
+end
+return 0
+"""
+
+
+class RedisSemaphore:
+    """Cluster-wide counting semaphore; slots expire after `lease_seconds`."""
+
+    def __init__(self, client: Redis, name: str, *, limit: int, lease_seconds: int) -> None:
+        self.client = client
+        self.key = f"semaphore:{name}"
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+
+    def acquire(self) -> str | None:
+        if self.limit <= 0:
+            return ""
+        token = uuid4().hex
+        acquired = self._acquire(
+            keys=[self.key],
+            args=[self.limit, time.time(), self.lease_seconds, token],
+        )
+        return token if acquired else None
+
+    def refresh(self, token: str | None) -> None:
+        """Restart `token`'s lease so a long job keeps its slot."""
+        if token:
+            pipeline = self.client.pipeline()
+            pipeline.zadd(self.key, {token: time.time()}, xx=True)
+            pipeline.expire(self.key, self.lease_seconds)
+            pipeline.execute()
+
+    def release(self, token: str | None) -> None:
+        if token:
+            self.client.zrem(self.key, token)
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    if isinstance(
+        exc, (TimeoutError, TimeoutException, APITimeoutError, RateLimitError)
+    ):
+        return True
+    return getattr(exc, "status_code", None) in {429, 503}
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for calls to a rate-limited provider.
+
+    Every `limit` healthy calls (no error, latency under target) raise the
+    limit by one; a 429 or timeout multiplies it by `decrease_factor`, at most
+    once per `target_latency_seconds` so one burst of throttling counts once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_latency_seconds: float,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.name = name
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.target_latency_seconds = target_latency_seconds
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.waiting = 0
+        self._healthy = 0
+        self._last_decrease = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._condition: asyncio.Condition | None = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            # Each worker process keeps one long-lived loop (`run_async`), so this
+            # only fires when a different loop (e.g. a test's) takes over; the
+            # learned limit carries over, the slot counts do not.
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self.in_flight = 0
+            self.waiting = 0
+        return self._condition
+
+    def _publish(self, outcome: str | None = None) -> None:
+        """Hand the current gauges to a worker thread; Redis never blocks the loop."""
+        gauges = {
+            "concurrency_limit": int(self.limit),
+            "concurrency_in_flight": self.in_flight,
+            "concurrency_queue_depth": self.waiting,
+        }
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, partial(set_gauges, gauges, limiter=self.name))
+        if outcome is not None:
+            loop.run_in_executor(
+                None,
+                partial(
+                    increment_counter,
+                    "concurrency_calls_total",
+                    limiter=self.name,
+                    outcome=outcome,
+                ),
+            )
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.target_latency_seconds:
+            return
+        self._last_decrease = now
+        self.limit = max(self.limit * self.decrease_factor, float(self.minimum))
+        self._healthy = 0
+
+    def _record(self, *, latency_seconds: float, error: BaseException | None) -> str:
+        if error is not None:
+            outcome = "overload" if is_overload_error(error) else "error"
+            if outcome == "overload":
+                self._decrease()
+            else:
+                self._healthy = 0
+        elif latency_seconds > self.target_latency_seconds:
+            outcome = "slow"
+            self._healthy = 0
+        else:
+            outcome = "ok"
+            self._healthy += 1
+            if self._healthy >= int(self.limit):
+                self.limit = min(self.limit + 1, float(self.maximum))
+                self._healthy = 0
+        return outcome
+
+    async def acquire(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.waiting += 1
+            self._publish()
+            try:
+                await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            self._publish()
+
+    async def release(
+        self, *, latency_seconds: float, error: BaseException | None = None
+    ) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight = max(self.in_flight - 1, 0)
+            outcome = self._record(latency_seconds=latency_seconds, error=error)
+            condition.notify_all()
+            self._publish(outcome)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        started = time.monotonic()
+        error: BaseException | None = None
+        try:
+            yield
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            await self.release(
+                latency_seconds=time.monotonic() - started, error=error
+            )
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import AsyncIterator
+
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from server.config import get_redis_url, get_session_events_max_seconds
+from server.core.redis_client import get_redis
+
+TERMINAL_STAGES = {"noted", "transcribed", "failed"}
+STATE_TTL_SECONDS = 24 * 60 * 60
+KEEPALIVE_SECONDS = 15.0
+
+
+def _channel(session_id: int) -> str:
+    return f"session-events:{session_id}"
+
+
+def _state_key(session_id: int) -> str:
+    return f"session-state:{session_id}"
+
+
+def publish_session_event(session_id: int, event_type: str, **data: object) -> None:
+    """Publish a pipeline event and fold it into the session's latest state."""
+    event = {"type": event_type, "session_id": session_id, "at": time.time(), **data}
+    state = {key: json.dumps(value) for key, value in data.items()}
+    try:
+        client = get_redis()
+        pipeline = client.pipeline()
+        if state:
+            pipeline.hset(_state_key(session_id), mapping=state)
+        pipeline.expire(_state_key(session_id), STATE_TTL_SECONDS)
+        pipeline.publish(_channel(session_id), json.dumps(event))
+        pipeline.execute()
+    except RedisError:
+        pass
+
+
+def publish_stage(session_id: int, stage: str, **data: object) -> None:
+    if stage in {"queued", "transcribing"}:
+        try:
+            get_redis().delete(_state_key(session_id))
+        except RedisError:
+            pass
+    publish_session_event(session_id, "stage", stage=stage, **data)
+
+
+def publish_progress(
+    session_id: int, *, completed: int, total: int, planned: bool | None = None
+) -> None:
+    """Publish chunk counts with an ETA from this run's completion rate."""
+    now = time.time()
+    eta_seconds = None
+    try:
+        client = get_redis()
+        key = _state_key(session_id)
+        client.hsetnx(key, "progress_started_at", json.dumps(now))
+        client.hsetnx(key, "progress_baseline", json.dumps(completed))
+        if planned is not None:
+            client.hset(key, "planned", json.dumps(planned))
+        started_at, baseline, is_planned = client.hmget(
+            key, "progress_started_at", "progress_baseline", "planned"
+        )
+        finished_here = completed - json.loads(baseline)
+        elapsed = now - json.loads(started_at)
+        if json.loads(is_planned or "false") and finished_here > 0 and elapsed > 0:
+            eta_seconds = round((total - completed) * elapsed / finished_here, 1)
+    except RedisError:
+        pass
+    publish_session_event(
+        session_id,
+        "progress",
+        completed=completed,
+        total=total,
+        eta_seconds=eta_seconds,
+    )
+
+
+def publish_error(session_id: int, message: str, **data: object) -> None:
+    # Not "error": EventSource fires its own "error" event on connection loss.
+    publish_session_event(session_id, "pipeline_error", error=message, **data)
+
+
+def format_sse_event(event_type: str, payload: dict[str, object]) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def stream_session_events(
+    session_id: int, fallback_stage: str
+) -> AsyncIterator[str]:
+    """Yield a snapshot of the latest state, then live events until a terminal stage.
+
+    A session with no state hash has no pipeline publishing for it (never queued,
+    or its state expired), so it gets a snapshot with ``running: false`` and the
+    stream ends; otherwise the stream ends after ``SESSION_EVENTS_MAX_SECONDS``
+    and the client reconnects for a fresh snapshot.
+    """
+    client = AsyncRedis.from_url(get_redis_url())
+    pubsub = client.pubsub()
+    deadline = time.monotonic() + get_session_events_max_seconds()
+    try:
+        await pubsub.subscribe(_channel(session_id))
+        raw_state = await client.hgetall(_state_key(session_id))
+        snapshot: dict[str, object] = {
+            key.decode(): json.loads(value)
+            for key, value in raw_state.items()
+            if not key.decode().startswith("progress_")
+        }
+        snapshot.setdefault("stage", fallback_stage)
+        snapshot["session_id"] = session_id
+        snapshot["running"] = (
+            bool(raw_state) and snapshot["stage"] not in TERMINAL_STAGES
+        )
+        yield format_sse_event("snapshot", snapshot)
+        if not snapshot["running"]:
+            return
+
+        while time.monotonic() < deadline:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=KEEPALIVE_SECONDS
+            )
+            if message is None:
+                if not await client.exists(_state_key(session_id)):
+                    idle = {"stage": fallback_stage, "session_id": session_id}
+                    yield format_sse_event("snapshot", {**idle, "running": False})
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            event = json.loads(message["data"])
+            yield format_sse_event(event["type"], event)
+            if event["type"] == "stage" and event.get("stage") in TERMINAL_STAGES:
+                return
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+        await client.aclose()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+from functools import lru_cache
+from typing import Awaitable, Callable, Sequence, TypeVar
+
+from celery import Task
+from redis.commands.core import Script
+
+from server.config import get_session_lease_seconds
+from server.core.events import publish_stage
+from server.core.locks import refresh_if_owner, release_if_owner
+from server.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_CLAIM_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    return current
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return ARGV[1]
+"""
+
+
+@lru_cache(maxsize=1)
+def _claim_script() -> Script:
+    return get_redis().register_script(_CLAIM_SCRIPT)
+
+
+class LeaseLostError(RuntimeError):
+    """The session lease expired or now belongs to another run; stop working."""
+
+
+def lease_owner(request) -> str:
+    """The lease owner of a pipeline task: the id of the task the API enqueued."""
+    return request.root_id or request.id
+
+
+class SessionLease:
+    """Marks a session's pipeline as in flight; expires unless a worker keeps refreshing it.
+
+    The lease is held from enqueue until the notes are indexed (or the pipeline
+    fails for good) and only `owner` can release it, so a late task of an older
+    run cannot drop the lease of a newer one.
+    """
+
+    def __init__(self, session_id: int, owner: str) -> None:
+        self.key = f"lease:session-processing:{session_id}"
+        self.owner = owner
+        self.ttl_seconds = get_session_lease_seconds()
+
+    def claim(self) -> str:
+        """Take the lease for `owner` if it is free; return whoever holds it now."""
+        holder = _claim_script()(keys=[self.key], args=[self.owner, self.ttl_seconds])
+        return holder.decode() if isinstance(holder, bytes) else str(holder)
+
+    def holder(self) -> str | None:
+        holder = get_redis().get(self.key)
+        return holder.decode() if isinstance(holder, bytes) else holder
+
+    def refresh(self) -> bool:
+        """Extend the lease while `owner` still holds it; return whether it did."""
+        return refresh_if_owner(self.key, self.owner, self.ttl_seconds)
+
+    def hold(self) -> None:
+        """Refresh the lease, or raise `LeaseLostError` if it is no longer ours."""
+        if not self.refresh():
+            raise LeaseLostError(f"{self.key} is no longer held by {self.owner}")
+
+    def release(self) -> bool:
+        return release_if_owner(self.key, self.owner)
+
+    async def keep_alive(
+        self,
+        awaitable: Awaitable[T],
+        *,
+        also: Sequence[Callable[[], object]] = (),
+        interval_seconds: float | None = None,
+    ) -> T:
+        """Await `awaitable` while refreshing the lease; cancel it on a lost lease.
+
+        `also` is called on every beat, for other leases the work holds (e.g.
+        semaphore slots); `interval_seconds` defaults to a third of the TTL.
+        """
+        interval = interval_seconds or self.ttl_seconds / 3
+        work = asyncio.ensure_future(awaitable)
+        try:
+            while True:
+                done, _ = await asyncio.wait({work}, timeout=interval)
+                if done:
+                    return work.result()
+                await asyncio.to_thread(self.hold)
+                for refresh in also:
+                    await asyncio.to_thread(refresh)
+        finally:
+            if not work.done():
+                work.cancel()
+                with suppress(asyncio.CancelledError):
+                    await work
+
+
+class SessionLeaseTask(Task):
+    """Releases the session lease when a pipeline task gives up for good.
+
+    Tasks that run after the transcript is saved set `failure_stage = None` so
+    their failure does not mark the whole session failed.
+    """
+
+    failure_stage: str | None = "failed"
+
+    def session_lease(self, session_id: int) -> SessionLease:
+        return SessionLease(session_id, lease_owner(self.request))
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo) -> None:
+        session_id = args[0] if args else kwargs.get("session_id")
+        if session_id is None:
+            return
+        lease = self.session_lease(session_id)
+        if not lease.release() and lease.holder() is not None:
+            # A newer run owns the session; its stages are not ours to overwrite.
+            logger.warning(
+                "Session %s: stale task %s stopped: %s", session_id, task_id, exc
+            )
+            return
+        if self.failure_stage:
+            publish_stage(session_id, self.failure_stage, error=str(exc))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from uuid import uuid4
+
+from redis.commands.core import Script
+
+from server.core.redis_client import get_redis
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+_REFRESH_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+@lru_cache(maxsize=1)
+def _release_script() -> Script:
+    return get_redis().register_script(_RELEASE_SCRIPT)
+
+
+@lru_cache(maxsize=1)
+def _refresh_script() -> Script:
+    return get_redis().register_script(_REFRESH_SCRIPT)
+
+
+def release_if_owner(key: str, owner: str) -> bool:
+    """Delete `key` only while it still holds `owner`; return whether it did."""
+    return bool(_release_script()(keys=[key], args=[owner]))
+
+
+def refresh_if_owner(key: str, owner: str, ttl_seconds: int) -> bool:
+    """Reset `key`'s TTL only while it still holds `owner`; return whether it did."""
+    return bool(_refresh_script()(keys=[key], args=[owner, ttl_seconds]))
+
+
+class RedisLock:
+    """Token-owned lock that expires after `ttl_seconds` if its holder dies."""
+
+    def __init__(self, key: str, ttl_seconds: int) -> None:
+        self.key = key
+        self.ttl_seconds = ttl_seconds
+        self.token = uuid4().hex
+
+    def acquire(self) -> bool:
+        return bool(
+            get_redis().set(self.key, self.token, nx=True, ex=self.ttl_seconds)
+        )
+
+    def wait(self, timeout_seconds: float, poll_seconds: float = 1.0) -> bool:
+        """Block until the lock is ours or `timeout_seconds` have passed."""
+        deadline = time.monotonic() + timeout_seconds
+        while not self.acquire():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_seconds)
+        return True
+
+    def refresh(self) -> bool:
+        """Extend the lock while it is still ours."""
+        return refresh_if_owner(self.key, self.token, self.ttl_seconds)
+
+    def release(self) -> bool:
+        return release_if_owner(self.key, self.token)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import re
+import socket
+
+from redis.exceptions import RedisError
+
+from server.core.redis_client import get_redis
+
+GAUGES_KEY = "metrics:gauges"
+COUNTERS_KEY = "metrics:counters"
+# Gauges of a worker that has not written any for this long are dropped.
+WORKER_TTL_SECONDS = 300
+
+_WORKER = f"{socket.gethostname()}:{os.getpid()}"
+_WORKER_LABEL_RE = re.compile(r'worker="([^"]*)"')
+
+
+def _heartbeat_key(worker: str) -> str:
+    return f"metrics:heartbeat:{worker}"
+
+
+def _series(name: str, labels: dict[str, object]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+def set_gauges(values: dict[str, float], **labels: object) -> None:
+    """Write gauges sharing `labels` in one round trip and refresh the worker heartbeat."""
+    labels.setdefault("worker", _WORKER)
+    try:
+        pipeline = get_redis().pipeline(transaction=False)
+        pipeline.hset(
+            GAUGES_KEY,
+            mapping={_series(name, labels): value for name, value in values.items()},
+        )
+        pipeline.set(_heartbeat_key(str(labels["worker"])), 1, ex=WORKER_TTL_SECONDS)
+        pipeline.execute()
+    except RedisError:
+        pass
+
+
+def increment_counter(name: str, amount: float = 1.0, **labels: object) -> None:
+    try:
+        get_redis().hincrbyfloat(COUNTERS_KEY, _series(name, labels), amount)
+    except RedisError:
+        pass
+
+
+def _drop_stale_gauges(client, series: dict[str, str]) -> dict[str, str]:
+    """Remove gauges of workers whose heartbeat expired (dead or idle processes)."""
+    workers = sorted(
+        {match.group(1) for match in map(_WORKER_LABEL_RE.search, series) if match}
+    )
+    if not workers:
+        return series
+    pipeline = client.pipeline(transaction=False)
+    for worker in workers:
+        pipeline.exists(_heartbeat_key(worker))
+    alive = {worker for worker, exists in zip(workers, pipeline.execute()) if exists}
+    stale = [
+        field
+        for field in series
+        if (match := _WORKER_LABEL_RE.search(field)) and match.group(1) not in alive
+    ]
+    if stale:
+        client.hdel(GAUGES_KEY, *stale)
+    return {field: value for field, value in series.items() if field not in stale}
+
+
+def render_metrics() -> str:
+    client = get_redis()
+    lines: list[str] = []
+    for key, metric_type in ((GAUGES_KEY, "gauge"), (COUNTERS_KEY, "counter")):
+        series = {
+            field.decode(): value.decode()
+            for field, value in client.hgetall(key).items()
+        }
+        if key == GAUGES_KEY:
+            series = _drop_stale_gauges(client, series)
+        declared: set[str] = set()
+        for field in sorted(series):
+            name = field.split("{", 1)[0]
+            if name not in declared:
+                lines.append(f"# TYPE {name} {metric_type}")
+                declared.add(name)
+            lines.append(f"{field} {series[field]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Callable
+
+from redis.exceptions import RedisError
+
+from server.config import get_notes_cache_max_entries, get_notes_cache_ttl_seconds
+from server.core.metrics import increment_counter
+from server.core.redis_client import get_redis
+
+INDEX_KEY = "notes-cache:index"
+
+
+def _entry_key(cache_key: str) -> str:
+    return f"notes-cache:{cache_key}"
+
+
+def _get(cache_key: str) -> dict[str, object] | None:
+    try:
+        raw = get_redis().get(_entry_key(cache_key))
+    except RedisError:
+        return None
+    if raw is None:
+        return None
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _put(cache_key: str, payload: dict[str, object]) -> None:
+    ttl = get_notes_cache_ttl_seconds()
+    max_entries = get_notes_cache_max_entries()
+    now = time.time()
+    entry_key = _entry_key(cache_key)
+    try:
+        client = get_redis()
+        pipeline = client.pipeline()
+        pipeline.set(entry_key, json.dumps(payload, ensure_ascii=True), ex=ttl)
+        pipeline.zadd(INDEX_KEY, {entry_key: now})
+        pipeline.zremrangebyscore(INDEX_KEY, "-inf", now - ttl)
+        pipeline.zcard(INDEX_KEY)
+        size = pipeline.execute()[-1]
+        if size > max_entries:
+            evicted = client.zpopmin(INDEX_KEY, size - max_entries)
+            if evicted:
+                client.delete(*(key for key, _ in evicted))
+                increment_counter("notes_cache_evictions_total", len(evicted))
+    except RedisError:
+        pass
+
+
+def _enabled() -> bool:
+    return bool(get_notes_cache_ttl_seconds() and get_notes_cache_max_entries())
+
+
+def lookup_notes(cache_key: str) -> dict[str, object] | None:
+    if not _enabled():
+        return None
+    payload = _get(cache_key)
+    result = "hit" if payload is not None else "miss"
+    increment_counter("notes_cache_requests_total", result=result)
+    return payload
+
+
+def store_notes(cache_key: str, payload: dict[str, object]) -> None:
+    # Only cache notes the model returned as valid JSON, not fallbacks.
+    if _enabled() and payload.get("summary") is not None:
+        _put(cache_key, payload)
+
+
+def cached_notes(
+    cache_key: str, generate: Callable[[], dict[str, object]]
+) -> dict[str, object]:
+    """Return cached notes for ``cache_key`` or generate and store them."""
+    payload = lookup_notes(cache_key)
+    if payload is None:
+        payload = generate()
+        store_notes(cache_key, payload)
+    return payload
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from functools import lru_cache, partial
+
+from redis.exceptions import RedisError
+
+from server.config import (
+    get_openai_chat_requests_per_minute,
+    get_openai_chat_tokens_per_minute,
+    get_openai_embedding_requests_per_minute,
+    get_openai_embedding_tokens_per_minute,
+    get_sarvam_audio_seconds_per_minute,
+    get_sarvam_requests_per_minute,
+)
+from server.core.metrics import increment_counter
+from server.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Takes every bucket's cost at once or none of them, and returns how long the
+# caller must wait for the scarcest bucket to refill.
+_TAKE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local wait = 0
+local levels = {}
+local costs = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local cost = math.min(tonumber(ARGV[i * 2]), capacity)
+    local rate = capacity / 60.0
+    local state = redis.call('HMGET', key, 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - updated) * rate)
+    levels[i] = level
+    costs[i] = cost
+    if level < cost then
+        wait = math.max(wait, (cost - level) / rate)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    redis.call('HSET', key, 'level', levels[i] - costs[i], 'ts', now)
+    redis.call('EXPIRE', key, 120)
+end
+return '0'
+"""
+
+MAX_WAIT_SLICE_SECONDS = 5.0
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class RateLimiter:
+    """Per-minute token buckets for one provider, shared through Redis."""
+
+    def __init__(self, provider: str, limits: dict[str, int]) -> None:
+        self.provider = provider
+        self.limits = {name: limit for name, limit in limits.items() if limit > 0}
+        self._take = get_redis().register_script(_TAKE_SCRIPT)
+
+    def _try_take(self, costs: dict[str, float]) -> float:
+        names = [name for name in self.limits if costs.get(name)]
+        if not names:
+            return 0.0
+        args: list[float] = []
+        for name in names:
+            args.extend([self.limits[name], costs[name]])
+        try:
+            wait = self._take(
+                keys=[f"ratelimit:{self.provider}:{name}" for name in names],
+                args=args,
+            )
+        except RedisError:
+            logger.warning("Rate limiter unavailable for %s, not throttling", self.provider)
+            return 0.0
+        return float(wait)
+
+    def acquire(self, **costs: float) -> None:
+        while True:
+            wait = self._try_take(costs)
+            if wait <= 0:
+                return
+            wait = min(wait, MAX_WAIT_SLICE_SECONDS)
+            increment_counter("rate_limit_wait_seconds_total", wait, provider=self.provider)
+            time.sleep(wait)
+
+    async def acquire_async(self, **costs: float) -> None:
+        while True:
+            wait = await asyncio.to_thread(self._try_take, costs)
+            if wait <= 0:
+                return
+            wait = min(wait, MAX_WAIT_SLICE_SECONDS)
+            # Like AdaptiveLimiter._publish: the metric write never blocks the loop.
+            asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(
+                    increment_counter,
+                    "rate_limit_wait_seconds_total",
+                    wait,
+                    provider=self.provider,
+                ),
+            )
+            await asyncio.sleep(wait)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(provider: str) -> RateLimiter:
+    if provider == "sarvam":
+        limits = {
+            "requests": get_sarvam_requests_per_minute(),
+            "audio_seconds": get_sarvam_audio_seconds_per_minute(),
+        }
+    elif provider == "openai_chat":
+        limits = {
+            "requests": get_openai_chat_requests_per_minute(),
+            "tokens": get_openai_chat_tokens_per_minute(),
+        }
+    elif provider == "openai_embeddings":
+        limits = {
+            "requests": get_openai_embedding_requests_per_minute(),
+            "tokens": get_openai_embedding_tokens_per_minute(),
+        }
+    else:
+        raise ValueError(f"Unknown rate-limited provider: {provider}")
+    return RateLimiter(provider, limits)
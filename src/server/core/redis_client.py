@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from redis import Redis
+
+from server.config import get_redis_url
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> Redis:
+    return Redis.from_url(get_redis_url())
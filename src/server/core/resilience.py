@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, TypeVar
+
+from httpx import TimeoutException, TransportError
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+from redis.exceptions import RedisError
+
+from server.config import (
+    get_circuit_failure_threshold,
+    get_circuit_failure_window_seconds,
+    get_circuit_open_seconds,
+    get_provider_backoff_base_seconds,
+    get_provider_backoff_max_seconds,
+    get_provider_max_attempts,
+)
+from server.core.metrics import increment_counter
+from server.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+_RETRYABLE_TYPES = (
+    TimeoutError,
+    ConnectionError,
+    TimeoutException,
+    TransportError,
+    APITimeoutError,
+    APIConnectionError,
+    RateLimitError,
+    InternalServerError,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+    def __init__(self, provider: str, retry_after: float) -> None:
+        super().__init__(f"{provider} circuit open, retry in {retry_after:.0f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def _status_code(exc: BaseException) -> int | None:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Timeouts, connection failures, throttling and 5xx; never auth or bad requests."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, _RETRYABLE_TYPES):
+        return True
+    return _status_code(exc) in RETRYABLE_STATUS_CODES
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Read a ``Retry-After`` header (seconds or HTTP date) from a provider error."""
+    if isinstance(exc, CircuitOpenError):
+        return exc.retry_after
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is None:
+        headers = getattr(exc, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, exc: BaseException | None = None) -> float:
+    """Full-jitter exponential backoff for ``attempt`` (1-based), at least Retry-After."""
+    ceiling = min(
+        get_provider_backoff_max_seconds(),
+        get_provider_backoff_base_seconds() * 2 ** max(attempt - 1, 0),
+    )
+    delay = random.uniform(0, ceiling)
+    retry_after = retry_after_seconds(exc) if exc is not None else None
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class CircuitBreaker:
+    """Per-provider breaker shared by every process through Redis.
+
+    `threshold` retryable failures within `window_seconds` open the circuit for
+    `open_seconds`; afterwards calls flow again, but the first failure while on
+    probation reopens it and the first success closes it.
+    """
+
+    def __init__(self, provider: str) -> None:
+        self.provider = provider
+        self.open_key = f"circuit:{provider}:open"
+        self.failures_key = f"circuit:{provider}:failures"
+        self.probation_key = f"circuit:{provider}:probation"
+
+    def check(self) -> None:
+        try:
+            remaining = get_redis().pttl(self.open_key)
+        except RedisError:
+            return
+        if remaining and remaining > 0:
+            increment_counter(
+                "circuit_breaker_rejections_total", provider=self.provider
+            )
+            raise CircuitOpenError(self.provider, remaining / 1000)
+
+    def record_success(self) -> None:
+        try:
+            get_redis().delete(self.failures_key, self.probation_key)
+        except RedisError:
+            pass
+
+    def record_failure(self) -> None:
+        try:
+            client = get_redis()
+            if client.exists(self.probation_key):
+                self._open(client)
+                return
+            pipeline = client.pipeline()
+            pipeline.incr(self.failures_key)
+            pipeline.expire(self.failures_key, get_circuit_failure_window_seconds())
+            failures = pipeline.execute()[0]
+            if failures >= get_circuit_failure_threshold():
+                self._open(client)
+        except RedisError:
+            pass
+
+    def _open(self, client) -> None:
+        open_seconds = get_circuit_open_seconds()
+        pipeline = client.pipeline()
+        pipeline.set(self.open_key, "1", ex=open_seconds)
+        pipeline.set(self.probation_key, "1", ex=open_seconds * 3)
+        pipeline.delete(self.failures_key)
+        pipeline.execute()
+        increment_counter("circuit_breaker_opened_total", provider=self.provider)
+        logger.warning("%s circuit opened for %ss", self.provider, open_seconds)
+
+
+def _record(breaker: CircuitBreaker, exc: BaseException, attempt: int) -> bool:
+    """Record a failed attempt and return whether it should be retried."""
+    if isinstance(exc, CircuitOpenError) or not is_retryable(exc):
+        return False
+    breaker.record_failure()
+    increment_counter("provider_retries_total", provider=breaker.provider)
+    logger.warning("%s call failed (attempt %s): %s", breaker.provider, attempt, exc)
+    return True
+
+
+def call_with_retries(
+    provider: str,
+    fn: Callable[[], T],
+    *,
+    max_attempts: int | None = None,
+) -> T:
+    """Call ``fn`` behind ``provider``'s circuit breaker, retrying retryable errors."""
+    breaker = CircuitBreaker(provider)
+    attempts = max_attempts or get_provider_max_attempts()
+    for attempt in range(1, attempts + 1):
+        breaker.check()
+        try:
+            result = fn()
+        except Exception as exc:
+            if not _record(breaker, exc, attempt) or attempt >= attempts:
+                raise
+            time.sleep(backoff_delay(attempt, exc))
+            continue
+        breaker.record_success()
+        return result
+    raise AssertionError("unreachable")
+
+
+async def call_with_retries_async(
+    provider: str,
+    fn: Callable[[], Awaitable[T]],
+    *,
+    max_attempts: int | None = None,
+) -> T:
+    """Async variant of `call_with_retries`; waits on the event loop, not the thread."""
+    breaker = CircuitBreaker(provider)
+    attempts = max_attempts or get_provider_max_attempts()
+    for attempt in range(1, attempts + 1):
+        await asyncio.to_thread(breaker.check)
+        try:
+            result = await fn()
+        except Exception as exc:
+            retry = await asyncio.to_thread(_record, breaker, exc, attempt)
+            if not retry or attempt >= attempts:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, exc))
+            continue
+        await asyncio.to_thread(breaker.record_success)
+        return result
+    raise AssertionError("unreachable")
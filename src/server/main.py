@@ -5,6 +5,7 @@ from sqlalchemy.exc import OperationalError
 from fastapi.middleware.cors import CORSMiddleware
 
 from server.api.api import router as api_router
+from server.core.clients import close_clients, init_clients
 from server.models.database import Base, engine
 
 app = FastAPI(title="Counseling Session Notes API")
@@ -12,7 +13,7 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=False,
-    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_methods=["GET", "POST", "PATCH", "OPTIONS"],
     allow_headers=["*"],
 )
 app.include_router(api_router, prefix="/api/v1", tags=["audio"])
@@ -27,3 +28,9 @@ def on_startup() -> None:
             "Database connection failed during startup. "
             "Start Postgres or check .env settings."
         )
+    init_clients()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    close_clients()
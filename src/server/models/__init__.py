@@ -1,6 +1,8 @@
 from server.models.audio import AudioFile
 from server.models.audio_chunk import AudioChunk
+from server.models.audio_upload import AudioUpload
 from server.models.chunk_transcript import ChunkTranscript
+from server.models.note_window_summary import NoteWindowSummary
 from server.models.session import Session
 from server.models.session_note import SessionNote
 from server.models.transcript import Transcript
@@ -8,7 +10,9 @@ from server.models.transcript import Transcript
 __all__ = [
     "AudioFile",
     "AudioChunk",
+    "AudioUpload",
     "ChunkTranscript",
+    "NoteWindowSummary",
     "Session",
     "SessionNote",
     "Transcript",
@@ -2,7 +2,15 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from server.models.database import Base
@@ -10,6 +18,11 @@ from server.models.database import Base
 
 class AudioChunk(Base):
     __tablename__ = "audio_chunks"
+    __table_args__ = (
+        UniqueConstraint(
+            "audio_file_id", "chunk_index", name="uq_audio_chunks_audio_file_chunk"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     audio_file_id: Mapped[int] = mapped_column(
@@ -19,4 +32,8 @@ class AudioChunk(Base):
     file_path: Mapped[str] = mapped_column(String(512))
     start_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
     end_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
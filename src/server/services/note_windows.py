@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from server.agents.notes_agent import NotesAgent
+from server.agents.notes_prompt import count_tokens
+from server.config import (
+    get_notes_map_reduce_token_threshold,
+    get_notes_window_seconds,
+)
+from server.core.locks import RedisLock
+from server.core.notes_cache import cached_notes
+from server.models.audio_chunk import AudioChunk
+from server.models.chunk_transcript import ChunkTranscript
+from server.models.database import SessionLocal
+from server.models.note_window_summary import NoteWindowSummary
+
+WINDOW_LOCK_SECONDS = 600
+
+
+def _window_label(window: dict[str, object]) -> str:
+    start_minute = int(float(window["start_seconds"]) // 60)
+    end_minute = int(float(window["end_seconds"]) // 60) + 1
+    return f"minutes {start_minute}-{end_minute}"
+
+
+def _load_chunk_windows(audio_id: int, agent: NotesAgent) -> list[dict[str, object]]:
+    """Group chunk transcripts into time windows keyed by each chunk's start."""
+    window_seconds = get_notes_window_seconds()
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(AudioChunk, ChunkTranscript)
+            .outerjoin(ChunkTranscript, ChunkTranscript.audio_chunk_id == AudioChunk.id)
+            .where(AudioChunk.audio_file_id == audio_id)
+            .order_by(AudioChunk.chunk_index.asc())
+        ).all()
+
+    windows: dict[int, dict[str, object]] = {}
+    last_start = 0.0
+    for chunk, transcript in rows:
+        start = float(chunk.start_seconds or 0.0)
+        last_start = max(last_start, start)
+        window = windows.setdefault(
+            int(start // window_seconds),
+            {"start_seconds": start, "end_seconds": start, "lines": [], "ready": True},
+        )
+        window["end_seconds"] = max(
+            float(window["end_seconds"]), float(chunk.end_seconds or start)
+        )
+        if transcript is None:
+            window["ready"] = False
+            continue
+        segments = transcript.diarized_segments or transcript.segments
+        if segments:
+            window["lines"].extend(
+                agent.segment_line(segment, start)
+                for segment in segments
+                if isinstance(segment, dict) and segment.get("text")
+            )
+        elif transcript.text:
+            window["lines"].append(transcript.text)
+
+    result = []
+    for index in sorted(windows):
+        window = windows[index]
+        text = "\n".join(window.pop("lines"))
+        window.update(
+            index=index,
+            text=text,
+            sha256=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            closed=last_start >= (index + 1) * window_seconds,
+        )
+        result.append(window)
+    return result
+
+
+def _summarize_windows(
+    audio_id: int, agent: NotesAgent, windows: list[dict[str, object]]
+) -> dict[int, str]:
+    """Summarize ``windows``, reusing stored rows whose source text is unchanged."""
+    model = agent.model_name()
+    with SessionLocal() as session:
+        stored = {
+            row.window_index: row
+            for row in session.execute(
+                select(NoteWindowSummary).where(
+                    NoteWindowSummary.audio_file_id == audio_id
+                )
+            ).scalars()
+        }
+    summaries: dict[int, str] = {}
+    pending = []
+    for window in windows:
+        row = stored.get(window["index"])
+        if (
+            row is not None
+            and row.source_sha256 == window["sha256"]
+            and row.model == model
+            and row.version == agent.version
+        ):
+            summaries[window["index"]] = row.summary
+        else:
+            pending.append(window)
+    if not pending:
+        return summaries
+
+    results = agent.summarize_windows(
+        [(window["text"], _window_label(window)) for window in pending]
+    )
+    now = datetime.utcnow()
+    rows = []
+    for window, summary in zip(pending, results):
+        summaries[window["index"]] = summary
+        rows.append(
+            {
+                "audio_file_id": audio_id,
+                "window_index": window["index"],
+                "start_seconds": float(window["start_seconds"]),
+                "end_seconds": float(window["end_seconds"]),
+                "source_sha256": str(window["sha256"]),
+                "summary": summary,
+                "model": model,
+                "version": agent.version,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    statement = insert(NoteWindowSummary).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["audio_file_id", "window_index"],
+        set_={
+            column: statement.excluded[column]
+            for column in (
+                "start_seconds",
+                "end_seconds",
+                "source_sha256",
+                "summary",
+                "model",
+                "version",
+                "updated_at",
+            )
+        },
+    )
+    with SessionLocal() as session:
+        session.execute(statement)
+        session.commit()
+    return summaries
+
+
+def _window_lock(audio_id: int) -> RedisLock:
+    return RedisLock(f"lock:note-windows:{audio_id}", WINDOW_LOCK_SECONDS)
+
+
+def summarize_closed_windows(audio_id: int) -> int:
+    """Summarize finished windows while later chunks are still transcribing."""
+    threshold_tokens = get_notes_map_reduce_token_threshold()
+    if not threshold_tokens:
+        return 0
+    lock = _window_lock(audio_id)
+    try:
+        if not lock.acquire():
+            return 0
+    except RedisError:
+        pass
+    try:
+        agent = NotesAgent.from_env()
+        windows = _load_chunk_windows(audio_id, agent)
+        transcribed_tokens = sum(count_tokens(str(w["text"])) for w in windows)
+        if transcribed_tokens <= threshold_tokens:
+            return 0
+        ready = [w for w in windows if w["ready"] and w["closed"]]
+        return len(_summarize_windows(audio_id, agent, ready))
+    finally:
+        try:
+            lock.release()
+        except RedisError:
+            pass
+
+
+def generate_session_notes_payload(
+    *,
+    audio_id: int,
+    transcript_text: str,
+    diarized_segments: list[dict[str, object]] | None,
+) -> dict[str, object]:
+    """Generate notes, reducing stored window summaries for long chunked transcripts."""
+    agent = NotesAgent.from_env()
+
+    def generate() -> dict[str, object]:
+        if agent.notes_strategy(transcript_text) == "map_reduce":
+            windows = _load_chunk_windows(audio_id, agent)
+            if len(windows) > 1 and all(window["ready"] for window in windows):
+                # Wait for an in-flight incremental run so its summaries are reused
+                # instead of recomputed; the upsert keeps a late writer harmless.
+                lock = _window_lock(audio_id)
+                try:
+                    locked = lock.wait(WINDOW_LOCK_SECONDS)
+                except RedisError:
+                    locked = False
+                try:
+                    summaries = _summarize_windows(audio_id, agent, windows)
+                finally:
+                    if locked:
+                        try:
+                            lock.release()
+                        except RedisError:
+                            pass
+                return agent.reduce_notes([summaries[w["index"]] for w in windows])
+        return agent.generate_notes_uncached(
+            transcript_text=transcript_text,
+            diarized_segments=diarized_segments,
+        )
+
+    return cached_notes(agent.cache_key(transcript_text, diarized_segments), generate)
@@ -1,22 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO, Iterator
 from uuid import uuid4
 
 from fastapi import HTTPException, UploadFile
-from sqlalchemy import func, select
+from sqlalchemy import Text, cast, func, select
 
 from server.models.audio import AudioFile
 from server.models.session import Session
 from server.models.session_note import SessionNote
 from server.models.transcript import Transcript
 from server.models.database import SessionLocal
-from server.agents.notes_agent import NotesAgent
+from server.agents.notes_agent import NotesAgent, split_streamed_markdown
 from server.services.vector_store import upsert_session_note_vector
+from server.config import (
+    get_session_processing_mode,
+    get_upload_block_size,
+    get_upload_max_bytes,
+)
 from server.core.celery_app import celery_app
+from server.core.events import format_sse_event, publish_stage
+from server.core.leases import SessionLease
+from server.core.notes_cache import lookup_notes, store_notes
+from server.utils.media import probe_audio
+from server.utils.storage import UPLOAD_DIR, build_storage_path
 
-UPLOAD_DIR = Path(__file__).resolve().parent.parent / "uploads"
 ALLOWED_CONTENT_TYPES = {
     "audio/mpeg",
     "audio/mp4",
@@ -29,88 +41,165 @@ ALLOWED_CONTENT_TYPES = {
 }
 
 
-async def save_audio(file: UploadFile) -> dict[str, str]:
+def _copy_upload(source: BinaryIO, destination: Path) -> tuple[str, int]:
+    max_bytes = get_upload_max_bytes()
+    block_size = get_upload_block_size()
+    digest = hashlib.sha256()
+    size_bytes = 0
+    try:
+        with destination.open("wb") as handle:
+            while True:
+                block = source.read(block_size)
+                if not block:
+                    break
+                size_bytes += len(block)
+                if size_bytes > max_bytes:
+                    raise HTTPException(status_code=413, detail="File too large")
+                digest.update(block)
+                handle.write(block)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+
+    if size_bytes == 0:
+        destination.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="Empty file")
+    return digest.hexdigest(), size_bytes
+
+
+async def _stream_upload(file: UploadFile, destination: Path) -> tuple[str, int]:
+    declared_size = getattr(file, "size", None)
+    if declared_size is not None and declared_size > get_upload_max_bytes():
+        raise HTTPException(status_code=413, detail="File too large")
+    await file.seek(0)
+    return await asyncio.to_thread(_copy_upload, file.file, destination)
+
+
+def _probe_upload(destination: Path) -> dict[str, object]:
+    try:
+        metadata = probe_audio(destination)
+    except ValueError as exc:
+        destination.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=400, detail=f"Unreadable audio file: {exc}"
+        ) from exc
+    return metadata or {}
+
+
+async def save_audio(file: UploadFile) -> dict[str, str | int]:
     if file.content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail="Unsupported audio type")
 
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     suffix = Path(file.filename or "audio").suffix
     file_key = uuid4().hex
     safe_name = f"{file_key}{suffix}"
-    destination = UPLOAD_DIR / safe_name
-
-    contents = await file.read()
-    if not contents:
-        raise HTTPException(status_code=400, detail="Empty file")
+    storage_path = build_storage_path(file_key, suffix)
+    destination = UPLOAD_DIR / storage_path
+    destination.parent.mkdir(parents=True, exist_ok=True)
 
-    with SessionLocal() as session:
-        audio = AudioFile(
-            file_key=file_key,
-            original_filename=file.filename or "audio",
-            content_type=file.content_type or "",
-        )
-        session.add(audio)
-        session.commit()
+    content_sha256, size_bytes = await _stream_upload(file, destination)
+    metadata = await asyncio.to_thread(_probe_upload, destination)
 
-    destination.write_bytes(contents)
+    try:
+        with SessionLocal() as session:
+            audio = AudioFile(
+                file_key=file_key,
+                original_filename=file.filename or "audio",
+                content_type=file.content_type or "",
+                content_sha256=content_sha256,
+                size_bytes=size_bytes,
+                storage_path=storage_path,
+                **metadata,
+            )
+            session.add(audio)
+            session.commit()
+    except Exception:
+        destination.unlink(missing_ok=True)
+        raise
 
     return {
         "filename": safe_name,
         "file_key": file_key,
-        "path": str(destination.relative_to(Path.cwd())),
+        "path": storage_path,
         "content_type": file.content_type or "",
+        "size_bytes": size_bytes,
+        "sha256": content_sha256,
     }
 
 
+def _create_session_audio(
+    *,
+    title: str,
+    file_key: str,
+    content_type: str,
+    content_sha256: str,
+    size_bytes: int,
+    storage_path: str,
+    metadata: dict[str, object],
+) -> int:
+    with SessionLocal() as session:
+        session_row = Session(title=title, status="uploaded")
+        session.add(session_row)
+        session.flush()
+        session_id = session_row.id
+        audio = AudioFile(
+            session_id=session_id,
+            file_key=file_key,
+            original_filename=title,
+            content_type=content_type,
+            content_sha256=content_sha256,
+            size_bytes=size_bytes,
+            storage_path=storage_path,
+            **metadata,
+        )
+        session.add(audio)
+        session.commit()
+    return session_id
+
+
 async def save_session_audio(file: UploadFile) -> dict[str, object]:
     if file.content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail="Unsupported audio type")
 
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     suffix = Path(file.filename or "session").suffix
     file_key = uuid4().hex
     safe_name = f"{file_key}{suffix}"
-    destination = UPLOAD_DIR / safe_name
+    storage_path = build_storage_path(file_key, suffix)
+    destination = UPLOAD_DIR / storage_path
+    destination.parent.mkdir(parents=True, exist_ok=True)
 
-    contents = await file.read()
-    if not contents:
-        raise HTTPException(status_code=400, detail="Empty file")
+    content_sha256, size_bytes = await _stream_upload(file, destination)
+    metadata = await asyncio.to_thread(_probe_upload, destination)
 
     title = file.filename or "Counseling Session"
 
-    with SessionLocal() as session:
-        session_row = Session(title=title, status="uploaded")
-        session.add(session_row)
-        session.flush()
-        session_id = session_row.id
-        audio = AudioFile(
-            session_id=session_id,
+    try:
+        session_id = _create_session_audio(
+            title=title,
             file_key=file_key,
-            original_filename=title,
             content_type=file.content_type or "",
+            content_sha256=content_sha256,
+            size_bytes=size_bytes,
+            storage_path=storage_path,
+            metadata=metadata,
         )
-        session.add(audio)
-        session.commit()
-
-    destination.write_bytes(contents)
+    except Exception:
+        destination.unlink(missing_ok=True)
+        raise
 
     return {
         "session_id": session_id,
         "filename": safe_name,
         "file_key": file_key,
-        "path": str(destination.relative_to(Path.cwd())),
+        "path": storage_path,
         "content_type": file.content_type or "",
         "title": title,
+        "size_bytes": size_bytes,
+        "sha256": content_sha256,
+        "duration_seconds": metadata.get("duration_seconds"),
     }
 
 
-def _resolve_audio_path(file_key: str) -> Path:
-    matching = next(UPLOAD_DIR.glob(f"{file_key}*"), None)
-    if matching is None:
-        raise HTTPException(status_code=404, detail="Audio file not found on disk")
-    return matching
-
-
 def _calculate_duration_seconds(segments: list[dict[str, object]]) -> float | None:
     if not segments:
         return None
@@ -156,18 +245,43 @@ def list_transcripts(page: int, page_size: int) -> dict[str, object]:
     with SessionLocal() as session:
         total = session.execute(select(func.count()).select_from(Transcript)).scalar_one()
         rows = session.execute(
-            select(AudioFile, Transcript)
+            select(
+                AudioFile,
+                Transcript.id,
+                Transcript.duration_seconds,
+                func.coalesce(cast(Transcript.segments, Text), "null").notin_(
+                    ("null", "[]")
+                ),
+            )
             .join(Transcript, Transcript.audio_file_id == AudioFile.id)
             .order_by(AudioFile.created_at.desc())
             .offset(offset_value)
             .limit(page_size)
         ).all()
+        missing_durations = [
+            transcript_id
+            for audio, transcript_id, transcript_duration, has_segments in rows
+            if has_segments
+            and audio.duration_seconds is None
+            and transcript_duration is None
+        ]
+        fallback_segments = (
+            dict(
+                session.execute(
+                    select(Transcript.id, Transcript.segments).where(
+                        Transcript.id.in_(missing_durations)
+                    )
+                ).all()
+            )
+            if missing_durations
+            else {}
+        )
 
     items = []
-    for audio, transcript in rows:
-        duration = transcript.duration_seconds
-        if duration is None and transcript.segments:
-            duration = _calculate_duration_seconds(transcript.segments)
+    for audio, transcript_id, transcript_duration, has_segments in rows:
+        duration = audio.duration_seconds or transcript_duration
+        if duration is None and fallback_segments.get(transcript_id):
+            duration = _calculate_duration_seconds(fallback_segments[transcript_id])
         items.append(
             {
                 "file_key": audio.file_key,
@@ -175,7 +289,7 @@ def list_transcripts(page: int, page_size: int) -> dict[str, object]:
                 "content_type": audio.content_type,
                 "duration_seconds": duration,
                 "transcript_available": True,
-                "diarization_available": bool(transcript.segments),
+                "diarization_available": bool(has_segments),
             }
         )
 
@@ -195,7 +309,13 @@ def list_sessions(page: int, page_size: int) -> dict[str, object]:
     with SessionLocal() as session:
         total = session.execute(select(func.count()).select_from(Session)).scalar_one()
         rows = session.execute(
-            select(Session, AudioFile, Transcript, SessionNote)
+            select(
+                Session,
+                AudioFile,
+                Transcript.id,
+                Transcript.duration_seconds,
+                SessionNote.id,
+            )
             .join(AudioFile, AudioFile.session_id == Session.id)
             .outerjoin(Transcript, Transcript.audio_file_id == AudioFile.id)
             .outerjoin(SessionNote, SessionNote.session_id == Session.id)
@@ -203,12 +323,30 @@ def list_sessions(page: int, page_size: int) -> dict[str, object]:
             .offset(offset_value)
             .limit(page_size)
         ).all()
+        missing_durations = [
+            transcript_id
+            for _, audio, transcript_id, transcript_duration, _ in rows
+            if transcript_id is not None
+            and audio.duration_seconds is None
+            and transcript_duration is None
+        ]
+        fallback_segments = (
+            dict(
+                session.execute(
+                    select(Transcript.id, Transcript.segments).where(
+                        Transcript.id.in_(missing_durations)
+                    )
+                ).all()
+            )
+            if missing_durations
+            else {}
+        )
 
     items = []
-    for session_row, audio, transcript, note in rows:
-        duration = transcript.duration_seconds if transcript else None
-        if duration is None and transcript and transcript.segments:
-            duration = _calculate_duration_seconds(transcript.segments)
+    for session_row, audio, transcript_id, transcript_duration, note_id in rows:
+        duration = audio.duration_seconds or transcript_duration
+        if duration is None and fallback_segments.get(transcript_id):
+            duration = _calculate_duration_seconds(fallback_segments[transcript_id])
         items.append(
             {
                 "session_id": session_row.id,
@@ -220,8 +358,8 @@ def list_sessions(page: int, page_size: int) -> dict[str, object]:
                 "file_key": audio.file_key,
                 "content_type": audio.content_type,
                 "duration_seconds": duration,
-                "transcript_available": bool(transcript),
-                "notes_available": bool(note),
+                "transcript_available": transcript_id is not None,
+                "notes_available": note_id is not None,
             }
         )
 
@@ -278,7 +416,19 @@ def get_session_detail(session_id: int) -> dict[str, object]:
     }
 
 
-def generate_session_notes(session_id: int) -> dict[str, object]:
+def _notes_inputs(
+    transcript: Transcript,
+) -> tuple[str, list[dict[str, object]] | None]:
+    """The text and segments notes are generated from, and cached under."""
+    return (
+        transcript.diarized_text or transcript.text or "",
+        transcript.diarized_segments or transcript.segments,
+    )
+
+
+def _load_notes_source(
+    session_id: int,
+) -> tuple[NotesAgent, str, list[dict[str, object]] | None]:
     with SessionLocal() as session:
         row = session.execute(
             select(Session, AudioFile, Transcript)
@@ -292,18 +442,16 @@ def generate_session_notes(session_id: int) -> dict[str, object]:
         if transcript is None:
             raise HTTPException(status_code=400, detail="Transcript not available")
 
-    diarized_segments = transcript.segments
-    text_for_notes = transcript.text or ""
     try:
         agent = NotesAgent.from_env()
     except ValueError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return (agent, *_notes_inputs(transcript))
 
-    note_payload = agent.generate_notes(
-        transcript_text=text_for_notes,
-        diarized_segments=diarized_segments,
-    )
 
+def _store_session_note(
+    session_id: int, note_payload: dict[str, object]
+) -> dict[str, object]:
     with SessionLocal() as session:
         existing = session.execute(
             select(SessionNote).where(SessionNote.session_id == session_id)
@@ -359,6 +507,56 @@ def generate_session_notes(session_id: int) -> dict[str, object]:
     }
 
 
+def generate_session_notes(session_id: int) -> dict[str, object]:
+    agent, text_for_notes, diarized_segments = _load_notes_source(session_id)
+    note_payload = agent.generate_notes(
+        transcript_text=text_for_notes,
+        diarized_segments=diarized_segments,
+    )
+    return _store_session_note(session_id, note_payload)
+
+
+def _stream_note_frames(
+    session_id: int,
+    agent: NotesAgent,
+    text_for_notes: str,
+    diarized_segments: list[dict[str, object]] | None,
+) -> Iterator[str]:
+    # Streaming always renders one prompt, whatever the transcript length.
+    cache_key = agent.cache_key(text_for_notes, diarized_segments, "single")
+    try:
+        note_payload = lookup_notes(cache_key)
+        if note_payload is None:
+            parts: list[str] = []
+
+            def completion() -> Iterator[str]:
+                for delta in agent.stream_notes(
+                    transcript_text=text_for_notes,
+                    diarized_segments=diarized_segments,
+                ):
+                    parts.append(delta)
+                    yield delta
+
+            for text in split_streamed_markdown(completion()):
+                yield format_sse_event("token", {"text": text})
+            note_payload = agent.build_streamed_notes(
+                "".join(parts).strip(), text_for_notes
+            )
+            store_notes(cache_key, note_payload)
+        stored = _store_session_note(session_id, note_payload)
+    except Exception as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        yield format_sse_event("error", {"error": detail})
+        return
+    yield format_sse_event("notes", stored)
+
+
+def open_session_notes_stream(session_id: int) -> Iterator[str]:
+    """Validate the session up front, then stream SSE frames for its notes."""
+    agent, text_for_notes, diarized_segments = _load_notes_source(session_id)
+    return _stream_note_frames(session_id, agent, text_for_notes, diarized_segments)
+
+
 def get_session_notes(session_id: int) -> dict[str, object]:
     with SessionLocal() as session:
         note = session.execute(
@@ -379,17 +577,137 @@ def get_session_notes(session_id: int) -> dict[str, object]:
     }
 
 
-def enqueue_chunked_processing(session_id: int) -> dict[str, object]:
+def _find_duplicate_results(
+    session, audio: AudioFile
+) -> tuple[AudioFile, Transcript, SessionNote | None] | None:
+    if not audio.content_sha256:
+        return None
+    row = session.execute(
+        select(AudioFile, Transcript, SessionNote)
+        .join(Transcript, Transcript.audio_file_id == AudioFile.id)
+        .outerjoin(SessionNote, SessionNote.session_id == AudioFile.session_id)
+        .where(AudioFile.content_sha256 == audio.content_sha256)
+        .where(AudioFile.id != audio.id)
+        .order_by(SessionNote.id.is_(None), Transcript.updated_at.desc())
+        .limit(1)
+    ).first()
+    return tuple(row) if row is not None else None
+
+
+def _reuse_duplicate_results(session_id: int) -> dict[str, object] | None:
     with SessionLocal() as session:
-        exists = session.get(Session, session_id)
-        if exists is None:
+        row = session.execute(
+            select(Session, AudioFile)
+            .join(AudioFile, AudioFile.session_id == Session.id)
+            .where(Session.id == session_id)
+        ).first()
+        if row is None:
             raise HTTPException(status_code=404, detail="Session not found")
-        exists.status = "processing"
-        exists.updated_at = datetime.utcnow()
+        session_row, audio = row
+        duplicate = _find_duplicate_results(session, audio)
+        if duplicate is None:
+            return None
+        source_audio, source_transcript, source_note = duplicate
+
+        existing = session.execute(
+            select(Transcript).where(Transcript.audio_file_id == audio.id)
+        ).scalar_one_or_none()
+        if existing is None:
+            existing = Transcript(audio_file_id=audio.id)
+            session.add(existing)
+        existing.text = source_transcript.text
+        existing.segments = source_transcript.segments
+        existing.diarized_text = source_transcript.diarized_text
+        existing.diarized_segments = source_transcript.diarized_segments
+        existing.duration_seconds = source_transcript.duration_seconds
+        existing.updated_at = datetime.utcnow()
+
+        status = "transcribed"
+        if source_note is not None:
+            existing_note = session.execute(
+                select(SessionNote).where(SessionNote.session_id == session_id)
+            ).scalar_one_or_none()
+            if existing_note is None:
+                existing_note = SessionNote(session_id=session_id)
+                session.add(existing_note)
+            existing_note.note_markdown = source_note.note_markdown
+            existing_note.summary = source_note.summary
+            existing_note.key_points = source_note.key_points
+            existing_note.action_items = source_note.action_items
+            existing_note.risk_flags = source_note.risk_flags
+            existing_note.model = source_note.model
+            existing_note.version = source_note.version
+            existing_note.updated_at = datetime.utcnow()
+            status = "noted"
+
+        source_session_id = source_audio.session_id
+        indexed_note = (
+            {
+                "note_markdown": source_note.note_markdown,
+                "summary": source_note.summary,
+                "version": source_note.version,
+            }
+            if source_note is not None
+            else None
+        )
+        session_row.status = status
+        session_row.updated_at = datetime.utcnow()
         session.commit()
 
-    result = celery_app.send_task(
-        "server.tasks.session_processing.process_session_chunks",
-        args=[session_id],
+    if indexed_note is not None:
+        _index_session_note(session_id=session_id, **indexed_note)
+
+    return {
+        "session_id": session_id,
+        "task_id": None,
+        "status": status,
+        "deduplicated_from": source_session_id,
+    }
+
+
+def enqueue_chunked_processing(session_id: int, force: bool = False) -> dict[str, object]:
+    with SessionLocal() as session:
+        if session.get(Session, session_id) is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+    task_id = str(uuid4())
+    lease = SessionLease(session_id, task_id)
+    holder = lease.claim()
+    if holder != task_id:
+        return {
+            "session_id": session_id,
+            "task_id": holder,
+            "status": "processing",
+            "in_flight": True,
+        }
+
+    if not force:
+        # Under the lease, so a running pipeline cannot overwrite the copied results.
+        try:
+            reused = _reuse_duplicate_results(session_id)
+        except Exception:
+            lease.release()
+            raise
+        if reused is not None:
+            lease.release()
+            return reused
+
+    with SessionLocal() as session:
+        exists = session.get(Session, session_id)
+        if exists is not None:
+            exists.status = "processing"
+            exists.updated_at = datetime.utcnow()
+            session.commit()
+
+    task_name = (
+        "server.tasks.session_processing.plan_session_chunks"
+        if get_session_processing_mode() == "distributed"
+        else "server.tasks.session_processing.process_session_chunks"
     )
+    publish_stage(session_id, "queued", task_id=task_id)
+    try:
+        result = celery_app.send_task(task_name, args=[session_id], task_id=task_id)
+    except Exception:
+        lease.release()
+        raise
     return {"session_id": session_id, "task_id": result.id, "status": "processing"}
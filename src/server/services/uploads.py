@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from starlette.requests import ClientDisconnect
+
+from server.config import (
+    get_upload_abandon_seconds,
+    get_upload_block_size,
+    get_upload_max_bytes,
+)
+from server.core.locks import RedisLock
+from server.models.audio_upload import AudioUpload
+from server.models.database import SessionLocal
+from server.services.services import (
+    ALLOWED_CONTENT_TYPES,
+    _create_session_audio,
+    _probe_upload,
+)
+from server.utils.storage import UPLOAD_DIR, build_storage_path
+
+PARTIAL_DIR = UPLOAD_DIR / "partial"
+UPLOAD_LOCK_SECONDS = 60
+
+
+def _partial_path(upload_id: str) -> Path:
+    return PARTIAL_DIR / f"{upload_id}.part"
+
+
+def _upload_lock(upload_id: str) -> RedisLock:
+    """Serializes range writes, finalization and sweeping of one upload."""
+    return RedisLock(f"lock:upload:{upload_id}", UPLOAD_LOCK_SECONDS)
+
+
+def _acquire_upload_lock(upload_id: str) -> RedisLock:
+    lock = _upload_lock(upload_id)
+    if not lock.acquire():
+        raise HTTPException(status_code=409, detail="Upload is busy, retry shortly")
+    return lock
+
+
+def _received_bytes(upload: AudioUpload) -> int:
+    if upload.status == "completed":
+        return upload.total_bytes
+    partial = _partial_path(upload.upload_id)
+    return partial.stat().st_size if partial.exists() else 0
+
+
+def _load_upload(upload_id: str) -> AudioUpload:
+    with SessionLocal() as session:
+        upload = session.execute(
+            select(AudioUpload).where(AudioUpload.upload_id == upload_id)
+        ).scalar_one_or_none()
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+def _serialize_upload(upload: AudioUpload, offset: int) -> dict[str, object]:
+    return {
+        "upload_id": upload.upload_id,
+        "filename": upload.original_filename,
+        "content_type": upload.content_type,
+        "total_bytes": upload.total_bytes,
+        "offset": offset,
+        "status": upload.status,
+        "session_id": upload.session_id,
+    }
+
+
+def create_resumable_upload(
+    *, filename: str, content_type: str, total_bytes: int
+) -> dict[str, object]:
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported audio type")
+    if total_bytes <= 0:
+        raise HTTPException(status_code=400, detail="Empty file")
+    if total_bytes > get_upload_max_bytes():
+        raise HTTPException(status_code=413, detail="File too large")
+
+    PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+    upload_id = uuid4().hex
+    _partial_path(upload_id).touch()
+
+    with SessionLocal() as session:
+        upload = AudioUpload(
+            upload_id=upload_id,
+            original_filename=filename or "Counseling Session",
+            content_type=content_type,
+            total_bytes=total_bytes,
+            status="pending",
+        )
+        session.add(upload)
+        session.commit()
+        session.refresh(upload)
+
+    return _serialize_upload(upload, 0)
+
+
+def get_resumable_upload(upload_id: str) -> dict[str, object]:
+    upload = _load_upload(upload_id)
+    return _serialize_upload(upload, _received_bytes(upload))
+
+
+def _write_block(partial: Path, offset: int, block: bytes) -> None:
+    with partial.open("r+b") as handle:
+        handle.seek(offset)
+        handle.write(block)
+
+
+def _touch_upload(upload_row_id: int) -> None:
+    with SessionLocal() as session:
+        row = session.get(AudioUpload, upload_row_id)
+        if row is not None:
+            row.updated_at = datetime.utcnow()
+            session.commit()
+
+
+async def write_resumable_upload_range(
+    upload_id: str, offset: int, body: AsyncIterator[bytes]
+) -> dict[str, object]:
+    lock = await asyncio.to_thread(_acquire_upload_lock, upload_id)
+    try:
+        return await _write_range(upload_id, offset, body, lock)
+    finally:
+        await asyncio.to_thread(lock.release)
+
+
+async def _write_range(
+    upload_id: str, offset: int, body: AsyncIterator[bytes], lock: RedisLock
+) -> dict[str, object]:
+    upload = await asyncio.to_thread(_load_upload, upload_id)
+    if upload.status != "pending":
+        raise HTTPException(status_code=409, detail=f"Upload {upload.status}")
+
+    partial = _partial_path(upload_id)
+    current = await asyncio.to_thread(_received_bytes, upload)
+    if offset != current:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload offset mismatch, expected {current}",
+        )
+
+    block_size = get_upload_block_size()
+    buffer = bytearray()
+    position = offset
+    refreshed_at = time.monotonic()
+    try:
+        async for piece in body:
+            if position + len(buffer) + len(piece) > upload.total_bytes:
+                raise HTTPException(
+                    status_code=413, detail="Range exceeds declared upload size"
+                )
+            buffer.extend(piece)
+            if len(buffer) >= block_size:
+                await asyncio.to_thread(_write_block, partial, position, bytes(buffer))
+                position += len(buffer)
+                buffer.clear()
+            if time.monotonic() - refreshed_at > UPLOAD_LOCK_SECONDS / 3:
+                await asyncio.to_thread(lock.refresh)
+                refreshed_at = time.monotonic()
+    except ClientDisconnect:
+        pass
+    finally:
+        if buffer:
+            await asyncio.to_thread(_write_block, partial, position, bytes(buffer))
+            position += len(buffer)
+            buffer.clear()
+
+    await asyncio.to_thread(_touch_upload, upload.id)
+    return _serialize_upload(upload, position)
+
+
+def _hash_file(path: Path) -> str:
+    block_size = get_upload_block_size()
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finalize_resumable_upload(upload_id: str) -> dict[str, object]:
+    lock = _acquire_upload_lock(upload_id)
+    try:
+        return _finalize_upload(upload_id)
+    finally:
+        lock.release()
+
+
+def _finalize_upload(upload_id: str) -> dict[str, object]:
+    upload = _load_upload(upload_id)
+    if upload.status == "completed":
+        return _serialize_upload(upload, upload.total_bytes)
+    if upload.status != "pending":
+        raise HTTPException(status_code=409, detail=f"Upload {upload.status}")
+
+    partial = _partial_path(upload_id)
+    received = _received_bytes(upload)
+    if received != upload.total_bytes:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload incomplete, received {received} of {upload.total_bytes} bytes",
+        )
+
+    content_sha256 = _hash_file(partial)
+    suffix = Path(upload.original_filename).suffix
+    file_key = uuid4().hex
+    safe_name = f"{file_key}{suffix}"
+    storage_path = build_storage_path(file_key, suffix)
+    destination = UPLOAD_DIR / storage_path
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial.replace(destination)
+    try:
+        metadata = _probe_upload(destination)
+    except HTTPException:
+        with SessionLocal() as session:
+            row = session.get(AudioUpload, upload.id)
+            if row is not None:
+                row.status = "rejected"
+                row.updated_at = datetime.utcnow()
+                session.commit()
+        raise
+
+    try:
+        session_id = _create_session_audio(
+            title=upload.original_filename,
+            file_key=file_key,
+            content_type=upload.content_type,
+            content_sha256=content_sha256,
+            size_bytes=upload.total_bytes,
+            storage_path=storage_path,
+            metadata=metadata,
+        )
+    except Exception:
+        destination.replace(partial)
+        raise
+
+    with SessionLocal() as session:
+        row = session.get(AudioUpload, upload.id)
+        if row is not None:
+            row.status = "completed"
+            row.session_id = session_id
+            row.updated_at = datetime.utcnow()
+            session.commit()
+
+    return {
+        "session_id": session_id,
+        "upload_id": upload_id,
+        "filename": safe_name,
+        "file_key": file_key,
+        "content_type": upload.content_type,
+        "title": upload.original_filename,
+        "size_bytes": upload.total_bytes,
+        "sha256": content_sha256,
+        "duration_seconds": metadata.get("duration_seconds"),
+        "status": "completed",
+    }
+
+
+def sweep_abandoned_uploads() -> int:
+    """Expire pending uploads idle for `UPLOAD_ABANDON_SECONDS` and drop their bytes."""
+    cutoff = datetime.utcnow() - timedelta(seconds=get_upload_abandon_seconds())
+    with SessionLocal() as session:
+        upload_ids = session.execute(
+            select(AudioUpload.upload_id).where(
+                AudioUpload.status == "pending", AudioUpload.updated_at < cutoff
+            )
+        ).scalars().all()
+
+    swept = 0
+    for upload_id in upload_ids:
+        lock = _upload_lock(upload_id)
+        if not lock.acquire():
+            continue
+        try:
+            with SessionLocal() as session:
+                row = session.execute(
+                    select(AudioUpload).where(
+                        AudioUpload.upload_id == upload_id,
+                        AudioUpload.status == "pending",
+                        AudioUpload.updated_at < cutoff,
+                    )
+                ).scalar_one_or_none()
+                if row is None:
+                    continue
+                row.status = "expired"
+                row.updated_at = datetime.utcnow()
+                session.commit()
+            _partial_path(upload_id).unlink(missing_ok=True)
+            swept += 1
+        finally:
+            lock.release()
+    return swept
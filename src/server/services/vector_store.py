@@ -2,38 +2,24 @@ from __future__ import annotations
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qdrant_models
-from langchain_openai import OpenAIEmbeddings
-
-from server.config import (
-    get_openai_api_key,
-    get_openai_embedding_model,
-    get_openai_max_retries,
-    get_openai_proxy_url,
-    get_openai_timeout_seconds,
-    get_qdrant_api_key,
-    get_qdrant_collection,
-    get_qdrant_url,
-)
-
-
-def _get_embeddings() -> OpenAIEmbeddings:
-    api_key = get_openai_api_key()
-    if not api_key or api_key == "YOUR_OPENAI_API_KEY":
-        raise ValueError("Missing OpenAI API key for embeddings")
-    return OpenAIEmbeddings(
-        model=get_openai_embedding_model(),
-        api_key=api_key,
-        base_url=get_openai_proxy_url(),
-        max_retries=get_openai_max_retries(),
-        timeout=get_openai_timeout_seconds(),
-    )
 
+from server.config import get_openai_max_retries, get_qdrant_collection
+from server.core.clients import get_embeddings, get_qdrant_client
+from server.core.rate_limit import estimate_tokens, get_rate_limiter
+from server.core.resilience import call_with_retries
+
+
+def _embed(text: str) -> list[float]:
+    embeddings = get_embeddings()
+
+    def embed() -> list[float]:
+        get_rate_limiter("openai_embeddings").acquire(
+            requests=1, tokens=estimate_tokens(text)
+        )
+        return embeddings.embed_query(text)
 
-def _get_qdrant_client() -> QdrantClient:
-    return QdrantClient(
-        url=get_qdrant_url(),
-        api_key=get_qdrant_api_key(),
-        check_compatibility=False,
+    return call_with_retries(
+        "openai_embeddings", embed, max_attempts=get_openai_max_retries() + 1
     )
 
 
@@ -72,11 +58,10 @@ def upsert_transcript_vector(
     if not cleaned_text:
         return
 
-    embeddings = _get_embeddings()
-    vector = embeddings.embed_query(cleaned_text)
+    vector = _embed(cleaned_text)
 
     collection_name = get_qdrant_collection()
-    client = _get_qdrant_client()
+    client = get_qdrant_client()
     _ensure_collection(client, collection_name, len(vector))
 
     payload = {
@@ -104,11 +89,10 @@ def upsert_session_note_vector(
     if not cleaned_text:
         return
 
-    embeddings = _get_embeddings()
-    vector = embeddings.embed_query(cleaned_text)
+    vector = _embed(cleaned_text)
 
     collection_name = get_qdrant_collection()
-    client = _get_qdrant_client()
+    client = get_qdrant_client()
     _ensure_collection(client, collection_name, len(vector))
 
     payload = {
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import logging
+
+from server.core.celery_app import celery_app
+from server.services import uploads
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name="server.tasks.maintenance.sweep_abandoned_uploads",
+    ignore_result=True,
+)
+def sweep_abandoned_uploads() -> dict[str, object]:
+    swept = uploads.sweep_abandoned_uploads()
+    if swept:
+        logger.info("Expired %s abandoned uploads", swept)
+    return {"expired_uploads": swept}
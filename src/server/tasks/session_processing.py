@@ -1,18 +1,51 @@
 from __future__ import annotations
 
 import asyncio
-import shutil
-import subprocess
+import json
+import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
 
 from httpx import TimeoutException
 from openai import APITimeoutError
-from sqlalchemy import delete, select
+from redis.exceptions import RedisError
+from sqlalchemy import delete, func, select, update
 
-from server.config import get_audio_chunk_seconds
+from server.config import (
+    get_audio_chunk_min_seconds,
+    get_audio_chunk_seconds,
+    get_audio_silence_min_seconds,
+    get_audio_silence_noise_db,
+    get_chunk_global_concurrency,
+    get_chunk_max_attempts,
+    get_chunk_session_concurrency,
+    get_chunk_slot_lease_seconds,
+    get_db_executor_workers,
+    get_merge_wait_max_seconds,
+    get_notes_map_reduce_token_threshold,
+    get_sarvam_batch_fill_seconds,
+    get_sarvam_batch_size,
+    get_stt_chunk_bitrate,
+    get_stt_chunk_codec,
+    get_stt_concurrency_max,
+    get_stt_concurrency_min,
+    get_stt_target_latency_seconds,
+)
 from server.core.celery_app import celery_app
+from server.core.concurrency import AdaptiveLimiter, RedisSemaphore
+from server.core.event_loop import run_async
+from server.core.events import (
+    publish_error,
+    publish_progress,
+    publish_stage,
+)
+from server.core.leases import LeaseLostError, SessionLeaseTask
+from server.core.resilience import CircuitOpenError, backoff_delay, is_retryable
+from server.core.redis_client import get_redis
 from server.models.audio import AudioFile
 from server.models.audio_chunk import AudioChunk
 from server.models.chunk_transcript import ChunkTranscript
@@ -20,48 +53,338 @@ from server.models.session import Session
 from server.models.session_note import SessionNote
 from server.models.transcript import Transcript
 from server.models.database import SessionLocal
-from server.agents.notes_agent import NotesAgent
 from server.agents.sarvam_stt_agent import SarvamSttAgent
-from server.services.services import _calculate_duration_seconds, _resolve_audio_path
+from server.services.services import _calculate_duration_seconds, _notes_inputs
+from server.services.note_windows import (
+    generate_session_notes_payload,
+    summarize_closed_windows,
+)
 from server.services.vector_store import upsert_session_note_vector
+from server.utils.media import (
+    STT_CODEC_SUFFIXES,
+    extract_audio_segment,
+    stream_chunk_boundaries,
+)
+from server.utils.storage import chunks_dir, resolve_audio_path
+
+logger = logging.getLogger(__name__)
+
+ChunkInput = tuple[int, Path, float]
+PlannedChunk = tuple[int, Path, float, float]
+T = TypeVar("T")
+
+MANIFEST_NAME = "manifest.json"
+# Batches finishing close together share one incremental window summary run.
+WINDOW_SUMMARY_DELAY_SECONDS = 15
+WINDOW_SUMMARY_PENDING_SECONDS = 60
+MERGE_POLL_SECONDS = 5
+SLOT_WAIT_SECONDS = 5
+
+
+class ChunkProcessingError(RuntimeError):
+    pass
+
+
+_DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=get_db_executor_workers(), thread_name_prefix="chunk-db"
+)
+
+
+async def _run_db(function: Callable[..., T], *args: object, **kwargs: object) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_EXECUTOR, partial(function, *args, **kwargs))
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _read_manifest(output_dir: Path) -> dict[str, object] | None:
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
 
 
-def _chunk_audio(
+def _write_manifest(
+    *, audio_id: int, output_dir: Path, complete: bool
+) -> dict[str, object]:
+    with SessionLocal() as session:
+        chunks = session.execute(
+            select(AudioChunk)
+            .where(AudioChunk.audio_file_id == audio_id)
+            .order_by(AudioChunk.chunk_index.asc())
+        ).scalars().all()
+        entries = [
+            {
+                "index": chunk.chunk_index,
+                "file": Path(chunk.file_path).name,
+                "start_seconds": chunk.start_seconds,
+                "end_seconds": chunk.end_seconds,
+                "status": chunk.status,
+                "attempts": chunk.attempts,
+                "size_bytes": _file_size(Path(chunk.file_path)),
+            }
+            for chunk in chunks
+        ]
+    manifest = {
+        "audio_file_id": audio_id,
+        "complete": complete,
+        "codec": get_stt_chunk_codec(),
+        "stt_upload_bytes": sum(entry["size_bytes"] for entry in entries),
+        "chunks": entries,
+    }
+    temporary = output_dir / f"{MANIFEST_NAME}.tmp"
+    temporary.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    temporary.replace(output_dir / MANIFEST_NAME)
+    return manifest
+
+
+async def _manifest_boundaries(
+    manifest: dict[str, object],
+) -> AsyncIterator[tuple[float, float]]:
+    entries = sorted(manifest.get("chunks") or [], key=lambda entry: entry["index"])
+    for entry in entries:
+        yield float(entry["start_seconds"]), float(entry["end_seconds"])
+
+
+def _checkpoint_chunk(
     *,
+    audio_id: int,
+    chunk_index: int,
+    chunk_file: Path,
+    start_seconds: float,
+    end_seconds: float,
+) -> tuple[int, str]:
+    with SessionLocal() as session:
+        chunk = session.execute(
+            select(AudioChunk).where(
+                AudioChunk.audio_file_id == audio_id,
+                AudioChunk.chunk_index == chunk_index,
+            )
+        ).scalar_one_or_none()
+        unchanged = (
+            chunk is not None
+            and chunk.file_path == str(chunk_file)
+            and abs((chunk.start_seconds or 0.0) - start_seconds) < 0.001
+            and abs((chunk.end_seconds or 0.0) - end_seconds) < 0.001
+        )
+        if unchanged:
+            if chunk.status == "done":
+                return chunk.id, chunk.status
+            chunk.status = "pending"
+        else:
+            if chunk is None:
+                chunk = AudioChunk(audio_file_id=audio_id, chunk_index=chunk_index)
+                session.add(chunk)
+            else:
+                session.execute(
+                    delete(ChunkTranscript).where(
+                        ChunkTranscript.audio_chunk_id == chunk.id
+                    )
+                )
+                chunk_file.unlink(missing_ok=True)
+            chunk.file_path = str(chunk_file)
+            chunk.start_seconds = start_seconds
+            chunk.end_seconds = end_seconds
+            chunk.status = "pending"
+            chunk.attempts = 0
+            chunk.error = None
+        chunk.updated_at = datetime.utcnow()
+        session.commit()
+        return chunk.id, chunk.status
+
+
+def _publish_chunk_progress(
+    session_id: int, audio_id: int, planned: bool | None = None
+) -> None:
+    with SessionLocal() as session:
+        completed, total = session.execute(
+            select(func.count().filter(AudioChunk.status == "done"), func.count())
+            .select_from(AudioChunk)
+            .where(AudioChunk.audio_file_id == audio_id)
+        ).one()
+    publish_progress(session_id, completed=completed, total=total, planned=planned)
+
+
+def _window_summary_pending_key(audio_id: int) -> str:
+    return f"notes-windows:pending:{audio_id}"
+
+
+def _on_chunks_completed(session_id: int, audio_id: int) -> None:
+    _publish_chunk_progress(session_id, audio_id)
+    if not get_notes_map_reduce_token_threshold():
+        return
+    try:
+        scheduled = get_redis().set(
+            _window_summary_pending_key(audio_id),
+            "1",
+            nx=True,
+            ex=WINDOW_SUMMARY_PENDING_SECONDS,
+        )
+    except RedisError:
+        scheduled = True
+    if scheduled:
+        summarize_session_windows.apply_async(
+            args=[session_id, audio_id], countdown=WINDOW_SUMMARY_DELAY_SECONDS
+        )
+
+
+def _finish_chunk_plan(
+    *, session_id: int, audio_id: int, chunk_count: int, output_dir: Path
+) -> None:
+    with SessionLocal() as session:
+        stale_ids = session.execute(
+            select(AudioChunk.id).where(
+                AudioChunk.audio_file_id == audio_id,
+                AudioChunk.chunk_index >= chunk_count,
+            )
+        ).scalars().all()
+        if stale_ids:
+            session.execute(
+                delete(ChunkTranscript).where(
+                    ChunkTranscript.audio_chunk_id.in_(stale_ids)
+                )
+            )
+            session.execute(delete(AudioChunk).where(AudioChunk.id.in_(stale_ids)))
+        session.commit()
+    _write_manifest(audio_id=audio_id, output_dir=output_dir, complete=True)
+    _publish_chunk_progress(session_id, audio_id, planned=True)
+
+
+def _chunk_suffix(audio_path: Path) -> str:
+    return STT_CODEC_SUFFIXES.get(get_stt_chunk_codec()) or audio_path.suffix or ".wav"
+
+
+def _chunk_boundaries(
+    *, audio_path: Path, duration_seconds: float | None, output_dir: Path
+) -> AsyncIterator[tuple[float, float]]:
+    manifest = _read_manifest(output_dir)
+    if manifest and manifest.get("complete"):
+        return _manifest_boundaries(manifest)
+    return stream_chunk_boundaries(
+        audio_path,
+        duration_seconds=duration_seconds,
+        noise_db=get_audio_silence_noise_db(),
+        min_silence_seconds=get_audio_silence_min_seconds(),
+        max_seconds=min(get_audio_chunk_seconds(), 25),
+        min_seconds=get_audio_chunk_min_seconds(),
+    )
+
+
+async def _extract_chunk(
+    *, audio_path: Path, chunk_file: Path, start_seconds: float, end_seconds: float
+) -> None:
+    if chunk_file.exists():
+        return
+    partial_file = chunk_file.with_name(
+        f"{chunk_file.stem}.partial{chunk_file.suffix}"
+    )
+    await extract_audio_segment(
+        audio_path,
+        partial_file,
+        start_seconds=start_seconds,
+        end_seconds=end_seconds,
+        codec=get_stt_chunk_codec(),
+        bitrate=get_stt_chunk_bitrate(),
+    )
+    partial_file.replace(chunk_file)
+
+
+async def _plan_chunks(
+    *,
+    session_id: int,
+    audio_id: int,
     audio_path: Path,
-    chunk_seconds: int,
+    duration_seconds: float | None,
     output_dir: Path,
-) -> list[Path]:
-    ffmpeg = shutil.which("ffmpeg")
-    if not ffmpeg:
-        raise RuntimeError("ffmpeg is required for chunked processing")
+    on_batch: Callable[[list[PlannedChunk]], Awaitable[None]],
+    batch_size: int = 1,
+) -> tuple[int, int]:
+    """Checkpoint chunk boundaries as they stream in; return (chunks, pending).
 
+    `on_batch` is handed every `batch_size` pending chunks as soon as they are
+    planned (and the remainder at the end), so work on them can start before
+    silence detection reaches the end of the file.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
-    suffix = audio_path.suffix or ".wav"
-    pattern = output_dir / f"chunk_%05d{suffix}"
-
-    command = [
-        ffmpeg,
-        "-hide_banner",
-        "-loglevel",
-        "error",
-        "-i",
-        str(audio_path),
-        "-f",
-        "segment",
-        "-segment_time",
-        str(chunk_seconds),
-        "-reset_timestamps",
-        "1",
-        "-c",
-        "copy",
-        str(pattern),
-    ]
-    result = subprocess.run(command, capture_output=True, text=True, check=False)
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr.strip() or "ffmpeg chunking failed")
-
-    return sorted(output_dir.glob(f"chunk_*{suffix}"))
+    suffix = _chunk_suffix(audio_path)
+    boundaries = _chunk_boundaries(
+        audio_path=audio_path, duration_seconds=duration_seconds, output_dir=output_dir
+    )
+
+    chunk_count = 0
+    pending = 0
+    batch: list[PlannedChunk] = []
+    async for start_seconds, end_seconds in boundaries:
+        chunk_file = output_dir / f"chunk_{chunk_count:05d}{suffix}"
+        chunk_id, status = await _run_db(
+            _checkpoint_chunk,
+            audio_id=audio_id,
+            chunk_index=chunk_count,
+            chunk_file=chunk_file,
+            start_seconds=start_seconds,
+            end_seconds=end_seconds,
+        )
+        chunk_count += 1
+        if status == "done":
+            continue
+        pending += 1
+        batch.append((chunk_id, chunk_file, start_seconds, end_seconds))
+        if len(batch) >= batch_size:
+            await on_batch(batch)
+            batch = []
+    if batch:
+        await on_batch(batch)
+    await _run_db(
+        _finish_chunk_plan,
+        session_id=session_id,
+        audio_id=audio_id,
+        chunk_count=chunk_count,
+        output_dir=output_dir,
+    )
+    return chunk_count, pending
+
+
+async def _chunk_audio(
+    *,
+    session_id: int,
+    audio_id: int,
+    audio_path: Path,
+    duration_seconds: float | None,
+    output_dir: Path,
+    chunk_queue: asyncio.Queue[ChunkInput | None],
+    consumers: int,
+) -> int:
+    async def extract(batch: list[PlannedChunk]) -> None:
+        for chunk_id, chunk_file, start_seconds, end_seconds in batch:
+            await _extract_chunk(
+                audio_path=audio_path,
+                chunk_file=chunk_file,
+                start_seconds=start_seconds,
+                end_seconds=end_seconds,
+            )
+            await chunk_queue.put((chunk_id, chunk_file, end_seconds - start_seconds))
+
+    try:
+        chunk_count, _ = await _plan_chunks(
+            session_id=session_id,
+            audio_id=audio_id,
+            audio_path=audio_path,
+            duration_seconds=duration_seconds,
+            output_dir=output_dir,
+            on_batch=extract,
+        )
+    finally:
+        for _ in range(consumers):
+            chunk_queue.put_nowait(None)
+    return chunk_count
 
 
 def _offset_segments(
@@ -90,52 +413,37 @@ def _merge_text(texts: list[str]) -> str:
     return "\n".join([text.strip() for text in texts if text and text.strip()]).strip()
 
 
-def _generate_notes_with_retry(
-    *,
-    notes_agent: NotesAgent,
-    transcript_text: str,
-    diarized_segments: list[dict[str, object]] | None,
-    max_retries: int = 3,
-    retry_delay_seconds: float = 2.0,
-) -> dict[str, object]:
-    last_error: Exception | None = None
-    for attempt in range(max_retries + 1):
-        try:
-            return notes_agent.generate_notes(
-                transcript_text=transcript_text,
-                diarized_segments=diarized_segments,
-            )
-        except Exception as exc:
-            last_error = exc
-            if attempt >= max_retries:
-                break
-            time.sleep(retry_delay_seconds)
-    raise RuntimeError(str(last_error) if last_error else "Notes generation failed")
+def _set_chunk_state(
+    chunk_id: int, *, status: str, error: str | None = None, new_attempt: bool = False
+) -> None:
+    with SessionLocal() as session:
+        chunk = session.get(AudioChunk, chunk_id)
+        if chunk is None:
+            return
+        chunk.status = status
+        chunk.error = error
+        if new_attempt:
+            chunk.attempts = (chunk.attempts or 0) + 1
+        chunk.updated_at = datetime.utcnow()
+        session.commit()
 
 
-def _process_chunk(
-    *,
-    audio_id: int,
-    chunk_file: Path,
-    chunk_index: int,
-    start_seconds: float,
-    end_seconds: float,
-) -> int:
+def _fail_unfinished_chunks(chunk_ids: list[int], error: str) -> list[int]:
+    """Mark failed the chunks in `chunk_ids` that have no stored transcript yet."""
     with SessionLocal() as session:
-        chunk = AudioChunk(
-            audio_file_id=audio_id,
-            chunk_index=chunk_index,
-            file_path=str(chunk_file),
-            start_seconds=start_seconds,
-            end_seconds=end_seconds,
-        )
-        session.add(chunk)
+        failed = session.execute(
+            update(AudioChunk)
+            .where(AudioChunk.id.in_(chunk_ids), AudioChunk.status != "done")
+            .values(status="failed", error=error, updated_at=datetime.utcnow())
+            .returning(AudioChunk.id)
+        ).scalars().all()
         session.commit()
-        session.refresh(chunk)
+        return list(failed)
 
-    sarvam_agent = SarvamSttAgent.from_env()
-    transcript_payload = sarvam_agent.transcribe_with_diarization(chunk_file)
 
+def _store_chunk_transcript(
+    chunk_id: int, transcript_payload: dict[str, object]
+) -> int:
     transcript_text = str(transcript_payload.get("text", ""))
     diarized_segments = transcript_payload.get("segments", [])
     diarized_text = transcript_text
@@ -149,11 +457,11 @@ def _process_chunk(
 
     with SessionLocal() as session:
         existing = session.execute(
-            select(ChunkTranscript).where(ChunkTranscript.audio_chunk_id == chunk.id)
+            select(ChunkTranscript).where(ChunkTranscript.audio_chunk_id == chunk_id)
         ).scalar_one_or_none()
         if existing is None:
             record = ChunkTranscript(
-                audio_chunk_id=chunk.id,
+                audio_chunk_id=chunk_id,
                 text=transcript_text,
                 segments=segments,
                 diarized_text=diarized_text,
@@ -167,50 +475,158 @@ def _process_chunk(
             existing.diarized_text = diarized_text
             existing.diarized_segments = diarized_segments
             existing.duration_seconds = duration_seconds
+            existing.updated_at = datetime.utcnow()
+        chunk = session.get(AudioChunk, chunk_id)
+        if chunk is not None:
+            chunk.status = "done"
+            chunk.error = None
+            chunk.updated_at = datetime.utcnow()
         session.commit()
 
-    return chunk.id
+    return chunk_id
+
+
+async def _process_chunk_batch(batch: list[ChunkInput]) -> dict[int, str]:
+    """Transcribe the chunks as one Sarvam job and return errors by chunk id."""
+    for chunk_id, _, _ in batch:
+        await _run_db(_set_chunk_state, chunk_id, status="running", new_attempt=True)
+    sarvam_agent = SarvamSttAgent.shared()
+    outcomes = await sarvam_agent.transcribe_batch_async(
+        [chunk_file for _, chunk_file, _ in batch],
+        sum(audio_seconds for _, _, audio_seconds in batch),
+    )
+
+    errors: dict[int, str] = {}
+    for chunk_id, chunk_file, _ in batch:
+        outcome = outcomes.get(chunk_file.name)
+        if isinstance(outcome, dict):
+            await _run_db(_store_chunk_transcript, chunk_id, outcome)
+            continue
+        errors[chunk_id] = outcome or "Missing from Sarvam job results"
+        await _run_db(
+            _set_chunk_state, chunk_id, status="failed", error=errors[chunk_id]
+        )
+    return errors
+
+
+async def _next_batch(
+    chunk_queue: asyncio.Queue[ChunkInput | None],
+    *,
+    batch_size: int,
+    fill_seconds: float,
+) -> tuple[list[ChunkInput], bool]:
+    item = await chunk_queue.get()
+    if item is None:
+        return [], True
+    batch = [item]
+    while len(batch) < batch_size:
+        try:
+            item = await asyncio.wait_for(chunk_queue.get(), timeout=fill_seconds)
+        except asyncio.TimeoutError:
+            break
+        if item is None:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+@lru_cache(maxsize=1)
+def _stt_limiter() -> AdaptiveLimiter:
+    return AdaptiveLimiter(
+        "sarvam_stt",
+        initial=get_chunk_session_concurrency(),
+        minimum=get_stt_concurrency_min(),
+        maximum=get_stt_concurrency_max(),
+        target_latency_seconds=get_stt_target_latency_seconds(),
+    )
 
 
 async def _process_chunks_concurrently(
     *,
-    chunk_inputs: list[tuple[int, Path, float, float]],
+    session_id: int,
     audio_id: int,
-) -> list[int]:
-    if not chunk_inputs:
-        return []
-
-    max_parallel = min(4, len(chunk_inputs))
-    semaphore = asyncio.Semaphore(max_parallel)
-
-    async def run_one(
-        chunk_index: int, chunk_file: Path, start_seconds: float, end_seconds: float
-    ) -> int:
-        async with semaphore:
-            return await asyncio.to_thread(
-                _process_chunk,
-                audio_id=audio_id,
-                chunk_file=chunk_file,
-                chunk_index=chunk_index,
-                start_seconds=start_seconds,
-                end_seconds=end_seconds,
-            )
+    chunk_queue: asyncio.Queue[ChunkInput | None],
+    limiter: AdaptiveLimiter,
+    max_attempts: int,
+) -> None:
+    batch_size = get_sarvam_batch_size()
+    fill_seconds = get_sarvam_batch_fill_seconds()
+    # One worker fills a batch at a time; otherwise idle workers would each
+    # take a single chunk and batches would never grow past one.
+    batch_lock = asyncio.Lock()
 
-    tasks = [
-        asyncio.create_task(run_one(index, chunk_file, start, end))
-        for index, chunk_file, start, end in chunk_inputs
-    ]
-    return await asyncio.gather(*tasks)
+    async def run_worker() -> None:
+        finished = False
+        while not finished:
+            async with batch_lock:
+                batch, finished = await _next_batch(
+                    chunk_queue, batch_size=batch_size, fill_seconds=fill_seconds
+                )
+            for attempt in range(1, max_attempts + 1):
+                if not batch:
+                    break
+                failure: Exception | None = None
+                try:
+                    async with limiter.slot():
+                        errors = await _process_chunk_batch(batch)
+                except Exception as exc:
+                    failure = exc
+                    errors = {chunk_id: str(exc) for chunk_id, _, _ in batch}
+                    for chunk_id, _, _ in batch:
+                        await _run_db(
+                            _set_chunk_state, chunk_id, status="failed", error=str(exc)
+                        )
+                batch = [item for item in batch if item[0] in errors]
+                await _run_db(_on_chunks_completed, session_id, audio_id)
+                # The provider call already retried transient errors; an auth
+                # error or an open circuit will not clear by retrying here.
+                if failure is not None and not is_retryable(failure):
+                    break
+                if batch and attempt < max_attempts:
+                    await asyncio.sleep(backoff_delay(attempt, failure))
+            for chunk_id, _, _ in batch:
+                await _run_db(
+                    publish_error, session_id, errors[chunk_id], chunk_id=chunk_id
+                )
 
+    await asyncio.gather(*(run_worker() for _ in range(limiter.maximum)))
 
-@celery_app.task(
-    name="server.tasks.session_processing.process_session_chunks",
-    autoretry_for=(APITimeoutError, TimeoutException),
-    retry_backoff=True,
-    retry_jitter=True,
-    retry_kwargs={"max_retries": 3},
-)
-def process_session_chunks(session_id: int) -> dict[str, object]:
+
+async def _run_chunk_pipeline(
+    *,
+    session_id: int,
+    audio_id: int,
+    audio_path: Path,
+    duration_seconds: float | None,
+    output_dir: Path,
+) -> tuple[int, int]:
+    limiter = _stt_limiter()
+    chunk_queue: asyncio.Queue[ChunkInput | None] = asyncio.Queue()
+    chunk_count, _ = await asyncio.gather(
+        _chunk_audio(
+            session_id=session_id,
+            audio_id=audio_id,
+            audio_path=audio_path,
+            duration_seconds=duration_seconds,
+            output_dir=output_dir,
+            chunk_queue=chunk_queue,
+            consumers=limiter.maximum,
+        ),
+        _process_chunks_concurrently(
+            session_id=session_id,
+            audio_id=audio_id,
+            chunk_queue=chunk_queue,
+            limiter=limiter,
+            max_attempts=get_chunk_max_attempts(),
+        ),
+    )
+    manifest = await _run_db(
+        _write_manifest, audio_id=audio_id, output_dir=output_dir, complete=True
+    )
+    return chunk_count, int(manifest["stt_upload_bytes"])
+
+
+def _load_session_audio(session_id: int) -> dict[str, object]:
     with SessionLocal() as session:
         row = session.execute(
             select(Session, AudioFile)
@@ -220,51 +636,28 @@ def process_session_chunks(session_id: int) -> dict[str, object]:
         if row is None:
             raise RuntimeError("Session not found")
         session_row, audio = row
-        audio_id = audio.id
-        audio_file_key = audio.file_key
         session_row.status = "processing"
         session_row.updated_at = datetime.utcnow()
         session.commit()
+        return {
+            "audio_id": audio.id,
+            "file_key": audio.file_key,
+            "storage_path": audio.storage_path,
+            "duration_seconds": audio.duration_seconds,
+            "size_bytes": audio.size_bytes,
+        }
 
-    audio_path = _resolve_audio_path(audio_file_key)
-    chunk_seconds = min(get_audio_chunk_seconds(), 25)
-    chunks_dir = audio_path.parent / "chunks" / audio_file_key
-    chunk_files = _chunk_audio(
-        audio_path=audio_path,
-        chunk_seconds=chunk_seconds,
-        output_dir=chunks_dir,
-    )
-    if not chunk_files:
-        raise RuntimeError("No chunks created for audio file")
 
+def _count_unfinished_chunks(audio_id: int) -> int:
     with SessionLocal() as session:
-        chunk_ids = session.execute(
-            select(AudioChunk.id).where(AudioChunk.audio_file_id == audio_id)
-        ).scalars().all()
-        if chunk_ids:
-            session.execute(
-                delete(ChunkTranscript).where(
-                    ChunkTranscript.audio_chunk_id.in_(chunk_ids)
-                )
-            )
-        session.execute(
-            delete(AudioChunk).where(AudioChunk.audio_file_id == audio_id)
-        )
-        session.commit()
-
-    chunk_inputs: list[tuple[int, Path, float, float]] = []
-    for index, chunk_file in enumerate(chunk_files):
-        start_seconds = float(index * chunk_seconds)
-        end_seconds = start_seconds + chunk_seconds
-        chunk_inputs.append((index, chunk_file, start_seconds, end_seconds))
+        return session.execute(
+            select(func.count())
+            .select_from(AudioChunk)
+            .where(AudioChunk.audio_file_id == audio_id, AudioChunk.status != "done")
+        ).scalar_one()
 
-    asyncio.run(
-        _process_chunks_concurrently(
-            chunk_inputs=chunk_inputs,
-            audio_id=audio_id,
-        )
-    )
 
+def _merge_session_transcript(*, audio_id: int, audio_duration: float | None) -> None:
     with SessionLocal() as session:
         rows = session.execute(
             select(AudioChunk, ChunkTranscript)
@@ -293,7 +686,7 @@ def process_session_chunks(session_id: int) -> dict[str, object]:
 
     merged_text = _merge_text(merged_texts)
     merged_diarized_text = _merge_text(merged_diarized_texts) or merged_text
-    merged_duration = _calculate_duration_seconds(
+    merged_duration = audio_duration or _calculate_duration_seconds(
         merged_diarized_segments or merged_segments
     )
 
@@ -319,23 +712,398 @@ def process_session_chunks(session_id: int) -> dict[str, object]:
             existing.duration_seconds = merged_duration
         session.commit()
 
-    notes_agent = NotesAgent.from_env()
+
+@celery_app.task(
+    bind=True,
+    base=SessionLeaseTask,
+    name="server.tasks.session_processing.process_session_chunks",
+    autoretry_for=(APITimeoutError, TimeoutException),
+    retry_backoff=True,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 3},
+)
+def process_session_chunks(self, session_id: int) -> dict[str, object]:
+    audio = _load_session_audio(session_id)
+    publish_stage(session_id, "transcribing")
+    audio_path = resolve_audio_path(audio["file_key"], audio["storage_path"])
+
+    lease = self.session_lease(session_id)
+    chunk_count, stt_upload_bytes = run_async(
+        lease.keep_alive(
+            _run_chunk_pipeline(
+                session_id=session_id,
+                audio_id=audio["audio_id"],
+                audio_path=audio_path,
+                duration_seconds=audio["duration_seconds"],
+                output_dir=chunks_dir(audio["file_key"]),
+            )
+        )
+    )
+    if not chunk_count:
+        raise RuntimeError("No chunks created for audio file")
+
+    unfinished = _count_unfinished_chunks(audio["audio_id"])
+    if unfinished:
+        raise ChunkProcessingError(
+            f"{unfinished} of {chunk_count} chunks failed transcription"
+        )
+
+    result = merge_session_chunks.delay(session_id)
+    return {
+        "session_id": session_id,
+        "chunks": chunk_count,
+        "stt_upload_bytes": stt_upload_bytes,
+        "merge_task_id": result.id,
+        "status": "processing",
+    }
+
+
+def _global_chunk_slots() -> RedisSemaphore:
+    return RedisSemaphore(
+        get_redis(),
+        "stt-chunks",
+        limit=get_chunk_global_concurrency(),
+        lease_seconds=get_chunk_slot_lease_seconds(),
+    )
+
+
+def _session_chunk_slots(session_id: int) -> RedisSemaphore:
+    return RedisSemaphore(
+        get_redis(),
+        f"stt-session:{session_id}",
+        limit=get_chunk_session_concurrency(),
+        lease_seconds=get_chunk_slot_lease_seconds(),
+    )
+
+
+@celery_app.task(
+    bind=True,
+    base=SessionLeaseTask,
+    name="server.tasks.session_processing.plan_session_chunks",
+)
+def plan_session_chunks(
+    self, session_id: int, retry_round: int = 0
+) -> dict[str, object]:
+    audio = _load_session_audio(session_id)
+    publish_stage(session_id, "transcribing", retry_round=retry_round)
+    audio_path = resolve_audio_path(audio["file_key"], audio["storage_path"])
+
+    batch_task_ids: list[str] = []
+
+    def send(chunk_ids: list[int]) -> None:
+        result = transcribe_session_chunks.delay(session_id, chunk_ids, str(audio_path))
+        batch_task_ids.append(result.id)
+
+    async def dispatch(batch: list[PlannedChunk]) -> None:
+        await _run_db(send, [chunk_id for chunk_id, _, _, _ in batch])
+
+    lease = self.session_lease(session_id)
+    chunk_count, pending = run_async(
+        lease.keep_alive(
+            _plan_chunks(
+                session_id=session_id,
+                audio_id=audio["audio_id"],
+                audio_path=audio_path,
+                duration_seconds=audio["duration_seconds"],
+                output_dir=chunks_dir(audio["file_key"]),
+                batch_size=get_sarvam_batch_size(),
+                on_batch=dispatch,
+            )
+        )
+    )
+    if not chunk_count:
+        raise RuntimeError("No chunks created for audio file")
+
+    # Batches were dispatched while planning ran, so there is no chord to
+    # hang the merge on; it waits for their results instead.
+    result = merge_session_chunks.apply_async(
+        args=[session_id, retry_round],
+        kwargs={"batch_task_ids": batch_task_ids},
+        countdown=MERGE_POLL_SECONDS if batch_task_ids else 0,
+    )
+    return {
+        "session_id": session_id,
+        "chunks": chunk_count,
+        "dispatched": pending,
+        "batches": len(batch_task_ids),
+        "merge_task_id": result.id,
+        "status": "processing",
+    }
+
+
+async def _extract_and_process_batch(
+    *, audio_path: Path, chunks: list[PlannedChunk]
+) -> dict[int, str]:
+    for _, chunk_file, start_seconds, end_seconds in chunks:
+        await _extract_chunk(
+            audio_path=audio_path,
+            chunk_file=chunk_file,
+            start_seconds=start_seconds,
+            end_seconds=end_seconds,
+        )
+    return await _process_chunk_batch(
+        [
+            (chunk_id, chunk_file, end_seconds - start_seconds)
+            for chunk_id, chunk_file, start_seconds, end_seconds in chunks
+        ]
+    )
+
+
+@celery_app.task(
+    bind=True,
+    base=SessionLeaseTask,
+    name="server.tasks.session_processing.transcribe_session_chunks",
+    max_retries=None,
+)
+def transcribe_session_chunks(
+    self,
+    session_id: int,
+    chunk_ids: list[int],
+    audio_path: str,
+    attempt: int = 1,
+    slot_waits: int = 0,
+) -> dict[str, object]:
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(AudioChunk)
+            .where(AudioChunk.id.in_(chunk_ids), AudioChunk.status != "done")
+            .order_by(AudioChunk.chunk_index.asc())
+        ).scalars().all()
+        chunks = [
+            (
+                chunk.id,
+                Path(chunk.file_path),
+                float(chunk.start_seconds or 0.0),
+                float(chunk.end_seconds or 0.0),
+            )
+            for chunk in rows
+        ]
+        audio_id = rows[0].audio_file_id if rows else None
+    if not chunks:
+        return {"chunk_ids": chunk_ids, "status": "done"}
+
+    # The session slot caps one session's Sarvam jobs; the global slot caps all.
+    session_slots = _session_chunk_slots(session_id)
+    session_token = session_slots.acquire()
+    slots = _global_chunk_slots()
+    token = slots.acquire() if session_token is not None else None
+    if token is None:
+        session_slots.release(session_token)
+        # Past the merge's wait the batch would be replanned anyway.
+        if slot_waits * SLOT_WAIT_SECONDS >= get_merge_wait_max_seconds():
+            message = "No STT slot became free"
+            failed_ids = _fail_unfinished_chunks(chunk_ids, message)
+            publish_error(session_id, message)
+            return {"chunk_ids": failed_ids, "status": "failed", "error": message}
+        raise self.retry(
+            args=[session_id, chunk_ids, audio_path],
+            kwargs={"attempt": attempt, "slot_waits": slot_waits + 1},
+            countdown=SLOT_WAIT_SECONDS,
+        )
+    lease = self.session_lease(session_id)
+    failure: Exception | None = None
     try:
-        notes_payload = _generate_notes_with_retry(
-            notes_agent=notes_agent,
-            transcript_text=merged_diarized_text or merged_text,
-            diarized_segments=merged_diarized_segments or merged_segments,
+        # Slots expire like the lease, so a long Sarvam job refreshes both.
+        errors = run_async(
+            lease.keep_alive(
+                _extract_and_process_batch(audio_path=Path(audio_path), chunks=chunks),
+                also=[
+                    partial(session_slots.refresh, session_token),
+                    partial(slots.refresh, token),
+                ],
+                interval_seconds=min(
+                    lease.ttl_seconds, get_chunk_slot_lease_seconds()
+                )
+                / 3,
+            )
+        )
+    except LeaseLostError:
+        # Another run owns the session now; leave its chunks alone.
+        raise
+    except Exception as exc:
+        failure = exc
+        # Chunks the batch finished before the error keep their transcripts.
+        failed_ids = _fail_unfinished_chunks(
+            [chunk_id for chunk_id, _, _, _ in chunks], str(exc)
+        )
+        errors = {chunk_id: str(exc) for chunk_id in failed_ids}
+    finally:
+        slots.release(token)
+        session_slots.release(session_token)
+    _on_chunks_completed(session_id, audio_id)
+    if failure is not None and not is_retryable(failure):
+        # Auth errors and open circuits fail the session instead of being retried.
+        raise failure
+
+    if not errors:
+        return {"chunk_ids": chunk_ids, "status": "done"}
+    if attempt >= get_chunk_max_attempts():
+        for chunk_id, message in errors.items():
+            publish_error(session_id, message, chunk_id=chunk_id)
+        return {"chunk_ids": chunk_ids, "status": "failed", "errors": errors}
+    raise self.retry(
+        args=[session_id, list(errors), audio_path],
+        kwargs={"attempt": attempt + 1},
+        countdown=backoff_delay(attempt, failure),
+    )
+
+
+@celery_app.task(
+    bind=True,
+    base=SessionLeaseTask,
+    name="server.tasks.session_processing.merge_session_chunks",
+    autoretry_for=(APITimeoutError, TimeoutException),
+    retry_backoff=True,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 3},
+)
+def merge_session_chunks(
+    self,
+    session_id: int,
+    retry_round: int = 0,
+    batch_task_ids: list[str] | None = None,
+    wait_until: float | None = None,
+) -> dict[str, object]:
+    results = [celery_app.AsyncResult(task_id) for task_id in batch_task_ids or []]
+    failed = next((result for result in results if result.failed()), None)
+    if failed is not None:
+        # A non-retryable error or open circuit fails the session at once.
+        raise ChunkProcessingError(
+            f"Chunk batch {failed.id} failed: {failed.result}"
+        )
+    running = [result.id for result in results if not result.ready()]
+    if wait_until is None:
+        wait_until = time.time() + get_merge_wait_max_seconds()
+    if running and time.time() < wait_until:
+        # Running batches keep the lease alive themselves; a batch whose worker
+        # died stays PENDING, so the wait is bounded and the leftovers replanned.
+        merge_session_chunks.apply_async(
+            args=[session_id, retry_round],
+            kwargs={"batch_task_ids": running, "wait_until": wait_until},
+            countdown=MERGE_POLL_SECONDS,
+        )
+        return {
+            "session_id": session_id,
+            "running": len(running),
+            "status": "processing",
+        }
+    if running:
+        logger.warning(
+            "Session %s: %s chunk batches still unfinished after %ss",
+            session_id,
+            len(running),
+            get_merge_wait_max_seconds(),
+        )
+
+    audio = _load_session_audio(session_id)
+    publish_stage(session_id, "merging")
+    audio_path = resolve_audio_path(audio["file_key"], audio["storage_path"])
+    manifest = _write_manifest(
+        audio_id=audio["audio_id"],
+        output_dir=chunks_dir(audio["file_key"]),
+        complete=True,
+    )
+    chunk_count = len(manifest["chunks"])
+
+    unfinished = _count_unfinished_chunks(audio["audio_id"])
+    if unfinished:
+        if retry_round >= 3:
+            raise ChunkProcessingError(
+                f"{unfinished} of {chunk_count} chunks failed transcription"
+            )
+        self.session_lease(session_id).hold()
+        plan_session_chunks.apply_async(
+            args=[session_id],
+            kwargs={"retry_round": retry_round + 1},
+            countdown=min(30 * 2**retry_round, 300),
+        )
+        return {
+            "session_id": session_id,
+            "chunks": chunk_count,
+            "unfinished": unfinished,
+            "retry_round": retry_round + 1,
+            "status": "processing",
+        }
+
+    stt_upload_bytes = int(manifest["stt_upload_bytes"])
+    source_bytes = audio["size_bytes"] or _file_size(audio_path)
+    bytes_saved = source_bytes - stt_upload_bytes
+    logger.info(
+        "Session %s: %s chunks, %s STT upload bytes vs %s source bytes (%s saved)",
+        session_id,
+        chunk_count,
+        stt_upload_bytes,
+        source_bytes,
+        bytes_saved,
+    )
+
+    _merge_session_transcript(
+        audio_id=audio["audio_id"], audio_duration=audio["duration_seconds"]
+    )
+    # The lease stays held until the notes are indexed.
+    self.session_lease(session_id).hold()
+    result = write_session_notes.delay(session_id)
+    return {
+        "session_id": session_id,
+        "chunks": chunk_count,
+        "stt_upload_bytes": stt_upload_bytes,
+        "bytes_saved": bytes_saved,
+        "notes_task_id": result.id,
+        "status": "transcribed",
+    }
+
+
+def _set_session_status(session_id: int, status: str) -> None:
+    with SessionLocal() as session:
+        session_row = session.get(Session, session_id)
+        if session_row:
+            session_row.status = status
+            session_row.updated_at = datetime.utcnow()
+        session.commit()
+
+
+@celery_app.task(
+    bind=True,
+    base=SessionLeaseTask,
+    failure_stage=None,
+    name="server.tasks.session_processing.write_session_notes",
+    max_retries=3,
+)
+def write_session_notes(self, session_id: int) -> dict[str, object]:
+    publish_stage(session_id, "notes")
+    lease = self.session_lease(session_id)
+    lease.hold()
+    with SessionLocal() as session:
+        transcript = session.execute(
+            select(Transcript)
+            .join(AudioFile, AudioFile.id == Transcript.audio_file_id)
+            .where(AudioFile.session_id == session_id)
+        ).scalar_one_or_none()
+        if transcript is None:
+            raise RuntimeError("Transcript not found")
+        audio_id = transcript.audio_file_id
+        transcript_text, diarized_segments = _notes_inputs(transcript)
+
+    try:
+        notes_payload = generate_session_notes_payload(
+            audio_id=audio_id,
+            transcript_text=transcript_text,
+            diarized_segments=diarized_segments,
         )
     except Exception as exc:
-        with SessionLocal() as session:
-            session_row = session.get(Session, session_id)
-            if session_row:
-                session_row.status = "transcribed"
-                session_row.updated_at = datetime.utcnow()
-            session.commit()
+        # Transient errors were already retried inside the provider call; only
+        # an open circuit, which failed without calling, is worth a later retry.
+        circuit_open = isinstance(exc, CircuitOpenError)
+        if circuit_open and self.request.retries < self.max_retries:
+            raise self.retry(
+                exc=exc, countdown=backoff_delay(self.request.retries + 1, exc)
+            )
+        _set_session_status(session_id, "transcribed")
+        lease.release()
+        publish_error(session_id, f"Notes generation failed: {exc}")
+        publish_stage(session_id, "transcribed")
         return {
             "session_id": session_id,
-            "chunks": len(chunk_files),
             "status": "transcribed",
             "notes_status": "failed",
             "error": str(exc),
@@ -371,17 +1139,63 @@ def process_session_chunks(session_id: int) -> dict[str, object]:
             session_row.status = "noted"
             session_row.updated_at = datetime.utcnow()
         session.commit()
+    publish_stage(session_id, "noted")
 
-    upsert_session_note_vector(
-        session_id=session_id,
-        note_markdown=notes_payload["note_markdown"],
-        summary=notes_payload["summary"],
-        version=notes_payload["version"],
-    )
-
+    lease.hold()
+    result = index_session_notes.delay(session_id)
     return {
         "session_id": session_id,
-        "chunks": len(chunk_files),
         "status": "noted",
         "notes_status": "ready",
+        "index_task_id": result.id,
     }
+
+
+@celery_app.task(
+    name="server.tasks.session_processing.summarize_session_windows",
+    ignore_result=True,
+)
+def summarize_session_windows(session_id: int, audio_id: int) -> dict[str, object]:
+    try:
+        # Batches finishing from here on schedule the next run.
+        get_redis().delete(_window_summary_pending_key(audio_id))
+    except RedisError:
+        pass
+    try:
+        windows = summarize_closed_windows(audio_id)
+    except Exception:
+        # Best effort: write_session_notes summarizes any window missed here.
+        logger.exception("Incremental notes failed for session %s", session_id)
+        windows = 0
+    return {"session_id": session_id, "windows": windows}
+
+
+@celery_app.task(
+    bind=True,
+    base=SessionLeaseTask,
+    failure_stage=None,
+    name="server.tasks.session_processing.index_session_notes",
+    autoretry_for=(APITimeoutError, TimeoutException, CircuitOpenError),
+    retry_backoff=True,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 3},
+)
+def index_session_notes(self, session_id: int) -> dict[str, object]:
+    with SessionLocal() as session:
+        note = session.execute(
+            select(SessionNote).where(SessionNote.session_id == session_id)
+        ).scalar_one_or_none()
+        if note is None:
+            raise RuntimeError("Session notes not found")
+        note_markdown = note.note_markdown
+        summary = note.summary
+        version = note.version
+
+    upsert_session_note_vector(
+        session_id=session_id,
+        note_markdown=note_markdown,
+        summary=summary,
+        version=version,
+    )
+    self.session_lease(session_id).release()
+    return {"session_id": session_id, "status": "indexed"}
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+import shutil
+import subprocess
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+# Hard cuts land this far under the cap so container/codec rounding in the
+# extracted chunk never pushes it past the provider's duration limit.
+HARD_CUT_MARGIN_SECONDS = 0.5
+
+
+def _to_float(value: object) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: object) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _check_decodable(ffmpeg: str, audio_path: Path, seconds: float) -> None:
+    command = [
+        ffmpeg,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-xerror",
+        "-t",
+        str(seconds),
+        "-i",
+        str(audio_path),
+        "-map",
+        "0:a:0",
+        "-f",
+        "null",
+        "-",
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or "Audio stream could not be decoded")
+
+
+@lru_cache(maxsize=1)
+def _warn_ffprobe_missing() -> None:
+    logger.warning(
+        "ffprobe not found; uploads are stored without probing or validation"
+    )
+
+
+def probe_audio(audio_path: Path, decode_check_seconds: float = 5.0) -> dict[str, object] | None:
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        _warn_ffprobe_missing()
+        return None
+
+    command = [
+        ffprobe,
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "format=duration:stream=codec_name,sample_rate,channels,duration",
+        "-of",
+        "json",
+        str(audio_path),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or "ffprobe could not read the file")
+
+    try:
+        data = json.loads(result.stdout or "{}")
+    except json.JSONDecodeError as exc:
+        raise ValueError("ffprobe returned invalid output") from exc
+
+    streams = data.get("streams") or []
+    if not streams:
+        raise ValueError("No audio stream found")
+    stream = streams[0]
+    format_info = data.get("format") or {}
+    duration = _to_float(format_info.get("duration")) or _to_float(stream.get("duration"))
+    if not duration or duration <= 0:
+        raise ValueError("Audio duration could not be determined")
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg and decode_check_seconds > 0:
+        _check_decodable(ffmpeg, audio_path, decode_check_seconds)
+
+    return {
+        "duration_seconds": duration,
+        "codec": stream.get("codec_name"),
+        "sample_rate": _to_int(stream.get("sample_rate")),
+        "channels": _to_int(stream.get("channels")),
+    }
+
+
+class ChunkBoundaryPlanner:
+    def __init__(self, *, max_seconds: float, min_seconds: float) -> None:
+        if max_seconds <= HARD_CUT_MARGIN_SECONDS:
+            raise ValueError(
+                f"max_seconds must exceed {HARD_CUT_MARGIN_SECONDS}s, got {max_seconds}"
+            )
+        self.max_seconds = max_seconds
+        self.min_seconds = min(min_seconds, max_seconds / 2)
+        self.start = 0.0
+        self._silences: list[tuple[float, float]] = []
+        self._open_silence: float | None = None
+
+    def silence_started(self, at_seconds: float) -> None:
+        self._open_silence = max(at_seconds, 0.0)
+
+    def silence_ended(self, at_seconds: float) -> None:
+        if self._open_silence is None:
+            return
+        self._silences.append((self._open_silence, at_seconds))
+        self._open_silence = None
+
+    def _choose_cut(self, silences: list[tuple[float, float]]) -> float:
+        window_start = self.start + self.min_seconds
+        window_end = self.start + self.max_seconds
+        best_cut = max(window_end - HARD_CUT_MARGIN_SECONDS, window_start)
+        best_length = 0.0
+        for silence_start, silence_end in silences:
+            if silence_end <= window_start:
+                continue
+            if silence_start >= window_end:
+                break
+            overlap_start = max(silence_start, window_start)
+            overlap_end = min(silence_end, window_end)
+            if overlap_end - overlap_start >= best_length:
+                best_length = overlap_end - overlap_start
+                best_cut = (overlap_start + overlap_end) / 2
+        return best_cut
+
+    def advance(self, position_seconds: float) -> list[tuple[float, float]]:
+        boundaries: list[tuple[float, float]] = []
+        while position_seconds >= self.start + self.max_seconds:
+            silences = list(self._silences)
+            if self._open_silence is not None:
+                silences.append((self._open_silence, position_seconds))
+            cut = self._choose_cut(silences)
+            boundaries.append((self.start, cut))
+            self.start = cut
+            self._silences = [
+                silence for silence in self._silences if silence[1] > cut
+            ]
+        return boundaries
+
+    def finish(self, duration_seconds: float) -> list[tuple[float, float]]:
+        if self._open_silence is not None:
+            self.silence_ended(duration_seconds)
+        boundaries = self.advance(duration_seconds)
+        if duration_seconds > self.start:
+            boundaries.append((self.start, duration_seconds))
+        return boundaries
+
+
+async def stream_chunk_boundaries(
+    audio_path: Path,
+    *,
+    duration_seconds: float | None,
+    noise_db: float,
+    min_silence_seconds: float,
+    max_seconds: float,
+    min_seconds: float,
+) -> AsyncIterator[tuple[float, float]]:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg is required for silence detection")
+
+    command = [
+        ffmpeg,
+        "-hide_banner",
+        "-nostats",
+        "-progress",
+        "pipe:2",
+        "-i",
+        str(audio_path),
+        "-vn",
+        "-af",
+        f"silencedetect=noise={noise_db}dB:d={min_silence_seconds}",
+        "-f",
+        "null",
+        "-",
+    ]
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    planner = ChunkBoundaryPlanner(max_seconds=max_seconds, min_seconds=min_seconds)
+    # silencedetect reports a silence only after it has lasted min_silence_seconds,
+    # so windows are closed slightly behind the decode position.
+    lookahead = min_silence_seconds + 1.0
+    position = 0.0
+    recent_lines: deque[str] = deque(maxlen=20)
+    try:
+        async for raw_line in process.stderr:
+            line = raw_line.decode("utf-8", errors="ignore").strip()
+            recent_lines.append(line)
+            if line.startswith(("out_time_us=", "out_time_ms=")):
+                decoded = _to_float(line.split("=", 1)[1])
+                if decoded is not None:
+                    position = max(position, decoded / 1_000_000)
+                    for boundary in planner.advance(position - lookahead):
+                        yield boundary
+                continue
+            start_match = _SILENCE_START_RE.search(line)
+            if start_match:
+                planner.silence_started(float(start_match.group(1)))
+                continue
+            end_match = _SILENCE_END_RE.search(line)
+            if end_match:
+                planner.silence_ended(float(end_match.group(1)))
+        returncode = await process.wait()
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    if returncode != 0:
+        raise RuntimeError("\n".join(recent_lines) or "ffmpeg silence detection failed")
+    # The decoded end is exact; a probed duration is only an estimate (VBR MP3).
+    for boundary in planner.finish(position or duration_seconds or 0.0):
+        yield boundary
+
+
+STT_CODEC_SUFFIXES = {"flac": ".flac", "opus": ".ogg"}
+
+
+def _encoding_args(codec: str, bitrate: str) -> list[str]:
+    if codec == "flac":
+        return ["-ac", "1", "-ar", "16000", "-c:a", "flac"]
+    if codec == "opus":
+        return [
+            "-ac",
+            "1",
+            "-ar",
+            "16000",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            bitrate,
+            "-application",
+            "voip",
+        ]
+    return ["-c", "copy"]
+
+
+async def extract_audio_segment(
+    audio_path: Path,
+    output_path: Path,
+    *,
+    start_seconds: float,
+    end_seconds: float,
+    codec: str = "copy",
+    bitrate: str = "24k",
+) -> None:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg is required for chunked processing")
+
+    command = [
+        ffmpeg,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-ss",
+        f"{start_seconds:.3f}",
+        "-i",
+        str(audio_path),
+        "-t",
+        f"{end_seconds - start_seconds:.3f}",
+        "-vn",
+        *_encoding_args(codec, bitrate),
+        str(output_path),
+    ]
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", errors="ignore").strip()
+        raise RuntimeError(message or "ffmpeg chunk extraction failed")
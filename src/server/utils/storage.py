@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from server.config import get_upload_dir
+
+UPLOAD_DIR = get_upload_dir()
+CHUNKS_DIR = UPLOAD_DIR / "chunks"
+
+
+def shard_parts(file_key: str) -> tuple[str, str]:
+    return file_key[:2], file_key[2:4]
+
+
+def build_storage_path(file_key: str, suffix: str) -> str:
+    """Path of an upload relative to `UPLOAD_DIR`, as stored in `audio_files`."""
+    return "/".join([*shard_parts(file_key), f"{file_key}{suffix}"])
+
+
+def chunks_dir(file_key: str) -> Path:
+    return CHUNKS_DIR.joinpath(*shard_parts(file_key), file_key)
+
+
+def resolve_audio_path(file_key: str, storage_path: str | None) -> Path:
+    if storage_path:
+        candidate = UPLOAD_DIR / storage_path
+        if candidate.exists():
+            return candidate
+    shard_dir = UPLOAD_DIR.joinpath(*shard_parts(file_key))
+    matching = next(shard_dir.glob(f"{file_key}*"), None)
+    if matching is None:
+        raise FileNotFoundError(f"Audio file not found on disk: {file_key}")
+    return matching
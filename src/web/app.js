@@ -1,6 +1,33 @@
 (function () {
   const { useEffect, useState } = React;
   const DEFAULT_API_BASE_URL = "http://127.0.0.1:8000/api/v1";
+  const UPLOAD_PART_SIZE = 8 * 1024 * 1024;
+  const UPLOAD_MAX_RETRIES = 5;
+
+  const TERMINAL_STAGES = ["noted", "transcribed", "failed"];
+  const STAGE_LABELS = {
+    queued: "Queued for processing",
+    transcribing: "Transcribing",
+    merging: "Merging chunk transcripts",
+    notes: "Writing session notes",
+    noted: "Processing complete.",
+    transcribed: "Transcript ready; notes were not generated.",
+    failed: "Processing failed",
+  };
+
+  function describeProgress(progress) {
+    const counts = `${progress.completed}/${progress.total} chunks`;
+    if (progress.eta_seconds == null) {
+      return `Transcribing: ${counts}`;
+    }
+    const minutes = Math.max(1, Math.round(progress.eta_seconds / 60));
+    return `Transcribing: ${counts}, about ${minutes} min left`;
+  }
+
+  async function readErrorDetail(res, fallback) {
+    const errorPayload = await res.json().catch(() => ({}));
+    return errorPayload.detail || fallback;
+  }
 
   function App() {
     const [file, setFile] = useState(null);
@@ -9,6 +36,7 @@
     const [sessionId, setSessionId] = useState(null);
     const [isUploading, setIsUploading] = useState(false);
     const [isProcessingLarge, setIsProcessingLarge] = useState(false);
+    const [watchedSessionId, setWatchedSessionId] = useState(null);
     const [apiBaseUrl, setApiBaseUrl] = useState(DEFAULT_API_BASE_URL);
     const [view, setView] = useState("upload");
     const [listData, setListData] = useState([]);
@@ -99,6 +127,116 @@
       };
     }, [apiBaseUrl, view, listPage, listPageSize]);
 
+    useEffect(() => {
+      if (!watchedSessionId) {
+        return;
+      }
+      const source = new EventSource(
+        `${apiBaseUrl}/sessions/${watchedSessionId}/events`
+      );
+
+      function applyStage(stage, error) {
+        const label = STAGE_LABELS[stage] || stage;
+        setStatus(error ? `${label}: ${error}` : label);
+        if (TERMINAL_STAGES.includes(stage)) {
+          source.close();
+          setWatchedSessionId(null);
+          setListData((items) =>
+            items.map((item) =>
+              item.session_id === watchedSessionId ? { ...item, status: stage } : item
+            )
+          );
+        }
+      }
+
+      source.addEventListener("snapshot", (event) => {
+        const snapshot = JSON.parse(event.data);
+        if (snapshot.running === false && !TERMINAL_STAGES.includes(snapshot.stage)) {
+          // Nothing is publishing for this session; stop instead of reconnecting.
+          source.close();
+          setWatchedSessionId(null);
+          setStatus(STAGE_LABELS[snapshot.stage] || `Status: ${snapshot.stage}`);
+        } else if (snapshot.total != null && !TERMINAL_STAGES.includes(snapshot.stage)) {
+          setStatus(describeProgress(snapshot));
+        } else {
+          applyStage(snapshot.stage, snapshot.stage === "failed" && snapshot.error);
+        }
+      });
+      source.addEventListener("stage", (event) => {
+        const payload = JSON.parse(event.data);
+        applyStage(payload.stage, payload.error);
+      });
+      source.addEventListener("progress", (event) => {
+        setStatus(describeProgress(JSON.parse(event.data)));
+      });
+      source.addEventListener("pipeline_error", (event) => {
+        setStatus(`Chunk error: ${JSON.parse(event.data).error}`);
+      });
+
+      return () => {
+        source.close();
+      };
+    }, [apiBaseUrl, watchedSessionId]);
+
+    async function uploadInParts(selectedFile) {
+      const createRes = await fetch(`${apiBaseUrl}/sessions/uploads`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          filename: selectedFile.name,
+          content_type: selectedFile.type,
+          total_bytes: selectedFile.size,
+        }),
+      });
+      if (!createRes.ok) {
+        throw new Error(await readErrorDetail(createRes, "Upload failed"));
+      }
+      const upload = await createRes.json();
+      const uploadUrl = `${apiBaseUrl}/sessions/uploads/${upload.upload_id}`;
+      let offset = upload.offset || 0;
+      let failures = 0;
+
+      while (offset < selectedFile.size) {
+        const end = Math.min(offset + UPLOAD_PART_SIZE, selectedFile.size);
+        try {
+          const res = await fetch(uploadUrl, {
+            method: "PATCH",
+            headers: {
+              "Content-Type": "application/offset+octet-stream",
+              "Upload-Offset": String(offset),
+            },
+            body: selectedFile.slice(offset, end),
+          });
+          if (!res.ok) {
+            throw new Error(await readErrorDetail(res, "Upload failed"));
+          }
+          const progress = await res.json();
+          offset = progress.offset;
+          failures = 0;
+          setStatus(
+            `Uploading... ${Math.floor((offset / selectedFile.size) * 100)}%`
+          );
+        } catch (error) {
+          failures += 1;
+          if (failures > UPLOAD_MAX_RETRIES) {
+            throw error;
+          }
+          await new Promise((resolve) => setTimeout(resolve, 1000 * failures));
+          const statusRes = await fetch(uploadUrl).catch(() => null);
+          if (statusRes && statusRes.ok) {
+            const current = await statusRes.json();
+            offset = current.offset;
+          }
+        }
+      }
+
+      const completeRes = await fetch(`${uploadUrl}/complete`, { method: "POST" });
+      if (!completeRes.ok) {
+        throw new Error(await readErrorDetail(completeRes, "Upload failed"));
+      }
+      return completeRes.json();
+    }
+
     async function handleSubmit(event) {
       event.preventDefault();
       setResponse(null);
@@ -109,24 +247,10 @@
         return;
       }
 
-      const formData = new FormData();
-      formData.append("file", file);
-
       try {
         setStatus("Uploading...");
         setIsUploading(true);
-        const res = await fetch(`${apiBaseUrl}/sessions/upload`, {
-          method: "POST",
-          body: formData,
-        });
-
-        if (!res.ok) {
-          const errorPayload = await res.json().catch(() => ({}));
-          const detail = errorPayload.detail || "Upload failed";
-          throw new Error(detail);
-        }
-
-        const payload = await res.json();
+        const payload = await uploadInParts(file);
         setResponse(payload);
         setSessionId(payload.session_id || null);
         setStatus("Upload complete.");
@@ -155,7 +279,13 @@
           const detail = errorPayload.detail || "Chunked processing failed";
           throw new Error(detail);
         }
-        setStatus("Chunked processing started in the background.");
+        const payload = await res.json().catch(() => ({}));
+        setStatus(
+          payload.in_flight
+            ? "Chunked processing is already running for this session."
+            : "Chunked processing started in the background."
+        );
+        setWatchedSessionId(sessionId);
       } catch (error) {
         setStatus(error.message || "Something went wrong.");
       } finally {
@@ -182,6 +312,60 @@
       }
     }
 
+    async function handleGenerateNotes(item) {
+      try {
+        setStatus("Generating notes...");
+        setModalContent("");
+        setModalType("notes");
+        setModalTitle(item.title || "Session Notes");
+        setModalOpen(true);
+        const res = await fetch(
+          `${apiBaseUrl}/sessions/${item.session_id}/notes/stream`,
+          { method: "POST" }
+        );
+        if (!res.ok || !res.body) {
+          throw new Error(await readErrorDetail(res, "Failed to generate notes"));
+        }
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) {
+            break;
+          }
+          buffer += decoder.decode(value, { stream: true });
+          const frames = buffer.split("\n\n");
+          buffer = frames.pop();
+          for (const frame of frames) {
+            const eventLine = frame.match(/^event: (.*)$/m);
+            const dataLine = frame.match(/^data: (.*)$/m);
+            if (!eventLine || !dataLine) {
+              continue;
+            }
+            const payload = JSON.parse(dataLine[1]);
+            if (eventLine[1] === "token") {
+              setModalContent((current) => (current || "") + payload.text);
+            } else if (eventLine[1] === "notes") {
+              setModalContent(payload.note_markdown || "");
+              setStatus("Notes ready.");
+              setListData((items) =>
+                items.map((entry) =>
+                  entry.session_id === item.session_id
+                    ? { ...entry, status: "noted", notes_available: true }
+                    : entry
+                )
+              );
+            } else if (eventLine[1] === "error") {
+              throw new Error(payload.error || "Failed to generate notes");
+            }
+          }
+        }
+      } catch (error) {
+        setStatus(error.message || "Something went wrong.");
+      }
+    }
+
     function formatTimecode(value) {
       if (typeof value !== "number" || Number.isNaN(value)) {
         return "00:00.00";
@@ -462,6 +646,20 @@
                                               "Transcript"
                                             )
                                           : null,
+                                        item.transcript_available
+                                          ? React.createElement(
+                                              "button",
+                                              {
+                                                type: "button",
+                                                className: "ghost",
+                                                onClick: () => {
+                                                  handleGenerateNotes(item);
+                                                  setOpenMenuSessionId(null);
+                                                },
+                                              },
+                                              "Generate Notes"
+                                            )
+                                          : null,
                                         item.notes_available
                                           ? React.createElement(
                                               "button",
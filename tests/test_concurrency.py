@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+
+from server.core import concurrency
+from server.core.concurrency import AdaptiveLimiter
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    fake = Clock()
+    monkeypatch.setattr(concurrency.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def _limiter(initial: int) -> AdaptiveLimiter:
+    return AdaptiveLimiter(
+        "sarvam",
+        initial=initial,
+        minimum=1,
+        maximum=10,
+        target_latency_seconds=2.0,
+    )
+
+
+def test_limit_grows_by_one_after_limit_healthy_calls() -> None:
+    limiter = _limiter(2)
+
+    assert limiter._record(latency_seconds=0.5, error=None) == "ok"
+    assert limiter.limit == 2
+    limiter._record(latency_seconds=0.5, error=None)
+    assert limiter.limit == 3
+
+    for _ in range(3):
+        limiter._record(latency_seconds=0.5, error=None)
+    assert limiter.limit == 4
+
+
+def test_slow_or_failed_calls_reset_the_healthy_streak() -> None:
+    limiter = _limiter(2)
+
+    limiter._record(latency_seconds=0.5, error=None)
+    assert limiter._record(latency_seconds=5.0, error=None) == "slow"
+    limiter._record(latency_seconds=0.5, error=None)
+    assert limiter._record(latency_seconds=0.5, error=ValueError()) == "error"
+    limiter._record(latency_seconds=0.5, error=None)
+
+    assert limiter.limit == 2
+
+
+def test_limit_stops_at_the_maximum() -> None:
+    limiter = _limiter(10)
+
+    for _ in range(30):
+        limiter._record(latency_seconds=0.5, error=None)
+
+    assert limiter.limit == 10
+
+
+def test_throttling_halves_the_limit_once_per_window(clock: Clock) -> None:
+    limiter = _limiter(8)
+
+    assert limiter._record(latency_seconds=0.5, error=_StatusError(429)) == "overload"
+    assert limiter.limit == 4
+    clock.now += 1.0
+    limiter._record(latency_seconds=0.5, error=_StatusError(429))
+    limiter._record(latency_seconds=0.5, error=TimeoutError())
+    assert limiter.limit == 4
+
+    clock.now += 2.0
+    limiter._record(latency_seconds=0.5, error=_StatusError(429))
+    assert limiter.limit == 2
+
+
+def test_throttling_never_drops_below_the_minimum(clock: Clock) -> None:
+    limiter = _limiter(1)
+
+    limiter._record(latency_seconds=0.5, error=_StatusError(429))
+
+    assert limiter.limit == 1
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+from server.utils.media import ChunkBoundaryPlanner
+
+
+def test_planner_cuts_in_the_middle_of_the_longest_silence() -> None:
+    planner = ChunkBoundaryPlanner(max_seconds=25, min_seconds=5)
+    planner.silence_started(8.0)
+    planner.silence_ended(8.5)
+    planner.silence_started(18.0)
+    planner.silence_ended(20.0)
+
+    assert planner.advance(24.9) == []
+    assert planner.advance(25.0) == [(0.0, 19.0)]
+    assert planner.finish(30.0) == [(19.0, 30.0)]
+
+
+def test_planner_ignores_silences_before_the_minimum_chunk_length() -> None:
+    planner = ChunkBoundaryPlanner(max_seconds=25, min_seconds=5)
+    planner.silence_started(1.0)
+    planner.silence_ended(4.0)
+    planner.silence_started(12.0)
+    planner.silence_ended(12.4)
+
+    assert planner.advance(25.0) == [(0.0, 12.2)]
+
+
+def test_planner_uses_an_open_silence_up_to_the_decoded_position() -> None:
+    planner = ChunkBoundaryPlanner(max_seconds=25, min_seconds=5)
+    planner.silence_started(21.0)
+
+    assert planner.advance(25.0) == [(0.0, 23.0)]
+
+
+def test_planner_hard_cuts_without_silence() -> None:
+    planner = ChunkBoundaryPlanner(max_seconds=25, min_seconds=5)
+
+    boundaries = planner.advance(60.0) + planner.finish(60.0)
+
+    assert boundaries == [(0.0, 24.5), (24.5, 49.0), (49.0, 60.0)]
+
+
+def test_planner_chunks_never_exceed_the_cap() -> None:
+    planner = ChunkBoundaryPlanner(max_seconds=25, min_seconds=5)
+    for start in range(3, 300, 7):
+        planner.silence_started(float(start))
+        planner.silence_ended(start + 0.3)
+
+    boundaries = planner.advance(300.0) + planner.finish(300.0)
+
+    assert boundaries[0][0] == 0.0
+    assert boundaries[-1][1] == 300.0
+    for (start, end), (next_start, _) in zip(boundaries, boundaries[1:]):
+        assert end == next_start
+    assert all(0 < end - start <= 25 for start, end in boundaries)
+
+
+@pytest.mark.parametrize("max_seconds", [0, 0.5, -10])
+def test_planner_rejects_chunks_no_longer_than_the_hard_cut_margin(
+    max_seconds: float,
+) -> None:
+    with pytest.raises(ValueError):
+        ChunkBoundaryPlanner(max_seconds=max_seconds, min_seconds=5)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from server.core import notes_cache
+from server.core.notes_cache import cached_notes, lookup_notes, store_notes
+
+
+class FakeRedis:
+    """Just enough of redis-py for the notes cache: strings and one sorted set."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.index: dict[str, float] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: str, ex: int | None = None) -> bool:
+        self.values[key] = value
+        return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        added = len(mapping.keys() - self.index.keys())
+        self.index.update(mapping)
+        return added
+
+    def zremrangebyscore(self, key: str, low: str, high: float) -> int:
+        stale = [member for member, score in self.index.items() if score <= high]
+        for member in stale:
+            del self.index[member]
+        return len(stale)
+
+    def zcard(self, key: str) -> int:
+        return len(self.index)
+
+    def zpopmin(self, key: str, count: int) -> list[tuple[str, float]]:
+        oldest = sorted(self.index.items(), key=lambda item: item[1])[:count]
+        for member, _ in oldest:
+            del self.index[member]
+        return oldest
+
+    def pipeline(self) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.calls: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[object]:
+        return [
+            getattr(self.client, name)(*args, **kwargs)
+            for name, args, kwargs in self.calls
+        ]
+
+
+@pytest.fixture
+def counters(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, float, dict]]:
+    recorded: list[tuple[str, float, dict]] = []
+    monkeypatch.setattr(
+        notes_cache,
+        "increment_counter",
+        lambda name, amount=1.0, **labels: recorded.append((name, amount, labels)),
+    )
+    return recorded
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    client = FakeRedis()
+    clock = iter(range(1_000, 2_000))
+    monkeypatch.setattr(notes_cache, "get_redis", lambda: client)
+    monkeypatch.setattr(notes_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    monkeypatch.setenv("NOTES_CACHE_TTL_SECONDS", "3600")
+    monkeypatch.setenv("NOTES_CACHE_MAX_ENTRIES", "2")
+    return client
+
+
+def _notes(summary: str) -> dict[str, object]:
+    return {"summary": summary, "key_points": [], "action_items": []}
+
+
+def test_cached_notes_generates_on_miss_and_reuses_on_hit(
+    fake_redis: FakeRedis, counters: list
+) -> None:
+    calls: list[str] = []
+
+    def generate() -> dict[str, object]:
+        calls.append("generate")
+        return _notes("first")
+
+    assert cached_notes("k1", generate) == _notes("first")
+    assert cached_notes("k1", generate) == _notes("first")
+
+    assert calls == ["generate"]
+    assert counters == [
+        ("notes_cache_requests_total", 1.0, {"result": "miss"}),
+        ("notes_cache_requests_total", 1.0, {"result": "hit"}),
+    ]
+
+
+def test_store_notes_skips_fallback_payloads(fake_redis: FakeRedis, counters: list) -> None:
+    store_notes("k1", {"summary": None, "raw_output": "not json"})
+
+    assert lookup_notes("k1") is None
+    assert fake_redis.index == {}
+
+
+def test_store_notes_evicts_the_oldest_entries_past_the_limit(
+    fake_redis: FakeRedis, counters: list
+) -> None:
+    for key in ("k1", "k2", "k3"):
+        store_notes(key, _notes(key))
+
+    assert lookup_notes("k1") is None
+    assert lookup_notes("k2") == _notes("k2")
+    assert lookup_notes("k3") == _notes("k3")
+    assert sorted(fake_redis.index) == ["notes-cache:k2", "notes-cache:k3"]
+    assert ("notes_cache_evictions_total", 1, {}) in counters
+
+
+def test_cache_is_disabled_without_a_ttl(
+    fake_redis: FakeRedis, counters: list, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("NOTES_CACHE_TTL_SECONDS", "0")
+    calls: list[str] = []
+
+    def generate() -> dict[str, object]:
+        calls.append("generate")
+        return _notes("fresh")
+
+    cached_notes("k1", generate)
+    cached_notes("k1", generate)
+
+    assert calls == ["generate", "generate"]
+    assert fake_redis.values == {} and counters == []
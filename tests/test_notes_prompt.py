@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from server.agents.notes_prompt import (
+    ELLIPSIS,
+    GAP_LINE,
+    _fit_turns,
+    count_tokens,
+    render_transcript,
+    speaker_turns,
+)
+
+
+def _segment(speaker: str, text: str, start: float | None = None) -> dict[str, object]:
+    segment: dict[str, object] = {"speaker": speaker, "text": text}
+    if start is not None:
+        segment["timestamp"] = {"start": start, "end": start + 1}
+    return segment
+
+
+def test_speaker_turns_merges_consecutive_segments_of_one_speaker() -> None:
+    turns = speaker_turns(
+        [
+            _segment("Counselor", "Hello.", 0),
+            _segment("Counselor", "How are you?", 2),
+            _segment("Client", "Fine.", 65),
+            _segment("Counselor", "Good.", 70),
+        ]
+    )
+
+    assert turns == [
+        ("[00:00] ", "Counselor", "Hello. How are you?"),
+        ("[01:05] ", "Client", "Fine."),
+        ("[01:10] ", "Counselor", "Good."),
+    ]
+
+
+def test_speaker_turns_skips_blank_and_malformed_segments() -> None:
+    turns = speaker_turns(
+        [
+            "not a segment",
+            _segment("Client", "   ", 0),
+            {"text": "No speaker or time."},
+        ]
+    )
+
+    assert turns == [("", "Speaker", "No speaker or time.")]
+
+
+def test_fit_turns_keeps_every_turn_when_under_budget() -> None:
+    turns = [("[00:00] ", "Counselor", "Hello."), ("[00:03] ", "Client", "Hi.")]
+
+    assert _fit_turns(turns, budget=1000) == [
+        "[00:00] Counselor: Hello.",
+        "[00:03] Client: Hi.",
+    ]
+
+
+def test_fit_turns_truncates_only_the_longest_turns() -> None:
+    long_text = " ".join(f"word{index}" for index in range(2000))
+    turns = [
+        ("[00:00] ", "Counselor", "Short question?"),
+        ("[00:05] ", "Client", long_text),
+        ("[10:00] ", "Counselor", "Thanks."),
+    ]
+
+    lines = _fit_turns(turns, budget=300)
+
+    assert lines[0] == "[00:00] Counselor: Short question?"
+    assert lines[2] == "[10:00] Counselor: Thanks."
+    assert lines[1].startswith("[00:05] Client: word0")
+    assert ELLIPSIS in lines[1]
+    assert lines[1].endswith("word1999")
+
+
+def test_render_transcript_falls_back_to_plain_text() -> None:
+    text = " ".join(f"word{index}" for index in range(2000))
+
+    rendered = render_transcript(text, None, budget=100)
+
+    assert rendered.startswith("word0")
+    assert rendered.endswith("word1999")
+    assert count_tokens(rendered) < count_tokens(text)
+
+
+def test_fit_turns_stays_within_a_tight_budget() -> None:
+    long_text = " ".join(f"word{index}" for index in range(500))
+    turns = [
+        (f"[{index:02d}:00] ", "Client" if index % 2 else "Counselor", long_text)
+        for index in range(6)
+    ]
+
+    for budget in (60, 100, 250, 1000):
+        lines = _fit_turns(turns, budget=budget)
+        assert count_tokens("\n".join(lines)) <= budget
+
+
+def test_fit_turns_drops_middle_turns_when_prefixes_exceed_the_budget() -> None:
+    turns = [
+        (f"[{index:02d}:00] ", "Counselor", f"Point number {index}.")
+        for index in range(200)
+    ]
+
+    lines = _fit_turns(turns, budget=80)
+
+    assert count_tokens("\n".join(lines)) <= 80
+    assert lines[0] == "[00:00] Counselor: Point number 0."
+    assert lines[-1] == "[199:00] Counselor: Point number 199."
+    assert GAP_LINE in lines
+    assert len(lines) < len(turns)
+
+
+def test_fit_turns_returns_nothing_without_a_budget() -> None:
+    assert _fit_turns([("", "Client", "Hello.")], budget=0) == []
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from server.agents.notes_agent import (
+    METADATA_MARKER,
+    NotesAgent,
+    split_streamed_markdown,
+)
+
+
+def _agent() -> NotesAgent:
+    llm = SimpleNamespace(model_name="gpt-4o-mini")
+    return NotesAgent.model_construct(
+        llm_agent=SimpleNamespace(llm=llm), version="v1"
+    )
+
+
+def test_split_joins_a_heading_split_across_chunks() -> None:
+    deltas = ["# Ses", "sion Notes\n\n## Sum", "mary\nClient felt calmer."]
+
+    shown = list(split_streamed_markdown(iter(deltas)))
+
+    assert "".join(shown) == "# Session Notes\n\n## Summary\nClient felt calmer."
+
+
+def test_split_stops_at_a_marker_split_across_chunks() -> None:
+    half = len(METADATA_MARKER) // 2
+    deltas = [
+        "## Summary\nSteady progress.\n",
+        METADATA_MARKER[:half],
+        METADATA_MARKER[half:] + '{"summary": "Steady"}',
+        ', "key_points": []}',
+    ]
+    consumed: list[str] = []
+
+    def stream():
+        for delta in deltas:
+            consumed.append(delta)
+            yield delta
+
+    shown = list(split_streamed_markdown(stream()))
+
+    assert "".join(shown) == "## Summary\nSteady progress.\n"
+    assert not any("<<<" in part for part in shown)
+    assert consumed == deltas
+
+
+def test_split_flushes_an_unterminated_final_section() -> None:
+    deltas = ["## Summary\nDone.\n\n## Plan\nFollow up next", " week <<"]
+
+    shown = list(split_streamed_markdown(iter(deltas)))
+
+    assert "".join(shown) == "## Summary\nDone.\n\n## Plan\nFollow up next week <<"
+
+
+def test_build_streamed_notes_reads_markdown_then_metadata() -> None:
+    content = (
+        "## Summary\nSteady progress.\n"
+        + METADATA_MARKER
+        + '{"summary": "Steady", "key_points": ["sleep"], "risk_flags": []}'
+    )
+
+    payload = _agent().build_streamed_notes(content, "fallback")
+
+    assert payload["note_markdown"] == "## Summary\nSteady progress."
+    assert payload["summary"] == "Steady"
+    assert payload["key_points"] == ["sleep"]
+    assert payload["action_items"] is None
+    assert payload["model"] == "gpt-4o-mini"
+
+
+def test_build_streamed_notes_keeps_an_unterminated_note() -> None:
+    content = "## Summary\nSteady progress.\n\n## Plan\nFollow up"
+
+    payload = _agent().build_streamed_notes(content, "fallback")
+
+    assert payload["note_markdown"] == content
+    assert payload["summary"] is None
+
+
+def test_build_streamed_notes_falls_back_when_nothing_streamed() -> None:
+    payload = _agent().build_streamed_notes("", "fallback")
+
+    assert payload["note_markdown"] == "fallback"
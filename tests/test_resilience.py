@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import openai
+import pytest
+
+from server.core import resilience
+from server.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    is_retryable,
+    retry_after_seconds,
+)
+
+REQUEST = httpx.Request("POST", "https://api.example.test/v1/chat")
+
+
+def _response(status_code: int, headers: dict[str, str] | None = None) -> httpx.Response:
+    return httpx.Response(status_code, headers=headers, request=REQUEST)
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeRedis:
+    """Just enough of redis-py for CircuitBreaker, with a clock the test moves."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.values: dict[str, object] = {}
+        self.expiry: dict[str, float] = {}
+
+    def _expire_stale(self) -> None:
+        for key, expires_at in list(self.expiry.items()):
+            if expires_at <= self.now:
+                self.values.pop(key, None)
+                self.expiry.pop(key, None)
+
+    def pttl(self, key: str) -> int:
+        self._expire_stale()
+        if key not in self.values:
+            return -2
+        if key not in self.expiry:
+            return -1
+        return int((self.expiry[key] - self.now) * 1000)
+
+    def exists(self, key: str) -> int:
+        self._expire_stale()
+        return int(key in self.values)
+
+    def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            removed += int(self.values.pop(key, None) is not None)
+            self.expiry.pop(key, None)
+        return removed
+
+    def set(self, key: str, value: object, ex: int | None = None) -> bool:
+        self.values[key] = value
+        if ex is None:
+            self.expiry.pop(key, None)
+        else:
+            self.expiry[key] = self.now + ex
+        return True
+
+    def incr(self, key: str) -> int:
+        self._expire_stale()
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def expire(self, key: str, seconds: int) -> bool:
+        self.expiry[key] = self.now + seconds
+        return True
+
+    def pipeline(self) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.calls: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[object]:
+        return [
+            getattr(self.client, name)(*args, **kwargs)
+            for name, args, kwargs in self.calls
+        ]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    client = FakeRedis()
+    monkeypatch.setattr(resilience, "get_redis", lambda: client)
+    monkeypatch.setattr(resilience, "increment_counter", lambda *args, **kwargs: None)
+    monkeypatch.setenv("CIRCUIT_FAILURE_THRESHOLD", "2")
+    monkeypatch.setenv("CIRCUIT_FAILURE_WINDOW_SECONDS", "60")
+    monkeypatch.setenv("CIRCUIT_OPEN_SECONDS", "30")
+    return client
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        TimeoutError(),
+        ConnectionError(),
+        httpx.ConnectTimeout("connect timed out", request=REQUEST),
+        openai.APITimeoutError(request=REQUEST),
+        openai.RateLimitError("slow down", response=_response(429), body=None),
+        openai.InternalServerError("boom", response=_response(500), body=None),
+        _StatusError(503),
+        _StatusError(408),
+    ],
+)
+def test_is_retryable_accepts_transient_errors(exc: BaseException) -> None:
+    assert is_retryable(exc)
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        openai.AuthenticationError("bad key", response=_response(401), body=None),
+        openai.BadRequestError("bad request", response=_response(400), body=None),
+        _StatusError(404),
+        ValueError("not a provider error"),
+        CircuitOpenError("openai_chat", 10.0),
+    ],
+)
+def test_is_retryable_rejects_permanent_errors(exc: BaseException) -> None:
+    assert not is_retryable(exc)
+
+
+def test_retry_after_seconds_reads_delta_seconds() -> None:
+    exc = openai.RateLimitError(
+        "slow down", response=_response(429, {"Retry-After": "7"}), body=None
+    )
+    assert retry_after_seconds(exc) == 7.0
+
+
+def test_retry_after_seconds_reads_http_date() -> None:
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    exc = openai.RateLimitError(
+        "slow down",
+        response=_response(429, {"Retry-After": format_datetime(retry_at, usegmt=True)}),
+        body=None,
+    )
+    assert 55.0 <= retry_after_seconds(exc) <= 60.0
+
+
+def test_retry_after_seconds_clamps_past_dates_and_ignores_garbage() -> None:
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+    expired = openai.RateLimitError(
+        "slow down", response=_response(429, {"Retry-After": past}), body=None
+    )
+    garbage = openai.RateLimitError(
+        "slow down", response=_response(429, {"Retry-After": "soon"}), body=None
+    )
+    assert retry_after_seconds(expired) == 0.0
+    assert retry_after_seconds(garbage) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_retry_after_seconds_uses_circuit_wait() -> None:
+    assert retry_after_seconds(CircuitOpenError("sarvam_stt", 12.5)) == 12.5
+
+
+def test_backoff_delay_grows_exponentially_up_to_the_cap(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PROVIDER_BACKOFF_BASE_SECONDS", "1")
+    monkeypatch.setenv("PROVIDER_BACKOFF_MAX_SECONDS", "30")
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+
+    assert [backoff_delay(attempt) for attempt in (1, 2, 3, 6, 10)] == [
+        1.0,
+        2.0,
+        4.0,
+        30.0,
+        30.0,
+    ]
+
+
+def test_backoff_delay_is_jittered_but_never_below_retry_after(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PROVIDER_BACKOFF_BASE_SECONDS", "1")
+    monkeypatch.setenv("PROVIDER_BACKOFF_MAX_SECONDS", "30")
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: low)
+    exc = openai.RateLimitError(
+        "slow down", response=_response(429, {"Retry-After": "45"}), body=None
+    )
+
+    assert backoff_delay(3) == 0.0
+    assert backoff_delay(3, exc) == 45.0
+
+
+def test_circuit_opens_after_threshold_failures(fake_redis: FakeRedis) -> None:
+    breaker = CircuitBreaker("sarvam_stt")
+
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.check()
+    assert raised.value.retry_after == pytest.approx(30.0)
+
+
+def test_failures_outside_the_window_do_not_open_the_circuit(
+    fake_redis: FakeRedis,
+) -> None:
+    breaker = CircuitBreaker("sarvam_stt")
+
+    breaker.record_failure()
+    fake_redis.now += 61
+    breaker.record_failure()
+
+    breaker.check()
+
+
+def test_probation_failure_reopens_and_success_closes(fake_redis: FakeRedis) -> None:
+    breaker = CircuitBreaker("openai_chat")
+    breaker.record_failure()
+    breaker.record_failure()
+
+    fake_redis.now += 31
+    breaker.check()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    fake_redis.now += 31
+    breaker.check()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.check()
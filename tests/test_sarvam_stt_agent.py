@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from server.agents import sarvam_stt_agent
+from server.agents.sarvam_stt_agent import SarvamSttAgent
+
+
+class FakeJob:
+    job_id = "job-1"
+
+    def __init__(self, results: dict[str, list[dict]], outputs: dict[str, object]) -> None:
+        self.results = results
+        self.outputs = outputs
+        self.uploaded: list[str] = []
+
+    async def upload_files(self, file_paths: list[str]) -> None:
+        self.uploaded = file_paths
+
+    async def start(self) -> None:
+        pass
+
+    async def wait_until_complete(self) -> None:
+        pass
+
+    async def get_file_results(self) -> dict[str, list[dict]]:
+        return self.results
+
+    async def download_outputs(self, output_dir: str) -> None:
+        for output_name, payload in self.outputs.items():
+            (Path(output_dir) / output_name).write_text(json.dumps(payload))
+
+
+class FakeJobApi:
+    def __init__(self, job: FakeJob, *, links: bool = True) -> None:
+        self.job = job
+        self.links = links
+
+    async def create_job(self, **kwargs) -> FakeJob:
+        return self.job
+
+    async def get_download_links(self, job_id: str, files: list[str]) -> SimpleNamespace:
+        if not self.links:
+            return SimpleNamespace(download_urls={})
+        return SimpleNamespace(
+            download_urls={name: SimpleNamespace(file_url=name) for name in files}
+        )
+
+
+class FakeHttpClient:
+    def __init__(self, outputs: dict[str, object]) -> None:
+        self.outputs = outputs
+
+    async def get(self, url: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            raise_for_status=lambda: None, json=lambda: self.outputs[url]
+        )
+
+
+class FakeLimiter:
+    async def acquire_async(self, **kwargs) -> None:
+        pass
+
+
+def _agent(job: FakeJob, *, links: bool = True) -> SarvamSttAgent:
+    return SarvamSttAgent.model_construct(
+        client=SimpleNamespace(speech_to_text_translate_job=FakeJobApi(job, links=links)),
+        http_client=FakeHttpClient(job.outputs),
+        model="saaras:v2.5",
+        num_speakers=None,
+        prompt=None,
+    )
+
+
+def _diarized(*entries: tuple[str, str]) -> dict[str, object]:
+    return {
+        "transcript": " ".join(text for _, text in entries),
+        "diarized_transcript": {
+            "entries": [
+                {
+                    "transcript": text,
+                    "speaker_id": speaker,
+                    "start_time_seconds": float(index),
+                    "end_time_seconds": float(index + 1),
+                }
+                for index, (speaker, text) in enumerate(entries)
+            ]
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sarvam_stt_agent, "get_rate_limiter", lambda name: FakeLimiter())
+
+
+@pytest.fixture
+def batch_job() -> FakeJob:
+    return FakeJob(
+        results={
+            "successful": [{"file_name": "chunk_1.wav"}, {"file_name": "chunk_0.wav"}],
+            "failed": [{"file_name": "chunk_2.wav", "error_message": "bad audio"}],
+        },
+        outputs={
+            "chunk_0.wav.json": _diarized(("0", "hello")),
+            "chunk_1.wav.json": _diarized(("1", "goodbye")),
+        },
+    )
+
+
+@pytest.mark.parametrize("links", [True, False])
+def test_batch_outputs_map_back_to_their_files(
+    batch_job: FakeJob, tmp_path: Path, links: bool
+) -> None:
+    paths = [tmp_path / f"chunk_{index}.wav" for index in range(3)]
+
+    outcomes = asyncio.run(_agent(batch_job, links=links)._transcribe_batch_async(paths))
+
+    assert batch_job.uploaded == [str(path) for path in paths]
+    assert outcomes["chunk_0.wav"]["text"] == "hello"
+    assert outcomes["chunk_0.wav"]["segments"][0]["speaker"] == "SPEAKER_0"
+    assert outcomes["chunk_1.wav"]["text"] == "goodbye"
+    assert outcomes["chunk_2.wav"] == "bad audio"
+
+
+def test_single_file_failure_raises(tmp_path: Path) -> None:
+    audio = tmp_path / "chunk_0.wav"
+    audio.write_bytes(b"RIFF")
+    job = FakeJob(
+        results={"successful": [], "failed": [{"file_name": "chunk_0.wav"}]},
+        outputs={},
+    )
+
+    with pytest.raises(RuntimeError, match="Sarvam STT job failed"):
+        asyncio.run(_agent(job)._transcribe_async(audio))
+
+
+def test_normalize_segments_handles_diarized_and_generic_entries() -> None:
+    agent = _agent(FakeJob(results={}, outputs={}))
+
+    segments, text = agent._normalize_segments(
+        [
+            {
+                "transcript": "hi",
+                "speaker_id": "1",
+                "start_time_seconds": 0.5,
+                "end_time_seconds": 1.5,
+            },
+            {"text": "there", "speaker": 2, "start_ms": 1500, "end_ms": 2750},
+            {"utterance": "", "speaker_label": "SPEAKER_3", "start": 3, "end": 4},
+            "not a segment",
+        ]
+    )
+
+    assert segments == [
+        {"speaker": "SPEAKER_1", "timestamp": {"start": 0.5, "end": 1.5}, "text": "hi"},
+        {"speaker": "SPEAKER_2", "timestamp": {"start": 1.5, "end": 2.75}, "text": "there"},
+        {"speaker": "SPEAKER_3", "timestamp": {"start": 3.0, "end": 4.0}, "text": ""},
+    ]
+    assert text == "hi there"
+
+
+def test_normalize_segments_defaults_missing_speaker_and_times() -> None:
+    agent = _agent(FakeJob(results={}, outputs={}))
+
+    segments, text = agent._normalize_segments(
+        [{"transcript": "alone", "start_time_seconds": "soon"}]
+    )
+
+    assert segments == [
+        {
+            "speaker": "SPEAKER_UNKNOWN",
+            "timestamp": {"start": None, "end": None},
+            "text": "alone",
+        }
+    ]
+    assert text == "alone"
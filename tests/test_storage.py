@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from server.utils import storage
+from server.utils.storage import build_storage_path, chunks_dir, resolve_audio_path
+
+FILE_KEY = "abcdef0123456789"
+
+
+@pytest.fixture
+def upload_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(storage, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(storage, "CHUNKS_DIR", tmp_path / "chunks")
+    return tmp_path
+
+
+def test_build_storage_path_is_sharded_and_relative() -> None:
+    assert build_storage_path(FILE_KEY, ".mp3") == f"ab/cd/{FILE_KEY}.mp3"
+
+
+def test_chunks_dir_uses_the_same_shards(upload_dir: Path) -> None:
+    assert chunks_dir(FILE_KEY) == upload_dir / "chunks" / "ab" / "cd" / FILE_KEY
+
+
+def test_resolve_audio_path_reads_the_stored_relative_path(upload_dir: Path) -> None:
+    stored = build_storage_path(FILE_KEY, ".wav")
+    audio = upload_dir / stored
+    audio.parent.mkdir(parents=True)
+    audio.write_bytes(b"RIFF")
+
+    assert resolve_audio_path(FILE_KEY, stored) == audio
+
+
+def test_resolve_audio_path_accepts_legacy_absolute_paths(upload_dir: Path) -> None:
+    audio = upload_dir / "legacy" / f"{FILE_KEY}.wav"
+    audio.parent.mkdir(parents=True)
+    audio.write_bytes(b"RIFF")
+
+    assert resolve_audio_path(FILE_KEY, str(audio)) == audio
+
+
+def test_resolve_audio_path_falls_back_to_the_shard_dir(upload_dir: Path) -> None:
+    audio = upload_dir / "ab" / "cd" / f"{FILE_KEY}.m4a"
+    audio.parent.mkdir(parents=True)
+    audio.write_bytes(b"m4a")
+
+    assert resolve_audio_path(FILE_KEY, "moved/elsewhere.m4a") == audio
+    assert resolve_audio_path(FILE_KEY, None) == audio
+
+
+def test_resolve_audio_path_raises_when_the_file_is_gone(upload_dir: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        resolve_audio_path(FILE_KEY, build_storage_path(FILE_KEY, ".wav"))
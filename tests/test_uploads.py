@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from server.services.services import _copy_upload
+
+
+def test_copy_upload_streams_and_hashes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("UPLOAD_BLOCK_SIZE", str(64 * 1024))
+    data = b"audio" * 50_000
+    destination = tmp_path / "upload.wav"
+
+    digest, size_bytes = _copy_upload(io.BytesIO(data), destination)
+
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert size_bytes == len(data)
+    assert destination.read_bytes() == data
+
+
+def test_copy_upload_rejects_oversized_files_and_removes_them(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("UPLOAD_MAX_BYTES", str(100 * 1024))
+    monkeypatch.setenv("UPLOAD_BLOCK_SIZE", str(64 * 1024))
+    destination = tmp_path / "upload.wav"
+
+    with pytest.raises(HTTPException) as raised:
+        _copy_upload(io.BytesIO(b"x" * (200 * 1024)), destination)
+
+    assert raised.value.status_code == 413
+    assert not destination.exists()
+
+
+def test_copy_upload_rejects_empty_files(tmp_path: Path) -> None:
+    destination = tmp_path / "upload.wav"
+
+    with pytest.raises(HTTPException) as raised:
+        _copy_upload(io.BytesIO(b""), destination)
+
+    assert raised.value.status_code == 400
+    assert not destination.exists()